@@ -1,5 +1,6 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from typing import List, Optional
 
 from app.api.deps import require_admin
 from app.api.schemas.admin import (
@@ -27,12 +28,35 @@ router = APIRouter(
 # USERS
 # -------------------------------------------------
 
+def _parse_users_cursor(cursor: str):
+    try:
+        created_at, user_id = cursor.rsplit("|", 1)
+        return datetime.fromisoformat(created_at), int(user_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 @router.get("/users", response_model=List[AdminUserOut])
-def list_users(admin=Depends(require_admin)):
+def list_users(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    admin=Depends(require_admin),
+):
     """
-    List all users with subscription status.
+    List users with subscription status, newest first.
+
+    Paginated: when more users exist, the X-Next-Cursor response header
+    holds the value to pass as `cursor` for the next page.
     """
-    rows = admin_list_users()
+    rows, next_cursor = admin_list_users(
+        cursor=_parse_users_cursor(cursor) if cursor else None,
+        limit=limit,
+    )
+
+    if next_cursor:
+        created_at, user_id = next_cursor
+        response.headers["X-Next-Cursor"] = f"{created_at.isoformat()}|{user_id}"
 
     users = []
     for r in rows:
@@ -67,8 +91,16 @@ def set_user_status(
             detail="Admins cannot deactivate themselves",
         )
 
-    admin_set_user_active(user_id, payload.is_active)
-    return {"message": "User status updated"}
+    row = admin_set_user_active(user_id, payload.is_active)
+
+    if not row:
+        raise HTTPException(status_code=404, detail="User not found")
+
+    return {
+        "message": "User status updated",
+        "is_active": row["is_active"],
+        "disabled_at": row["disabled_at"],
+    }
 
 
 # -------------------------------------------------
@@ -90,8 +122,15 @@ def extend_subscription(
             detail="Days must be greater than zero",
         )
 
-    admin_extend_subscription(user_id, payload.days)
-    return {"message": f"Subscription extended by {payload.days} days"}
+    row = admin_extend_subscription(user_id, payload.days)
+
+    if not row:
+        raise HTTPException(status_code=404, detail="No active subscription")
+
+    return {
+        "message": f"Subscription extended by {payload.days} days",
+        "end_date": row["end_date"],
+    }
 
 
 # -------------------------------------------------
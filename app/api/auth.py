@@ -95,13 +95,12 @@ def register(payload: RegisterRequest):
 
 @router.post("/login", response_model=LoginResponse)
 def login(payload: LoginRequest, response: Response):
-    is_valid = verify_user(
+    user_id = verify_user(
         username=payload.email,
         password=payload.password,
     )
 
-
-    if not is_valid:
+    if user_id is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
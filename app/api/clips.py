@@ -6,7 +6,7 @@ import uuid
 from pathlib import Path
 
 from app.api.schemas.clips import ClipResponse
-from app.workers.clip_worker import run_clip_job
+from app.workers.clip_worker import a_run_clip_job
 from app.services.database import (
     create_clip_job,
     get_clip_job,
@@ -130,6 +130,7 @@ def create_clip_job_endpoint(
     clip_length: int = Form(30),
     max_clips: int = Form(3),
     style: str = Form("highlight"),
+    want_subtitles: bool = Form(True),
     current_user: dict = Depends(get_current_user)
 ):
     # ... existing code with user_id from current_user ...
@@ -163,10 +164,11 @@ def create_clip_job_endpoint(
         clip_length=clip_length,
         max_clips=max_clips,
         style=style,
+        want_subtitles=want_subtitles,
     )
 
     # Run background worker
-    background_tasks.add_task(run_clip_job, job_id)
+    background_tasks.add_task(a_run_clip_job, job_id)
 
     return {
         "job_id": job_id,
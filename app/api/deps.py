@@ -3,39 +3,14 @@ from jose import jwt, JWTError
 
 from app.config import settings
 from app.utils.security import ALGORITHM
-from app.services.auth_database import get_conn, is_admin_user
-
-
-# --------------------------------------------------
-# INTERNAL HELPERS
-# --------------------------------------------------
-
-def _get_user_by_email(email: str):
-    """
-    INTERNAL helper.
-    Fetches user from AUTH (Postgres) database.
-
-    Returns:
-        dict {id, email, is_active, is_admin} or None
-    """
-    with get_conn() as conn:
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                SELECT id, email, is_active, is_admin
-                FROM users
-                WHERE email = %s
-                """,
-                (email,),
-            )
-            return cur.fetchone()
+from app.services.auth_database_async import get_user_by_email
 
 
 # --------------------------------------------------
 # AUTH DEPENDENCIES
 # --------------------------------------------------
 
-def get_current_user(access_token: str | None = Cookie(default=None)):
+async def get_current_user(access_token: str | None = Cookie(default=None)):
     """
     Canonical auth dependency.
 
@@ -87,7 +62,8 @@ def get_current_user(access_token: str | None = Cookie(default=None)):
     # -------------------------------------------------
     # 3️⃣ Resolve user from AUTH DB
     # -------------------------------------------------
-    user = _get_user_by_email(email)
+    # asyncpg: runs on the event loop, no threadpool worker held on I/O
+    user = await get_user_by_email(email)
 
     if not user:
         raise HTTPException(
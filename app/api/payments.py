@@ -10,6 +10,7 @@ from app.services.auth_database import (
 )
 from app.services.database import add_post
 from app.workers.post_tasks import execute_scheduled_post
+from app.utils.scheduler_wakeup import notify_scheduler
 
 router = APIRouter(prefix="/payments", tags=["payments"])
 
@@ -101,6 +102,7 @@ async def zeroid_webhook(request: Request):
                         args=[post_id],
                         eta=scheduled_time,
                     )
+                    notify_scheduler()
                 else:
                     execute_scheduled_post.delay(post_id)
 
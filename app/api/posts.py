@@ -33,6 +33,7 @@ from app.services.auth_database import (
 )
 from app.api.deps import get_current_user
 from app.workers.post_tasks import execute_scheduled_post
+from app.utils.scheduler_wakeup import notify_scheduler
 
 # ZeroID payment URL for post payments
 ZEROID_POST_PAYMENT_URL = "https://app.zeroid.cc/paylink/89e8d2c5-be5c-4953-8b2f-43cd0bafcd95"
@@ -319,6 +320,7 @@ def create_post(
             args=[post_id],
             eta=scheduled_time,
         )
+        notify_scheduler()
     else:
         execute_scheduled_post.delay(post_id)
 
@@ -424,6 +426,7 @@ def reschedule_post(
         (payload.scheduled_time.isoformat(), "Pending", post_id),
     )
     db.commit()
+    notify_scheduler()
 
     return {"message": "Post rescheduled"}
 
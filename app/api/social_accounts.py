@@ -53,30 +53,29 @@ def connect_social_account(
 
     # 2️⃣ Optionally attach to group (ownership enforced)
     if payload.group_id is not None:
-        from app.services.database import connect
-
-        conn = connect()
-        cursor = conn.cursor()
-
-        # Verify group belongs to user
-        cursor.execute(
-            """
-            SELECT 1
-            FROM groups
-            WHERE id = %s AND user_id = %s
-            """,
-            (payload.group_id, user_id),
-        )
-
-        if not cursor.fetchone():
-            conn.close()
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Group not found",
+        from app.services.database import get_conn
+
+        with get_conn() as conn:
+            cursor = conn.cursor()
+
+            # Verify group belongs to user
+            cursor.execute(
+                """
+                SELECT 1
+                FROM groups
+                WHERE id = %s AND user_id = %s
+                """,
+                (payload.group_id, user_id),
             )
 
+            if not cursor.fetchone():
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Group not found",
+                )
+
+        # Ownership verified; the helper checks out its own connection
         add_account_to_group(payload.group_id, account_id)
-        conn.close()
 
     return {
         "id": account_id,
@@ -113,44 +112,42 @@ def add_account_group_link(
 ):
     user_id = user["id"]
 
-    from app.services.database import connect
-    conn = connect()
-    cursor = conn.cursor()
-
-    # Verify account ownership
-    cursor.execute(
-        """
-        SELECT 1
-        FROM accounts
-        WHERE id = %s AND user_id = %s
-        """,
-        (account_id, user_id),
-    )
-    if not cursor.fetchone():
-        conn.close()
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Account not found",
+    from app.services.database import get_conn
+    with get_conn() as conn:
+        cursor = conn.cursor()
+
+        # Verify account ownership
+        cursor.execute(
+            """
+            SELECT 1
+            FROM accounts
+            WHERE id = %s AND user_id = %s
+            """,
+            (account_id, user_id),
         )
+        if not cursor.fetchone():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Account not found",
+            )
 
-    # Verify group ownership
-    cursor.execute(
-        """
-        SELECT 1
-        FROM groups
-        WHERE id = %s AND user_id = %s
-        """,
-        (group_id, user_id),
-    )
-    if not cursor.fetchone():
-        conn.close()
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Group not found",
+        # Verify group ownership
+        cursor.execute(
+            """
+            SELECT 1
+            FROM groups
+            WHERE id = %s AND user_id = %s
+            """,
+            (group_id, user_id),
         )
+        if not cursor.fetchone():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Group not found",
+            )
 
+    # Ownership verified; the helper checks out its own connection
     add_account_to_group(group_id, account_id)
-    conn.close()
     return {"success": True}
 
 
@@ -164,44 +161,42 @@ def remove_account_group_link(
 ):
     user_id = user["id"]
 
-    from app.services.database import connect
-    conn = connect()
-    cursor = conn.cursor()
-
-    # Verify account ownership
-    cursor.execute(
-        """
-        SELECT 1
-        FROM accounts
-        WHERE id = %s AND user_id = %s
-        """,
-        (account_id, user_id),
-    )
-    if not cursor.fetchone():
-        conn.close()
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Account not found",
+    from app.services.database import get_conn
+    with get_conn() as conn:
+        cursor = conn.cursor()
+
+        # Verify account ownership
+        cursor.execute(
+            """
+            SELECT 1
+            FROM accounts
+            WHERE id = %s AND user_id = %s
+            """,
+            (account_id, user_id),
         )
+        if not cursor.fetchone():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Account not found",
+            )
 
-    # Verify group ownership
-    cursor.execute(
-        """
-        SELECT 1
-        FROM groups
-        WHERE id = %s AND user_id = %s
-        """,
-        (group_id, user_id),
-    )
-    if not cursor.fetchone():
-        conn.close()
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Group not found",
+        # Verify group ownership
+        cursor.execute(
+            """
+            SELECT 1
+            FROM groups
+            WHERE id = %s AND user_id = %s
+            """,
+            (group_id, user_id),
         )
+        if not cursor.fetchone():
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Group not found",
+            )
 
+    # Ownership verified; the helper checks out its own connection
     remove_account_from_group(group_id, account_id)
-    conn.close()
     return {"success": True}
 
 
@@ -3,7 +3,11 @@ from pydantic import BaseModel
 import datetime
 
 from app.api.deps import get_current_user, require_admin
-from app.services.auth_database import get_conn, create_payment_intent
+from app.services.auth_database import (
+    get_conn,
+    create_payment_intent,
+    invalidate_plan_cache,
+)
 
 router = APIRouter(prefix="/subscriptions", tags=["subscriptions"])
 
@@ -204,6 +208,8 @@ def update_subscription_plan(
 
         conn.commit()
 
+    invalidate_plan_cache(plan_id)
+
     if not row:
         raise HTTPException(status_code=404, detail="Plan not found")
 
@@ -241,6 +247,8 @@ def delete_subscription_plan(
 
         conn.commit()
 
+    invalidate_plan_cache(plan_id)
+
     if not row:
         raise HTTPException(status_code=404, detail="Plan not found")
 
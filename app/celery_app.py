@@ -56,6 +56,7 @@ celery_app.conf.update(
 celery_app.autodiscover_tasks(
     [
         "app.workers.post_tasks",
+        "app.services.email_queue",
     ]
 )
 
@@ -66,10 +67,19 @@ logger.info("[CELERY] Task modules auto-discovered")
 # ============================
 
 celery_app.conf.beat_schedule = {
-    "refresh-youtube-tokens-check": {
-        "task": "refresh_youtube_tokens_task",
-        "schedule": crontab(minute="*/5"),
-    }
+    "evict-video-cache-nightly": {
+        "task": "evict_video_cache_task",
+        "schedule": crontab(hour=3, minute=0),
+    },
+    "cleanup-password-reset-tokens-daily": {
+        "task": "cleanup_password_reset_tokens_task",
+        "schedule": crontab(hour=3, minute=30),
+    },
+    # Cheap SET NX check; only does work when the refresh chain broke
+    "seed-youtube-token-refresh-hourly": {
+        "task": "seed_token_refresh_task",
+        "schedule": crontab(minute=15),
+    },
 }
 
 logger.info("[CELERY] Beat schedule registered")
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 from pydantic_settings import BaseSettings
 
@@ -35,6 +36,8 @@ class Settings(BaseSettings):
     # Database (Fly.io sets DATABASE_URL automatically)
     # ------------------
     DATABASE_URL: str = ""
+    # Max pooled connections per process (auth schema)
+    DB_POOL_MAX: int = 10
 
 
 
@@ -60,6 +63,42 @@ class Settings(BaseSettings):
     # AI
     OPENAI_API_KEY: str | None = None
     GROQ_API_KEY: str | None = None
+    # Concurrent Whisper API requests per transcription (one per audio chunk)
+    TRANSCRIBE_WORKERS: int = 4
+
+    # ------------------
+    # Logging
+    # ------------------
+    # Level for the clip job logger; DEBUG adds per-clip detail
+    LOG_LEVEL: str = "INFO"
+
+    # ------------------
+    # Video processing (FFmpeg)
+    # ------------------
+    # "auto" picks the first hardware encoder the local ffmpeg build exposes
+    # (NVENC, VAAPI, VideoToolbox); "nvenc"/"vaapi"/"videotoolbox" pin one,
+    # "none" forces libx264
+    FFMPEG_HWACCEL: str = "auto"
+    # DRM render node used by the VAAPI encoder
+    FFMPEG_VAAPI_DEVICE: str = "/dev/dri/renderD128"
+    # libx264 rate/speed tradeoff for the CPU encode path
+    FFMPEG_PRESET: str = "faster"
+    FFMPEG_CRF: int = 23
+    # Clips are always cropped to 9:16. Disable to stream-copy H.264 sources
+    # (keyframe-accurate cuts, original aspect ratio) when no subtitles are burned in.
+    CLIP_FORCE_RECROP: bool = True
+    # Burn subtitles into the picture. When disabled they are muxed as a
+    # mov_text track instead (Instagram and Shorts do not display soft subs).
+    CLIP_BURN_IN_SUBTITLES: bool = True
+    # Clip jobs a single API process runs at once; further jobs wait their turn
+    CLIP_MAX_CONCURRENT_JOBS: int = 2
+    # Number of ffmpeg processes a single clip job runs in parallel
+    CLIP_CONCURRENCY: int = max(1, (os.cpu_count() or 1) // 4)
+    # Threads per ffmpeg process (decode and encode). 0 splits the cores
+    # evenly across the CLIP_CONCURRENCY processes.
+    CLIP_FFMPEG_THREADS: int = 0
+    # Downloaded source videos are kept for reuse up to this size (LRU)
+    VIDEO_CACHE_MAX_GB: float = 20.0
 
     class Config:
         env_file = ".env"
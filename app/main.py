@@ -26,7 +26,9 @@ from app.api.clips import router as clips_router
 from app.api.analytics import router as analytics_router
 from app.api.youtube_analytics import router as yt_router
 from app.services.database import init_db
-from app.services.auth_database import init_auth_db
+from app.services.auth_database import init_auth_db, flush_payment_events
+from app.services.auth_database_async import close_pool as close_auth_pool
+from app.services.email import mailer
 from app.api.messages import router as messages_router
 
 
@@ -49,7 +51,8 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
-        expose_headers=["*"],
+        # "*" doesn't cover credentialed requests; name what the frontend reads
+        expose_headers=["*", "X-Next-Cursor"],
     )
 
     # =========================================================
@@ -102,6 +105,12 @@ def create_app() -> FastAPI:
         init_db()
         init_auth_db()
 
+    @app.on_event("shutdown")
+    async def shutdown():
+        flush_payment_events()
+        await close_auth_pool()
+        mailer.close()
+
     return app
 
 
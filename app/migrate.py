@@ -23,7 +23,6 @@ def run_migrations():
             # Import here to catch connection errors
             from app.services.database import init_db
             from app.services.auth_database import init_auth_db, add_user, get_user_by_email, set_user_admin_status
-            from app.utils.security import hash_password
 
             # Auth schema MUST be created first because app schema
             # tables may reference auth.users via foreign keys.
@@ -45,6 +44,10 @@ def run_migrations():
                 set_user_admin_status(existing["id"], True)
                 logger.info(f"Admin user already exists (ID: {existing['id']})")
             else:
+                # passlib/bcrypt (and jose/fastapi via security) are only
+                # needed on the first deploy, when the admin is missing
+                from app.utils.security import hash_password
+
                 user_id = add_user(admin_email, hash_password(admin_password))
                 if user_id:
                     set_user_admin_status(user_id, True)
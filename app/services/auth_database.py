@@ -1,50 +1,181 @@
 import psycopg2
 import psycopg2.extras
-import json
+import logging
 import os
-from datetime import datetime, timedelta
+import queue
+import time
+from contextlib import contextmanager
+from functools import lru_cache
+from datetime import datetime, timedelta, timezone
 import threading
 from typing import Optional
 from urllib.parse import urlparse
 
+import orjson
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
 
 from app.config import settings
-from app.utils.security import verify_password
+from app.utils.security import hash_password, verify_password
+from app.utils.cache import TTLCache
+from app.utils.db_pool import (
+    PreparingConnection,
+    RetainingConnectionPool,
+    execute_prepared,
+)
 
 import uuid
 
 AUTH_SCHEMA = "auth"
 
+logger = logging.getLogger("auth_database")
+
+# JSONB columns come back already decoded, via orjson instead of json
+psycopg2.extras.register_default_jsonb(loads=orjson.loads, globally=True)
+
 # --------------------------------------------------
 # CONNECTION
 # --------------------------------------------------
 
 _DB_LOCK = threading.Lock()
 
+# Connection pool, created lazily per process. A forked worker (Celery
+# prefork) must not reuse sockets inherited from its parent, so the pool
+# is rebuilt whenever the pid changes.
+_POOL = None
+_POOL_SLOTS = None
+_POOL_PID = None
+_POOL_LOCK = threading.Lock()
+
+
+def _get_pool():
+    global _POOL, _POOL_SLOTS, _POOL_PID
+
+    pid = os.getpid()
+    if _POOL is not None and _POOL_PID == pid:
+        return _POOL, _POOL_SLOTS
+
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_PID != pid:
+            database_url = os.getenv("DATABASE_URL")
+            if not database_url:
+                raise RuntimeError("DATABASE_URL is not set")
+
+            # Retains returned connections (and their prepared statements)
+            _POOL = RetainingConnectionPool(
+                minconn=1,
+                maxconn=settings.DB_POOL_MAX,
+                dsn=database_url,
+                connection_factory=PreparingConnection,
+                cursor_factory=psycopg2.extras.RealDictCursor,
+                # search_path is set at connect time instead of per checkout;
+                # UTC so NOW()/CURRENT_DATE match the naive-UTC columns
+                options="-c search_path=auth,public -c TimeZone=UTC",
+            )
+            # ThreadedConnectionPool raises when exhausted; make callers wait
+            _POOL_SLOTS = threading.BoundedSemaphore(settings.DB_POOL_MAX)
+            _POOL_PID = pid
+
+    return _POOL, _POOL_SLOTS
+
+
 #  Hosted
 
+@contextmanager
 def get_conn():
-    database_url = os.getenv("DATABASE_URL")
-    if not database_url:
-        raise RuntimeError("DATABASE_URL is not set")
+    """
+    Borrow a pooled connection (search_path = auth, public).
 
-    result = urlparse(database_url)
+    Commits when the block succeeds, rolls back when it raises, and
+    always returns the connection to the pool.
+    """
+    conn_pool, slots = _get_pool()
 
-    conn = psycopg2.connect(
-        dbname=result.path.lstrip("/"),
-        user=result.username,
-        password=result.password,
-        host=result.hostname,
-        port=result.port,
-        cursor_factory=psycopg2.extras.RealDictCursor,
-    )
-    # Set search_path to auth schema for all queries
-    with conn.cursor() as cur:
-        cur.execute("SET search_path TO auth, public;")
-    return conn
+    with slots:
+        conn = conn_pool.getconn()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            if not conn.closed:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    pass
+            raise
+        finally:
+            # Broken connections are discarded rather than handed out again
+            conn_pool.putconn(conn, close=bool(conn.closed))
+
+
+@contextmanager
+def _cursor(conn, cur=None):
+    """
+    Yield `cur` when the caller already has one open on `conn`,
+    otherwise a new cursor closed on exit. Lets chained helpers
+    (check_daily_limit → get_active_subscription → ...) share one.
+    """
+    if cur is not None:
+        yield cur
+        return
+
+    with conn.cursor() as new_cur:
+        yield new_cur
+
+
+def _tuple_cursor(conn):
+    """
+    Plain tuple-row cursor, for single-column lookups where the pool's
+    RealDictCursor would build a dict per row for nothing.
+    """
+    # cursor_factory=None would fall back to the connection's default
+    return conn.cursor(cursor_factory=psycopg2.extensions.cursor)
+
+
+# --------------------------------------------------
+# PREPARED STATEMENTS
+# --------------------------------------------------
 
+# Hot single-row lookups, PREPAREd once per pooled connection so repeat
+# calls skip parse + plan. name -> (argument types, query)
+_PREPARED_STATEMENTS = {
+    "p_verify_user": (
+        ("text",),
+        "SELECT id, password_hash, is_active FROM users WHERE email = %s",
+    ),
+    "p_user_by_email": (
+        ("text",),
+        "SELECT id, email FROM users WHERE email = %s",
+    ),
+    "p_is_admin": (
+        ("integer",),
+        "SELECT 1 FROM users WHERE id = %s AND is_admin = TRUE",
+    ),
+    "p_youtube_token": (
+        ("integer",),
+        "SELECT token_json FROM youtube_tokens WHERE account_id = %s",
+    ),
+    "p_today_usage": (
+        ("integer", "text"),
+        "SELECT posts, comments, dms FROM usage_counters "
+        "WHERE user_id = %s AND platform = %s AND date = CURRENT_DATE",
+    ),
+}
+
+
+def _execute_prepared(cur, name: str, params: tuple) -> None:
+    execute_prepared(cur, _PREPARED_STATEMENTS, name, params)
+
+
+
+# (name, max_channels, posts_per_day, comments_per_day, dms_per_day, price)
+SEED_PLANS = (
+    ("Tier 1", 3, 9, 9, 9, 1),
+    ("Tier 2", 10, 30, 30, 30, 2),
+    ("Tier 3", 100, 300, 300, 300, 3),
+    ("Tier 4", 1000, 3000, 3000, 3000, 4),
+    ("Tier 5 (Enterprise)", 10000, 30000, 30000, 30000, 5),
+)
 
 
 def init_auth_db():
@@ -170,18 +301,16 @@ def init_auth_db():
             """)
 
             # SEED PLANS
-            cur.execute("""
+            psycopg2.extras.execute_values(
+                cur,
+                """
                 INSERT INTO subscription_plans
                     (name, max_channels, posts_per_day, comments_per_day, dms_per_day, price)
-                VALUES
-                    ('Tier 1', 3, 9, 9, 9, 1),
-                    ('Tier 2', 10, 30, 30, 30, 2),
-                    ('Tier 3', 100, 300, 300, 300, 3),
-                    ('Tier 4', 1000, 3000, 3000, 3000, 4),
-                    ('Tier 5 (Enterprise)', 10000, 30000, 30000, 30000, 5)
-                ON CONFLICT (name) DO NOTHING;
-                        
-            """)
+                VALUES %s
+                ON CONFLICT (name) DO NOTHING
+                """,
+                SEED_PLANS,
+            )
 
             # PAYMENT INTENTS & EVENTS
             cur.execute("""
@@ -219,8 +348,13 @@ def init_auth_db():
                 );
             """)
 
+            # token's UNIQUE constraint already indexes the lookup
+            cur.execute("""
+                DROP INDEX IF EXISTS idx_password_reset_token;
+            """)
             cur.execute("""
-            CREATE INDEX IF NOT EXISTS idx_password_reset_token ON password_reset_tokens(token);
+                CREATE INDEX IF NOT EXISTS idx_prt_expires
+                ON password_reset_tokens(expires_at) WHERE used = FALSE;
             """)
 
             # POST PAYMENT INTENTS (pay-per-post)
@@ -243,6 +377,25 @@ def init_auth_db():
                 ON post_payment_intents(status);
             """)
 
+            # HOT-PATH INDEXES
+            # Partial indexes: only the rows these lookups actually filter for
+            cur.execute("""
+                CREATE INDEX IF NOT EXISTS idx_user_subs_active
+                ON user_subscriptions(user_id) WHERE is_active;
+            """)
+            cur.execute("""
+                CREATE INDEX IF NOT EXISTS idx_payment_intents_user_created
+                ON payment_intents(user_id, created_at DESC);
+            """)
+            cur.execute("""
+                CREATE INDEX IF NOT EXISTS idx_users_is_admin
+                ON users(id) WHERE is_admin;
+            """)
+            cur.execute("""
+                CREATE INDEX IF NOT EXISTS idx_prt_user_active
+                ON password_reset_tokens(user_id) WHERE used = FALSE;
+            """)
+
         conn.commit()
 
 
@@ -256,53 +409,57 @@ def add_user(email: str, password_hash: str) -> Optional[int]:
     Creates a user in auth.users.
     Returns user_id on success, None if user already exists.
     """
-    try:
-        with get_conn() as conn:
-            with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    INSERT INTO users (email, password_hash)
-                    VALUES (%s, %s)
-                    RETURNING id
-                    """,
-                    (email, password_hash),
-                )
-                user_id = cur.fetchone()["id"]
-            conn.commit()
-            return user_id
-
-    except psycopg2.errors.UniqueViolation:
-        return None
-
-
-
-def verify_user(username: str, password: str) -> bool:
     with get_conn() as conn:
         with conn.cursor() as cur:
+            # Duplicate email → no row, instead of an error + rollback
             cur.execute(
                 """
-                SELECT password_hash, is_active
-                FROM users
-                WHERE email = %s
+                INSERT INTO users (email, password_hash)
+                VALUES (%s, %s)
+                ON CONFLICT (email) DO NOTHING
+                RETURNING id
                 """,
-                (username,),
+                (email, password_hash),
             )
             row = cur.fetchone()
 
-    if not row or not row["is_active"]:
-        return False
+    return row["id"] if row else None
 
-    return verify_password(password, row["password_hash"])
+
+
+@lru_cache(maxsize=1)
+def _dummy_password_hash() -> str:
+    # Same scheme/cost as real hashes; computed once, on first miss
+    return hash_password("not-a-real-password")
+
+
+def verify_user(username: str, password: str) -> Optional[int]:
+    """
+    Check login credentials.
+
+    Returns the user id on success, None otherwise. Unknown emails
+    still pay for one bcrypt verify, so response time doesn't reveal
+    whether an account exists.
+    """
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            _execute_prepared(cur, "p_verify_user", (username,))
+            row = cur.fetchone()
+
+    password_hash = row["password_hash"] if row else _dummy_password_hash()
+    password_ok = verify_password(password, password_hash)
+
+    if not row or not row["is_active"] or not password_ok:
+        return None
+
+    return row["id"]
 
 
 
 def get_user_by_email(email: str):
     with get_conn() as conn:
         with conn.cursor() as cur:
-            cur.execute(
-                "SELECT id, email FROM users WHERE email = %s",
-                (email,),
-            )
+            _execute_prepared(cur, "p_user_by_email", (email,))
             return cur.fetchone()
 
 
@@ -310,21 +467,41 @@ def get_user_by_email(email: str):
 # YOUTUBE TOKENS (SINGLE SOURCE OF TRUTH)
 # --------------------------------------------------
 
-def store_token_in_db(account_id: int, creds: Credentials) -> None:
-    """
-    Atomic upsert to avoid race conditions.
-    Stores the FULL credential state.
+# account_id -> Credentials, reused while the access token has more
+# than TOKEN_REFRESH_MARGIN left (skips the SELECT + decode per call)
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
 
-    HARD RULE:
-    - creds.expiry is ALWAYS stored as NAIVE UTC
-    """
-    expiry = None
-    if creds.expiry:
-        expiry = creds.expiry
-        if expiry.tzinfo is not None:
-            expiry = expiry.astimezone(datetime.timezone.utc).replace(tzinfo=None)
+_TOKEN_CACHE: dict = {}
+_TOKEN_CACHE_LOCK = threading.RLock()
+
+
+def _cached_youtube_credentials(account_id: int) -> Optional[Credentials]:
+    with _TOKEN_CACHE_LOCK:
+        creds = _TOKEN_CACHE.get(account_id)
+
+        if creds is None:
+            return None
+
+        now = datetime.utcnow()  # NAIVE UTC (matches Google internals)
+        if not creds.valid or not creds.expiry or creds.expiry <= now + TOKEN_REFRESH_MARGIN:
+            del _TOKEN_CACHE[account_id]
+            return None
+
+        return creds
+
+
+def _naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Google's Credentials compare expiry against naive UTC."""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def _token_data(creds: Credentials) -> dict:
+    """Serializable credential state stored in youtube_tokens.token_json."""
+    expiry = _naive_utc(creds.expiry)
 
-    token_data = {
+    return {
         "token": creds.token,
         "refresh_token": creds.refresh_token,
         "token_uri": creds.token_uri,
@@ -334,6 +511,18 @@ def store_token_in_db(account_id: int, creds: Credentials) -> None:
         "expiry": expiry.isoformat() if expiry else None,
     }
 
+
+def store_token_in_db(account_id: int, creds: Credentials) -> None:
+    """
+    Atomic upsert to avoid race conditions.
+    Stores the FULL credential state.
+
+    HARD RULE:
+    - creds.expiry is ALWAYS stored as NAIVE UTC
+    """
+    # Built before taking _DB_LOCK, so the lock only covers the write
+    token_data = _token_data(creds)
+
     with _DB_LOCK:
         with get_conn() as conn:
             with conn.cursor() as cur:
@@ -346,9 +535,12 @@ def store_token_in_db(account_id: int, creds: Credentials) -> None:
                         token_json = EXCLUDED.token_json,
                         updated_at = NOW()
                     """,
-                    (account_id, json.dumps(token_data)),
+                    (account_id, psycopg2.extras.Json(token_data)),
                 )
 
+    with _TOKEN_CACHE_LOCK:
+        _TOKEN_CACHE[account_id] = creds
+
 
 def _load_youtube_credentials(account_id: int) -> Optional[Credentials]:
     """
@@ -361,14 +553,7 @@ def _load_youtube_credentials(account_id: int) -> Optional[Credentials]:
     """
     with get_conn() as conn:
         with conn.cursor() as cur:
-            cur.execute(
-                """
-                SELECT token_json
-                FROM youtube_tokens
-                WHERE account_id = %s
-                """,
-                (account_id,),
-            )
+            _execute_prepared(cur, "p_youtube_token", (account_id,))
             row = cur.fetchone()
 
     if not row:
@@ -377,7 +562,7 @@ def _load_youtube_credentials(account_id: int) -> Optional[Credentials]:
     token_data = row["token_json"]
 
     if isinstance(token_data, str):
-        token_data = json.loads(token_data)
+        token_data = orjson.loads(token_data)
 
     creds = Credentials(
         token=token_data.get("token"),
@@ -390,13 +575,8 @@ def _load_youtube_credentials(account_id: int) -> Optional[Credentials]:
 
     expiry_str = token_data.get("expiry")
     if expiry_str:
-        expiry = datetime.fromisoformat(expiry_str)
-
         # FORCE naive UTC (no exceptions)
-        if expiry.tzinfo is not None:
-            expiry = expiry.astimezone(datetime.timezone.utc).replace(tzinfo=None)
-
-        creds.expiry = expiry
+        creds.expiry = _naive_utc(datetime.fromisoformat(expiry_str))
 
     return creds
 
@@ -413,6 +593,10 @@ def get_valid_youtube_token(account_id: int) -> Optional[Credentials]:
     CONTRACT:
     - All datetime comparisons are NAIVE UTC
     """
+    creds = _cached_youtube_credentials(account_id)
+    if creds is not None:
+        return creds
+
     creds = _load_youtube_credentials(account_id)
     if not creds:
         return None
@@ -423,7 +607,7 @@ def get_valid_youtube_token(account_id: int) -> Optional[Credentials]:
         not creds.valid
         or (
             creds.expiry
-            and creds.expiry <= now + timedelta(minutes=5)
+            and creds.expiry <= now + TOKEN_REFRESH_MARGIN
         )
     )
 
@@ -435,6 +619,9 @@ def get_valid_youtube_token(account_id: int) -> Optional[Credentials]:
 
         creds.refresh(Request())
         store_token_in_db(account_id, creds)
+    else:
+        with _TOKEN_CACHE_LOCK:
+            _TOKEN_CACHE[account_id] = creds
 
     return creds
 
@@ -460,51 +647,94 @@ def refresh_youtube_token_now(account_id: int) -> bool:
     store_token_in_db(account_id, creds)
     return True
 
-def get_active_subscription(conn, user_id: int):
-    now = datetime.utcnow()
+# Plan rows (limits) change only through admin edits
+_PLAN_CACHE = TTLCache(ttl_seconds=300)
 
-    with conn.cursor() as cur:
+
+def _get_plan(conn, plan_id: int, cur=None):
+    plan = _PLAN_CACHE.get(plan_id)
+    if plan is not None:
+        return plan
+
+    with _cursor(conn, cur) as cur:
+        cur.execute("""
+            SELECT
+                name AS plan_name,
+                max_channels,
+                posts_per_day,
+                comments_per_day,
+                dms_per_day
+            FROM subscription_plans
+            WHERE id = %s
+        """, (plan_id,))
+        row = cur.fetchone()
+
+    if row is None:
+        return None
+
+    plan = dict(row)
+    _PLAN_CACHE.set(plan_id, plan)
+    return plan
+
+
+def invalidate_plan_cache(plan_id: Optional[int] = None) -> None:
+    """
+    Drop cached plan rows after a plan is created/updated/deleted.
+    """
+    if plan_id is None:
+        _PLAN_CACHE.clear()
+    else:
+        _PLAN_CACHE.invalidate(plan_id)
+
+
+def get_active_subscription(conn, user_id: int, cur=None):
+    with _cursor(conn, cur) as cur:
         cur.execute("""
             SELECT
                 us.plan_id,
-                sp.name AS plan_name,
                 us.start_date,
                 us.end_date,
-                us.is_active,
-                'active' AS status,
-                sp.max_channels,
-                sp.posts_per_day,
-                sp.comments_per_day,
-                sp.dms_per_day
+                us.is_active
             FROM user_subscriptions us
-            JOIN subscription_plans sp ON sp.id = us.plan_id
             WHERE us.user_id = %s
               AND us.is_active = TRUE
-              AND us.start_date <= %s
-              AND us.end_date >= %s
-        """, (user_id, now, now))
+              AND NOW() BETWEEN us.start_date AND us.end_date
+        """, (user_id,))
 
-        return cur.fetchone()
+        subscription = cur.fetchone()
+
+        if subscription is None:
+            return None
 
+        plan = _get_plan(conn, subscription["plan_id"], cur)
+    if plan is None:
+        return None
+
+    return {
+        "plan_id": subscription["plan_id"],
+        "plan_name": plan["plan_name"],
+        "start_date": subscription["start_date"],
+        "end_date": subscription["end_date"],
+        "is_active": subscription["is_active"],
+        "status": "active",
+        "max_channels": plan["max_channels"],
+        "posts_per_day": plan["posts_per_day"],
+        "comments_per_day": plan["comments_per_day"],
+        "dms_per_day": plan["dms_per_day"],
+    }
 
-def require_active_subscription(conn, user_id: int):
-    plan = get_active_subscription(conn, user_id)
+
+def require_active_subscription(conn, user_id: int, cur=None):
+    plan = get_active_subscription(conn, user_id, cur)
     if not plan:
         raise PermissionError("No active subscription")
     return plan
 
 
-def _today():
-    return datetime.utcnow().date()
-
 
-def get_today_usage(conn, user_id, platform):
-    with conn.cursor() as cur:
-        cur.execute("""
-            SELECT posts, comments, dms
-            FROM usage_counters
-            WHERE user_id = %s AND platform = %s AND date = %s
-        """, (user_id, platform, _today()))
+def get_today_usage(conn, user_id, platform, cur=None):
+    with _cursor(conn, cur) as cur:
+        _execute_prepared(cur, "p_today_usage", (user_id, platform))
 
         row = cur.fetchone()
 
@@ -518,9 +748,10 @@ def get_today_usage(conn, user_id, platform):
     }
 
 
-def check_daily_limit(conn, user_id, platform, action):
-    plan = require_active_subscription(conn, user_id)
-    usage = get_today_usage(conn, user_id, platform)
+def check_daily_limit(conn, user_id, platform, action, cur=None):
+    with _cursor(conn, cur) as cur:
+        plan = require_active_subscription(conn, user_id, cur)
+        usage = get_today_usage(conn, user_id, platform, cur)
 
     limits = {
         "post": plan["posts_per_day"],
@@ -533,32 +764,67 @@ def check_daily_limit(conn, user_id, platform, action):
             f"Daily {action} limit reached ({usage[action + 's']}/{limits[action]})"
         )
 
-def consume_daily_limit(conn, user_id, platform, action):
-    with conn.cursor() as cur:
+def consume_daily_limit(conn, user_id, platform, action, cur=None):
+    with _cursor(conn, cur) as cur:
         cur.execute("""
             INSERT INTO usage_counters (user_id, platform, date)
-            VALUES (%s, %s, %s)
+            VALUES (%s, %s, CURRENT_DATE)
             ON CONFLICT DO NOTHING
-        """, (user_id, platform, _today()))
+        """, (user_id, platform))
 
         cur.execute(f"""
             UPDATE usage_counters
             SET {action}s = {action}s + 1
-            WHERE user_id = %s AND platform = %s AND date = %s
-        """, (user_id, platform, _today()))
+            WHERE user_id = %s AND platform = %s AND date = CURRENT_DATE
+        """, (user_id, platform))
+
+# action -> (usage_counters column, subscription_plans limit column)
+_LIMIT_COLUMNS = {
+    "post": ("posts", "posts_per_day"),
+    "comment": ("comments", "comments_per_day"),
+    "dm": ("dms", "dms_per_day"),
+}
 
-    conn.commit()
 
-def check_and_consume_limit(conn, user_id, platform, action):
+def check_and_consume_limit(conn, user_id, platform, action, cur=None):
     """
-    Legacy wrapper.
-    SAFE:
-    - Checks subscription
-    - Checks limit
-    - CONSUMES ONLY WHEN CALLED EXPLICITLY
+    Atomically check the daily limit and consume one unit.
+
+    One statement: the counter is inserted/incremented only while it is
+    below the active plan's limit, so concurrent workers can't both
+    pass the check. Raises PermissionError (same messages as
+    check_daily_limit) when nothing was consumed.
     """
-    check_daily_limit(conn, user_id, platform, action)
-    consume_daily_limit(conn, user_id, platform, action)
+    if action not in _LIMIT_COLUMNS:
+        raise ValueError(f"Unknown action: {action}")
+
+    # Both names come from the whitelist above, never from the caller
+    usage_col, limit_col = _LIMIT_COLUMNS[action]
+
+    with _cursor(conn, cur) as cur:
+        cur.execute(f"""
+            WITH plan AS (
+                SELECT sp.{limit_col} AS daily_limit
+                FROM user_subscriptions us
+                JOIN subscription_plans sp ON sp.id = us.plan_id
+                WHERE us.user_id = %s
+                  AND us.is_active = TRUE
+                  AND NOW() BETWEEN us.start_date AND us.end_date
+            )
+            INSERT INTO usage_counters (user_id, platform, date, {usage_col})
+            SELECT %s, %s, CURRENT_DATE, 1
+            FROM plan
+            WHERE plan.daily_limit > 0
+            ON CONFLICT (user_id, platform, date) DO UPDATE
+            SET {usage_col} = usage_counters.{usage_col} + 1
+            WHERE usage_counters.{usage_col} < (SELECT daily_limit FROM plan)
+            RETURNING {usage_col}
+        """, (user_id, user_id, platform))
+
+        if cur.fetchone() is None:
+            # Rare path: re-read to report why, without consuming anything
+            check_daily_limit(conn, user_id, platform, action, cur)
+            raise PermissionError(f"Daily {action} limit reached")
 
 def create_payment_intent(conn, user_id: int, plan_id: int, amount: int):
     payment_id = uuid.uuid4()
@@ -572,7 +838,6 @@ def create_payment_intent(conn, user_id: int, plan_id: int, amount: int):
             RETURNING id
         """, (str(payment_id), user_id, plan_id, amount))
 
-    conn.commit()
     return payment_id
 
 def attach_zeroid_reference(conn, payment_id, zeroid_reference: str):
@@ -584,19 +849,131 @@ def attach_zeroid_reference(conn, payment_id, zeroid_reference: str):
             WHERE id = %s
         """, (zeroid_reference, str(payment_id)))
 
-    conn.commit()
 
+# --------------------------------------------------
+# PAYMENT EVENT LOG (batched)
+# --------------------------------------------------
+
+# Webhook events are appended to an in-process queue and written in
+# batches by one background thread, instead of an INSERT + COMMIT per
+# event on the request path.
+PAYMENT_EVENT_BATCH_SIZE = 500
+PAYMENT_EVENT_FLUSH_INTERVAL = 0.25  # seconds
 
-def log_payment_event(conn, payment_intent_id, event_type, payload):
-    with conn.cursor() as cur:
-        cur.execute("""
-            INSERT INTO payment_events (
-                payment_intent_id, event_type, payload
+_PAYMENT_EVENT_QUEUE: "queue.Queue" = queue.Queue(maxsize=10_000)
+_PAYMENT_EVENT_FLUSHER = None
+_PAYMENT_EVENT_FLUSHER_PID = None
+_PAYMENT_EVENT_FLUSHER_LOCK = threading.Lock()
+
+_PAYMENT_EVENT_INSERT = """
+    INSERT INTO payment_events (
+        payment_intent_id, event_type, payload, received_at
+    )
+    VALUES %s
+"""
+_PAYMENT_EVENT_TEMPLATE = "(%s, %s, %s::jsonb, NOW())"
+
+
+def _write_payment_events(rows):
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            psycopg2.extras.execute_values(
+                cur,
+                _PAYMENT_EVENT_INSERT,
+                rows,
+                template=_PAYMENT_EVENT_TEMPLATE,
+                page_size=PAYMENT_EVENT_BATCH_SIZE,
+            )
+
+
+def _payment_event_flusher():
+    while True:
+        rows = []
+        waiters = []
+
+        item = _PAYMENT_EVENT_QUEUE.get()
+        deadline = time.monotonic() + PAYMENT_EVENT_FLUSH_INTERVAL
+
+        while True:
+            # flush_payment_events() enqueues an Event: write what we
+            # have so far, then wake the caller
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+                break
+
+            rows.append(item)
+            if len(rows) >= PAYMENT_EVENT_BATCH_SIZE:
+                break
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                item = _PAYMENT_EVENT_QUEUE.get(timeout=remaining)
+            except queue.Empty:
+                break
+
+        if rows:
+            try:
+                _write_payment_events(rows)
+            except Exception:
+                logger.exception(f"Dropped {len(rows)} payment event(s)")
+
+        for waiter in waiters:
+            waiter.set()
+
+
+def _ensure_payment_event_flusher():
+    global _PAYMENT_EVENT_FLUSHER, _PAYMENT_EVENT_FLUSHER_PID
+
+    pid = os.getpid()
+    if _PAYMENT_EVENT_FLUSHER_PID == pid and _PAYMENT_EVENT_FLUSHER.is_alive():
+        return
+
+    with _PAYMENT_EVENT_FLUSHER_LOCK:
+        # Threads don't survive fork: a child starts its own flusher
+        if _PAYMENT_EVENT_FLUSHER_PID != pid or not _PAYMENT_EVENT_FLUSHER.is_alive():
+            _PAYMENT_EVENT_FLUSHER = threading.Thread(
+                target=_payment_event_flusher,
+                name="payment-event-flusher",
+                daemon=True,
             )
-            VALUES (%s, %s, %s)
-        """, (payment_intent_id, event_type, json.dumps(payload)))
+            _PAYMENT_EVENT_FLUSHER.start()
+            _PAYMENT_EVENT_FLUSHER_PID = pid
+
+
+def log_payment_event(payment_intent_id, event_type, payload):
+    """
+    Record a payment webhook event.
 
-    conn.commit()
+    Returns immediately; the row is written by the background flusher
+    within PAYMENT_EVENT_FLUSH_INTERVAL. If the queue is full the event
+    is written synchronously rather than dropped.
+    """
+    row = (str(payment_intent_id), event_type, psycopg2.extras.Json(payload))
+
+    _ensure_payment_event_flusher()
+    try:
+        _PAYMENT_EVENT_QUEUE.put_nowait(row)
+    except queue.Full:
+        _write_payment_events([row])
+
+
+def flush_payment_events(timeout: float = 5.0) -> bool:
+    """
+    Block until every event queued so far is written (graceful shutdown).
+
+    Returns False if the flusher didn't catch up within `timeout`.
+    """
+    if _PAYMENT_EVENT_FLUSHER_PID != os.getpid():
+        return True  # nothing was ever queued in this process
+
+    done = threading.Event()
+    try:
+        _PAYMENT_EVENT_QUEUE.put(done, timeout=timeout)
+    except queue.Full:
+        return False
+    return done.wait(timeout)
 
 def mark_payment_paid(conn, zeroid_reference: str):
     """
@@ -623,35 +1000,22 @@ def activate_subscription_for_user(conn, user_id: int, plan_id: int):
     """
 
     with conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor) as cur:
-        # Deactivate existing subscriptions
-        cur.execute(
-            """
-            UPDATE user_subscriptions
-            SET is_active = FALSE
-            WHERE user_id = %s;
-            """,
-            (user_id,),
-        )
-
-        # Get plan duration
+        # One round-trip: look up the plan, deactivate existing
+        # subscriptions and activate the new one. Nothing changes when
+        # the plan doesn't exist.
         cur.execute(
             """
-            SELECT duration_days
-            FROM subscription_plans
-            WHERE id = %s;
-            """,
-            (plan_id,),
-        )
-        plan = cur.fetchone()
-
-        if not plan:
-            raise ValueError("Invalid subscription plan")
-
-        end_date = f"NOW() + INTERVAL '{plan['duration_days']} days'"
-
-        # Activate new subscription
-        cur.execute(
-            f"""
+            WITH plan AS (
+                SELECT duration_days
+                FROM subscription_plans
+                WHERE id = %s
+            ),
+            deactivated AS (
+                UPDATE user_subscriptions
+                SET is_active = FALSE
+                WHERE user_id = %s
+                  AND EXISTS (SELECT 1 FROM plan)
+            )
             INSERT INTO user_subscriptions (
                 user_id,
                 plan_id,
@@ -659,33 +1023,61 @@ def activate_subscription_for_user(conn, user_id: int, plan_id: int):
                 end_date,
                 is_active
             )
-            VALUES (%s, %s, NOW(), {end_date}, TRUE);
+            SELECT %s, %s, NOW(), NOW() + make_interval(days => plan.duration_days), TRUE
+            FROM plan
+            RETURNING end_date;
             """,
-            (user_id, plan_id),
+            (plan_id, user_id, user_id, plan_id),
         )
 
+        if cur.fetchone() is None:
+            raise ValueError("Invalid subscription plan")
+
 
 # =====================
 # Admin Operations
 # ====================
 
+# user_id -> is_admin; checked on every admin request
+_ADMIN_CACHE = TTLCache(ttl_seconds=30)
+
+
 # Admin Checker
 def is_admin_user(user_id: int) -> bool:
+    cached = _ADMIN_CACHE.get(user_id)
+    if cached is not None:
+        return cached
+
     with get_conn() as conn:
-        with conn.cursor() as cur:
-            cur.execute(
-                "SELECT is_admin FROM users WHERE id = %s",
-                (user_id,),
-            )
-            row = cur.fetchone()
-    return bool(row and row["is_admin"])
+        with _tuple_cursor(conn) as cur:
+            _execute_prepared(cur, "p_is_admin", (user_id,))
+            is_admin = cur.fetchone() is not None
+
+    _ADMIN_CACHE.set(user_id, is_admin)
+    return is_admin
 
 
 # List All Users
-def admin_list_users():
+def admin_list_users(cursor=None, limit: int = 100):
+    """
+    One page of users, newest first (keyset pagination).
+
+    cursor: (created_at, id) of the last row of the previous page, or
+    None for the first page.
+
+    Returns (rows, next_cursor); next_cursor is None on the last page.
+    """
+    after = ""
+    params = []
+    if cursor is not None:
+        # (created_at, id) is unique, so rows sharing a timestamp
+        # aren't skipped or repeated across pages
+        after = "WHERE (u.created_at, u.id) < (%s, %s)"
+        params.extend(cursor)
+
     with get_conn() as conn:
         with conn.cursor() as cur:
-            cur.execute("""
+            cur.execute(f"""
                 SELECT
                     u.id,
                     u.email,
@@ -701,9 +1093,17 @@ def admin_list_users():
                     ON us.user_id = u.id AND us.is_active = TRUE
                 LEFT JOIN subscription_plans sp
                     ON sp.id = us.plan_id
-                ORDER BY u.created_at DESC;
-            """)
-            return cur.fetchall()
+                {after}
+                ORDER BY u.created_at DESC, u.id DESC
+                LIMIT %s;
+            """, (*params, limit))
+            rows = cur.fetchall()
+
+    next_cursor = None
+    if len(rows) == limit:
+        next_cursor = (rows[-1]["created_at"], rows[-1]["id"])
+
+    return rows, next_cursor
 
 
 # Activate or Deactivate User
@@ -717,9 +1117,10 @@ def admin_set_user_active(user_id: int, is_active: bool):
                         WHEN %s = FALSE THEN NOW()
                         ELSE NULL
                     END
-                WHERE id = %s;
+                WHERE id = %s
+                RETURNING id, is_active, disabled_at;
             """, (is_active, is_active, user_id))
-        conn.commit()
+            return cur.fetchone()
 
 
 # Extend User Subscription
@@ -728,11 +1129,12 @@ def admin_extend_subscription(user_id: int, days: int):
         with conn.cursor() as cur:
             cur.execute("""
                 UPDATE user_subscriptions
-                SET end_date = end_date + (%s || ' days')::INTERVAL
+                SET end_date = end_date + make_interval(days => %s)
                 WHERE user_id = %s
-                  AND is_active = TRUE;
-            """, (f"{days} days", user_id))
-        conn.commit()
+                  AND is_active = TRUE
+                RETURNING id, end_date;
+            """, (days, user_id))
+            return cur.fetchone()
 
 # View User Payment History
 def admin_get_user_payments(user_id: int):
@@ -751,7 +1153,7 @@ def admin_get_user_payments(user_id: int):
             """, (user_id,))
             return cur.fetchall()
 
-from app.services.email import send_password_reset_email
+from app.services.email_queue import queue_password_reset_email
 import secrets
 
 
@@ -761,70 +1163,72 @@ def create_password_reset_token(email: str) -> bool:
     Returns True if token was created (email may or may not have been sent).
     Returns False if user does not exist (silent for security).
     """
-    token = None
+    token = secrets.token_urlsafe(48)
 
     with get_conn() as conn:
-        with conn.cursor() as cur:
-            cur.execute(
-                "SELECT id FROM users WHERE email = %s AND is_active = TRUE",
-                (email,),
-            )
-            user = cur.fetchone()
-
-            if not user:
-                return False  # silent exit (security)
-
-            token = secrets.token_urlsafe(48)
-            expires_at = datetime.utcnow() + timedelta(minutes=30)
-
+        with _tuple_cursor(conn) as cur:
+            # Inserts nothing when there's no active user with that email
             cur.execute(
                 """
                 INSERT INTO password_reset_tokens (user_id, token, expires_at)
-                VALUES (%s, %s, %s)
+                SELECT id, %s, NOW() + INTERVAL '30 minutes'
+                FROM users
+                WHERE email = %s AND is_active = TRUE
+                RETURNING user_id
                 """,
-                (user["id"], token, expires_at),
+                (token, email),
             )
-        conn.commit()
 
-    # Send email (non-blocking, logs errors internally)
-    if token:
-        send_password_reset_email(email, token)
+            if cur.fetchone() is None:
+                return False  # silent exit (security)
+
+    # Delivered by a Celery worker; logs errors internally
+    queue_password_reset_email(email, token)
 
     return True
 
 def reset_password_with_token(token: str, new_password: str) -> bool:
-    from app.utils.security import hash_password
+    # bcrypt runs before a pooled connection is checked out
+    password_hash = hash_password(new_password)
 
     with get_conn() as conn:
         with conn.cursor() as cur:
+            # Claiming the token and updating the password in one
+            # statement also stops a token from being used twice
             cur.execute(
                 """
-                SELECT prt.id, prt.user_id
-                FROM password_reset_tokens prt
-                WHERE prt.token = %s
-                  AND prt.used = FALSE
-                  AND prt.expires_at > NOW()
+                WITH claimed AS (
+                    UPDATE password_reset_tokens
+                    SET used = TRUE
+                    WHERE token = %s
+                      AND used = FALSE
+                      AND expires_at > NOW()
+                    RETURNING user_id
+                )
+                UPDATE users
+                SET password_hash = %s
+                FROM claimed
+                WHERE users.id = claimed.user_id
+                RETURNING users.id
                 """,
-                (token,),
+                (token, password_hash),
             )
-            row = cur.fetchone()
+            return cur.fetchone() is not None
 
-            if not row:
-                return False
-
-            password_hash = hash_password(new_password)
-
-            cur.execute(
-                "UPDATE users SET password_hash = %s WHERE id = %s",
-                (password_hash, row["user_id"]),
-            )
 
-            cur.execute(
-                "UPDATE password_reset_tokens SET used = TRUE WHERE id = %s",
-                (row["id"],),
-            )
-
-    return True
+def delete_stale_password_reset_tokens() -> int:
+    """
+    Remove used tokens and tokens expired for over a week.
+    Returns the number of rows deleted.
+    """
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute("""
+                DELETE FROM password_reset_tokens
+                WHERE used = TRUE
+                   OR expires_at < NOW() - INTERVAL '7 days'
+            """)
+            return cur.rowcount
 
 
 def set_user_admin_status(user_id: int, is_admin: bool) -> bool:
@@ -835,18 +1239,24 @@ def set_user_admin_status(user_id: int, is_admin: bool) -> bool:
                 UPDATE users
                 SET is_admin = %s
                 WHERE id = %s
+                RETURNING id
                 """,
                 (is_admin, user_id),
             )
-            return cur.rowcount > 0
+            updated = cur.fetchone() is not None
+
+    # After commit, so a concurrent read can't re-cache the old value
+    _ADMIN_CACHE.invalidate(user_id)
+    return updated
 
 def get_admin_count() -> int:
     with get_conn() as conn:
-        with conn.cursor() as cur:
+        with _tuple_cursor(conn) as cur:
             cur.execute(
-                "SELECT COUNT(*) AS cnt FROM users WHERE is_admin = TRUE"
+                "SELECT COUNT(*) FROM users WHERE is_admin = TRUE"
             )
-            return cur.fetchone()["cnt"]
+            (count,) = cur.fetchone()
+            return count
 
 
 # --------------------------------------------------
@@ -867,9 +1277,8 @@ def create_post_payment_intent(conn, user_id: int, post_data: dict, amount: int
             )
             VALUES (%s, %s, %s, %s, 'pending', %s)
             RETURNING id
-        """, (str(payment_id), user_id, json.dumps(post_data), amount, str(payment_id)))
+        """, (str(payment_id), user_id, psycopg2.extras.Json(post_data), amount, str(payment_id)))
 
-    conn.commit()
     return payment_id
 
 
@@ -900,9 +1309,7 @@ def mark_post_payment_paid(conn, zeroid_reference: str):
               AND status = 'pending'
             RETURNING user_id, post_data;
         """, (zeroid_reference,))
-        row = cur.fetchone()
-        conn.commit()
-        return row
+        return cur.fetchone()
 
 
 def mark_post_payment_failed(conn, zeroid_reference: str, reason: str = None):
@@ -916,7 +1323,6 @@ def mark_post_payment_failed(conn, zeroid_reference: str, reason: str = None):
             WHERE zeroid_reference = %s
               AND status = 'pending'
         """, (zeroid_reference,))
-    conn.commit()
 
 
 def get_post_payment_status(payment_id: str):
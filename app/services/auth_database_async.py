@@ -0,0 +1,74 @@
+"""
+Async Auth Database (asyncpg)
+
+Responsibilities:
+- asyncio counterpart of the per-request user lookup in auth_database,
+  for the FastAPI auth dependency (runs on the event loop)
+- One asyncpg pool per process (search_path = auth, public; UTC)
+
+Celery workers and sync endpoints keep using auth_database.
+"""
+
+import asyncio
+import os
+from typing import Optional
+
+import asyncpg
+
+from app.config import settings
+
+
+# --------------------------------------------------
+# CONNECTION POOL
+# --------------------------------------------------
+
+_POOL: Optional[asyncpg.Pool] = None
+_POOL_LOCK = asyncio.Lock()
+
+
+async def get_pool() -> asyncpg.Pool:
+    global _POOL
+
+    if _POOL is not None:
+        return _POOL
+
+    async with _POOL_LOCK:
+        if _POOL is None:
+            database_url = os.getenv("DATABASE_URL")
+            if not database_url:
+                raise RuntimeError("DATABASE_URL is not set")
+
+            _POOL = await asyncpg.create_pool(
+                dsn=database_url,
+                min_size=min(4, settings.DB_POOL_MAX),
+                max_size=settings.DB_POOL_MAX,
+                # Same session settings as the sync pool
+                server_settings={"search_path": "auth,public", "TimeZone": "UTC"},
+            )
+
+    return _POOL
+
+
+async def close_pool() -> None:
+    global _POOL
+
+    if _POOL is not None:
+        await _POOL.close()
+        _POOL = None
+
+
+# --------------------------------------------------
+# USERS
+# --------------------------------------------------
+
+async def get_user_by_email(email: str) -> Optional[dict]:
+    """
+    Returns dict {id, email, is_active, is_admin} or None.
+    """
+    pool = await get_pool()
+    row = await pool.fetchrow(
+        "SELECT id, email, is_active, is_admin FROM users WHERE email = $1",
+        email,
+    )
+    return dict(row) if row else None
+
@@ -116,6 +116,7 @@ def select_segments(
     video_end = transcript[-1]["end"]
 
     # Reduce token size but keep enough context for AI
+    # (serialized without indentation below: whitespace is tokens too)
     compact_transcript = [
         {
             "start": round(s["start"], 2),
@@ -132,7 +133,7 @@ def select_segments(
     user_prompt = f"""
 Here is a transcript with timestamps:
 
-{json.dumps(compact_transcript, indent=2)}
+{json.dumps(compact_transcript, separators=(",", ":"))}
 
 Select up to {max_clips} engaging segments from this transcript.
 
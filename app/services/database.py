@@ -14,6 +14,18 @@ from pathlib import Path
 from google.auth.transport.requests import Request
 from psycopg2.extras import RealDictCursor
 import psycopg2.extras
+from contextlib import contextmanager
+from functools import lru_cache
+
+import orjson
+
+from app.config import settings
+from app.utils.cache import TTLCache
+from app.utils.db_pool import (
+    PreparingConnection,
+    RetainingConnectionPool,
+    execute_prepared,
+)
 
 APP_SCHEMA = "app"
 
@@ -21,6 +33,9 @@ APP_SCHEMA = "app"
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# JSONB columns (accounts.session_data) come back already decoded
+psycopg2.extras.register_default_jsonb(loads=orjson.loads, globally=True)
+
 # PostgreSQL connection parameters
 DATABASE_URL = os.environ.get("DATABASE_URL")
 
@@ -28,23 +43,136 @@ if not DATABASE_URL:
     raise RuntimeError("DATABASE_URL is not set")
 
 
-_db_lock = threading.Lock()
+# Connection pool, created lazily per process (a forked Celery worker
+# must not reuse its parent's sockets, so it's rebuilt on pid change)
+_POOL = None
+_POOL_SLOTS = None
+_POOL_PID = None
+_POOL_LOCK = threading.Lock()
+
+
+def _get_pool():
+    global _POOL, _POOL_SLOTS, _POOL_PID
+
+    pid = os.getpid()
+    if _POOL is not None and _POOL_PID == pid:
+        return _POOL, _POOL_SLOTS
+
+    with _POOL_LOCK:
+        if _POOL is None or _POOL_PID != pid:
+            _POOL = RetainingConnectionPool(
+                minconn=1,
+                maxconn=settings.DB_POOL_MAX,
+                dsn=DATABASE_URL,
+                connection_factory=PreparingConnection,
+                # Set search_path to app schema for all queries, once per connection
+                options="-c search_path=app,public",
+            )
+            # ThreadedConnectionPool raises when exhausted; make callers wait
+            _POOL_SLOTS = threading.BoundedSemaphore(settings.DB_POOL_MAX)
+            _POOL_PID = pid
+
+    return _POOL, _POOL_SLOTS
 
-def connect():
-    conn = psycopg2.connect(DATABASE_URL)
-    # Set search_path to app schema for all queries
-    with conn.cursor() as cur:
-        cur.execute("SET search_path TO app, public;")
-    return conn
+
+@contextmanager
+def get_conn():
+    """
+    Borrow a pooled connection (search_path = app, public).
+
+    Commits when the block succeeds, rolls back when it raises, and
+    always returns the connection to the pool.
+    """
+    conn_pool, slots = _get_pool()
+
+    with slots:
+        conn = conn_pool.getconn()
+        try:
+            yield conn
+            conn.commit()
+        except BaseException:
+            if not conn.closed:
+                try:
+                    conn.rollback()
+                except psycopg2.Error:
+                    pass
+            raise
+        finally:
+            # Broken connections are discarded rather than handed out again
+            conn_pool.putconn(conn, close=bool(conn.closed))
 
 
 def get_db():
     """Database connection generator for FastAPI dependency"""
-    conn = connect()
-    try:
+    with get_conn() as conn:
         yield conn
-    finally:
-        conn.close()
+
+
+# name -> (argument types, query). PREPAREd once per pooled connection
+# on first use, then EXECUTEd; these run in the scheduler/worker loops.
+_PREPARED_STATEMENTS = {
+    "p_post_status": (
+        ("integer",),
+        "SELECT status FROM posts WHERE id = %s",
+    ),
+    "p_update_post_status": (
+        ("text", "text", "integer"),
+        "UPDATE posts SET status = %s, error_message = %s WHERE id = %s",
+    ),
+    "p_user_timezone": (
+        ("integer",),
+        "SELECT timezone FROM user_timezones WHERE user_id = %s",
+    ),
+    "p_accounts": (
+        ("integer",),
+        "SELECT a.id, a.platform, a.account_username, a.password "
+        "FROM accounts a WHERE a.user_id = %s",
+    ),
+    # Random offset instead of ORDER BY RANDOM(): no sort of the whole set
+    "p_random_proxy": (
+        ("integer", "integer"),
+        "SELECT id, proxy_address, proxy_type FROM proxies "
+        "WHERE is_active = TRUE AND user_id = %s "
+        "OFFSET floor(random() * ("
+        "SELECT count(*) FROM proxies WHERE is_active = TRUE AND user_id = %s"
+        ")) LIMIT 1",
+    ),
+}
+
+
+# get_accounts_by_filters: one prepared statement per filter shape,
+# keyed (has_platform, group filter) -> statement name
+_ACCOUNT_FILTER_SELECT = (
+    "SELECT a.id, a.platform, a.account_username, a.password, "
+    "g.id AS group_id, g.group_name "
+    "FROM accounts a "
+    "LEFT JOIN group_accounts ga ON ga.account_id = a.id "
+    "LEFT JOIN groups g ON g.id = ga.group_id "
+    "WHERE a.user_id = %s"
+)
+_ACCOUNT_FILTER_GROUP = {
+    None: ((), ""),
+    "id": (("integer",), " AND g.id = %s"),
+    "name": (("text",), " AND g.group_name = %s"),
+}
+_ACCOUNT_FILTER_STATEMENTS = {}
+
+for _has_platform in (False, True):
+    for _group_by, (_group_types, _group_sql) in _ACCOUNT_FILTER_GROUP.items():
+        _name = f"p_accounts_filter_{'p' if _has_platform else 'x'}_{_group_by or 'x'}"
+        _PREPARED_STATEMENTS[_name] = (
+            ("integer",) + (("text",) if _has_platform else ()) + _group_types,
+            _ACCOUNT_FILTER_SELECT
+            + (" AND a.platform = %s" if _has_platform else "")
+            + _group_sql,
+        )
+        _ACCOUNT_FILTER_STATEMENTS[(_has_platform, _group_by)] = _name
+
+del _has_platform, _group_by, _group_types, _group_sql, _name
+
+
+def _execute_prepared(cur, name, params):
+    execute_prepared(cur, _PREPARED_STATEMENTS, name, params)
 
 def init_db():
     """Initialize PostgreSQL database with schema"""
@@ -101,8 +229,12 @@ def init_db():
         c.execute("DROP TABLE IF EXISTS app.users CASCADE;")
         conn.commit()
 
+    # Everything below is plain DDL: collect it and send it as one
+    # multi-statement script (one round trip, one transaction)
+    ddl = []
+
     # Groups table
-    c.execute("""
+    ddl.append("""
         CREATE TABLE IF NOT EXISTS groups (
             id SERIAL PRIMARY KEY,
             user_id INTEGER,
@@ -112,13 +244,13 @@ def init_db():
 
 
     # Migration: Add user_id column if missing
-    c.execute("""
+    ddl.append("""
         ALTER TABLE groups
         ADD COLUMN IF NOT EXISTS user_id INTEGER;
     """)
 
     # Proxies table
-    c.execute("""
+    ddl.append("""
         CREATE TABLE IF NOT EXISTS proxies (
             id SERIAL PRIMARY KEY,
 
@@ -137,26 +269,50 @@ def init_db():
     """)
 
     # Migration: Add user_id column if missing
-    c.execute("""
+    ddl.append("""
         ALTER TABLE proxies
         ADD COLUMN IF NOT EXISTS user_id INTEGER;
     """)
 
+    # get_random_proxy counts and offsets into a user's active proxies
+    ddl.append("""
+        CREATE INDEX IF NOT EXISTS idx_proxies_user_active
+        ON proxies (user_id) WHERE is_active;
+    """)
+
     # Accounts table
-    c.execute("""
+    ddl.append("""
         CREATE TABLE IF NOT EXISTS accounts (
             id SERIAL PRIMARY KEY,
             user_id INTEGER,
             platform TEXT NOT NULL,
             account_username TEXT NOT NULL,
             password TEXT NOT NULL,
-            session_data TEXT,
+            session_data JSONB,
             status TEXT DEFAULT 'active'
         )
     """)
 
+    # Migration: session_data TEXT (json.dumps) -> JSONB
+    ddl.append("""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_schema = 'app'
+                  AND table_name = 'accounts'
+                  AND column_name = 'session_data'
+                  AND data_type = 'text'
+            ) THEN
+                ALTER TABLE accounts
+                ALTER COLUMN session_data TYPE JSONB
+                USING NULLIF(session_data, '')::jsonb;
+            END IF;
+        END $$;
+    """)
+
     # Migration: Add user_id column if missing
-    c.execute("""
+    ddl.append("""
         ALTER TABLE accounts
         ADD COLUMN IF NOT EXISTS user_id INTEGER;
     """)
@@ -164,7 +320,7 @@ def init_db():
     # ===========================================
     # AI CLIP GENERATION TABLES
     # ===========================================
-    c.execute("""
+    ddl.append("""
         CREATE TABLE IF NOT EXISTS clip_jobs (
             id SERIAL PRIMARY KEY,
             user_id INTEGER NOT NULL,
@@ -180,33 +336,38 @@ def init_db():
         );
     """)
 
-    c.execute("""
+    ddl.append("""
         ALTER TABLE clip_jobs
         ADD COLUMN IF NOT EXISTS local_video_path TEXT;
     """)
 
-    c.execute("""
+    ddl.append("""
         ALTER TABLE clip_jobs
         ADD COLUMN IF NOT EXISTS clip_length INTEGER DEFAULT 30;
     """)
 
-    c.execute("""
+    ddl.append("""
         ALTER TABLE clip_jobs
         ADD COLUMN IF NOT EXISTS max_clips INTEGER DEFAULT 3;
     """)
 
-    c.execute("""
+    ddl.append("""
         ALTER TABLE clip_jobs
         ADD COLUMN IF NOT EXISTS style TEXT DEFAULT 'highlight';
     """)
 
-    c.execute("""
+    ddl.append("""
         ALTER TABLE clip_jobs
         ADD COLUMN IF NOT EXISTS error TEXT;
     """)
 
+    ddl.append("""
+        ALTER TABLE clip_jobs
+        ADD COLUMN IF NOT EXISTS want_subtitles BOOLEAN NOT NULL DEFAULT TRUE;
+    """)
 
-    c.execute("""
+
+    ddl.append("""
         CREATE TABLE IF NOT EXISTS clips (
             id SERIAL PRIMARY KEY,
             clip_job_id INTEGER NOT NULL,
@@ -219,23 +380,23 @@ def init_db():
         );
     """)
 
-    c.execute("""
+    ddl.append("""
         CREATE INDEX IF NOT EXISTS idx_clip_jobs_user
         ON clip_jobs (user_id);
     """)
 
-    c.execute("""
+    ddl.append("""
         CREATE INDEX IF NOT EXISTS idx_clip_jobs_status
         ON clip_jobs (status);
     """)
 
-    c.execute("""
+    ddl.append("""
         CREATE INDEX IF NOT EXISTS idx_clips_job
         ON clips (clip_job_id);
     """)
 
     # Posts table
-    c.execute("""
+    ddl.append("""
         CREATE TABLE IF NOT EXISTS posts (
             id SERIAL PRIMARY KEY,
             account_id INTEGER NOT NULL,
@@ -262,60 +423,77 @@ def init_db():
     # MIGRATION: Analytics fields
     # ===============================
 
-    c.execute("""
+    ddl.append("""
         ALTER TABLE posts
         ADD COLUMN IF NOT EXISTS likes INTEGER NOT NULL DEFAULT 0;
     """)
 
-    c.execute("""
+    ddl.append("""
         ALTER TABLE posts
         ADD COLUMN IF NOT EXISTS comments INTEGER NOT NULL DEFAULT 0;
     """)
 
-    c.execute("""
+    ddl.append("""
         ALTER TABLE posts
         ADD COLUMN IF NOT EXISTS views INTEGER NOT NULL DEFAULT 0;
     """)
 
-    c.execute("""
+    ddl.append("""
         ALTER TABLE posts
         ADD COLUMN IF NOT EXISTS shares INTEGER NOT NULL DEFAULT 0;
     """)
 
-    c.execute("""
+    ddl.append("""
         ALTER TABLE posts
         ADD COLUMN IF NOT EXISTS error_message TEXT;
     """)
-    c.execute("""
+    ddl.append("""
         ALTER TABLE posts
         ADD COLUMN IF NOT EXISTS youtube_video_id TEXT;
     """)
 
-    c.execute("""
+    ddl.append("""
         CREATE INDEX IF NOT EXISTS idx_posts_youtube_video
         ON posts (youtube_video_id);
     """)
 
-    c.execute("""
-        CREATE INDEX IF NOT EXISTS idx_posts_user_status
-        ON posts (user_id, status);
+    # Dashboard aggregates filter on (user_id, status) and sum the engagement
+    # counters; the covering index lets them run as index-only scans.
+    ddl.append("""
+        DROP INDEX IF EXISTS idx_posts_user_status;
     """)
 
-    c.execute("""
+    ddl.append("""
+        CREATE INDEX IF NOT EXISTS idx_posts_user_status_engagement
+        ON posts (user_id, status) INCLUDE (likes, comments, views, shares);
+    """)
+
+    ddl.append("""
         CREATE INDEX IF NOT EXISTS idx_posts_created_at
         ON posts (created_at);
     """)
 
+    ddl.append("""
+        CREATE INDEX IF NOT EXISTS idx_posts_user_created
+        ON posts (user_id, created_at);
+    """)
+
+    # update_matching_posts_status: equality on media/schedule, range on created_at
+    ddl.append("""
+        CREATE INDEX IF NOT EXISTS idx_posts_media_sched_created
+        ON posts (media_file, scheduled_time, created_at);
+    """)
+
 
 
     # Migration: Add user_id column if missing
-    c.execute("""
+    ddl.append("""
         ALTER TABLE posts
         ADD COLUMN IF NOT EXISTS user_id INTEGER;
     """)
 
     # Group ↔ Account mapping table
-    c.execute("""
+    ddl.append("""
         CREATE TABLE IF NOT EXISTS group_accounts (
             group_id INTEGER NOT NULL,
             account_id INTEGER NOT NULL,
@@ -326,7 +504,7 @@ def init_db():
     """)
 
     # Tokens table
-    c.execute("""
+    ddl.append("""
         CREATE TABLE IF NOT EXISTS tokens (
             id SERIAL PRIMARY KEY,
             account_id INTEGER NOT NULL,
@@ -338,7 +516,7 @@ def init_db():
     """)
 
     # Table to associate posts with multiple accounts
-    c.execute("""
+    ddl.append("""
         CREATE TABLE IF NOT EXISTS posts_accounts (
             post_id INTEGER NOT NULL,
             account_id INTEGER NOT NULL,
@@ -349,21 +527,47 @@ def init_db():
             FOREIGN KEY(proxy_id) REFERENCES proxies(id) ON DELETE SET NULL
         )
     """)
+
+    # accounts(id) is already served by its primary key; a covering copy
+    # for platform only doubled index writes on a narrow table
+    ddl.append("DROP INDEX IF EXISTS idx_accounts_id_platform;")
     
     # Timezones table
-    c.execute("""
+    ddl.append("""
         CREATE TABLE IF NOT EXISTS user_timezones (
             user_id INTEGER PRIMARY KEY,
             timezone TEXT NOT NULL DEFAULT 'UTC'
         )
     """)
-    c.execute("""
+    ddl.append("""
         CREATE INDEX IF NOT EXISTS idx_posts_scheduled
     ON posts (status, scheduled_time);
     """)
 
+    # Scheduler poll (claim_due_posts): only Pending rows, so the index
+    # stays small no matter how many posts have already gone out
+    ddl.append("""
+        CREATE INDEX IF NOT EXISTS idx_posts_pending_due
+        ON posts (scheduled_time)
+        WHERE status = 'Pending' AND scheduled_time IS NOT NULL;
+    """)
+
+    # Account-side lookups; the primary keys only cover the leading column
+    ddl.append("""
+        CREATE INDEX IF NOT EXISTS idx_pa_account
+        ON posts_accounts (account_id);
+    """)
+    ddl.append("""
+        CREATE INDEX IF NOT EXISTS idx_ga_account
+        ON group_accounts (account_id);
+    """)
+    ddl.append("""
+        CREATE INDEX IF NOT EXISTS idx_accounts_user
+        ON accounts (user_id);
+    """)
+
     # APScheduler job store table
-    c.execute("""
+    ddl.append("""
         CREATE TABLE IF NOT EXISTS apscheduler_jobs (
             id TEXT PRIMARY KEY,
             next_run_time DOUBLE PRECISION,
@@ -376,7 +580,7 @@ def init_db():
     # ===========================================
     
     # Conversations table
-    c.execute("""
+    ddl.append("""
         CREATE TABLE IF NOT EXISTS conversations (
             id SERIAL PRIMARY KEY,
             title TEXT,
@@ -386,7 +590,7 @@ def init_db():
     """)
     
     # Conversation participants (many-to-many)
-    c.execute("""
+    ddl.append("""
         CREATE TABLE IF NOT EXISTS conversation_participants (
             conversation_id INTEGER NOT NULL,
             user_id INTEGER NOT NULL,
@@ -402,7 +606,7 @@ def init_db():
     """)
     
     # Messages table
-    c.execute("""
+    ddl.append("""
         CREATE TABLE IF NOT EXISTS messages (
             id SERIAL PRIMARY KEY,
             conversation_id INTEGER NOT NULL,
@@ -420,62 +624,65 @@ def init_db():
     """)
     
     # Indexes for performance
-    c.execute("""
+    ddl.append("""
         CREATE INDEX IF NOT EXISTS idx_messages_conversation 
         ON messages (conversation_id, created_at DESC);
     """)
     
-    c.execute("""
+    ddl.append("""
         CREATE INDEX IF NOT EXISTS idx_conversation_participants_user 
         ON conversation_participants (user_id);
     """)
     
-    c.execute("""
+    ddl.append("""
         CREATE INDEX IF NOT EXISTS idx_messages_unread 
         ON messages (conversation_id, is_read) 
         WHERE is_read = FALSE;
     """)
 
+    c.execute(";\n".join(stmt.strip().rstrip(";") for stmt in ddl) + ";")
+
     conn.commit()
     conn.close()
 
 # Account operations
+
+# account_id -> (owner user_id, (id, platform, account_username)), or
+# _NO_ACCOUNT for ids that don't exist. Short TTL: it only absorbs bursts
+# of ownership probes (get_account_by_id) within a request spike.
+_ACCOUNT_CACHE = TTLCache(ttl_seconds=30, max_entries=10_000)
+_NO_ACCOUNT = object()
+
+
 def add_account(user_id, platform, account_username, password):
-    conn = connect()
-    c = conn.cursor()
-    try:
-        c.execute("""
-            INSERT INTO accounts (user_id, platform, account_username, password)
-            VALUES (%s, %s, %s, %s)
-            RETURNING id
-        """, (user_id, platform, account_username, password))
-        conn.commit()
-        return c.fetchone()[0]
-    finally:
-        conn.close()
+    with get_conn() as conn:
+        with conn.cursor() as c:
+            c.execute("""
+                INSERT INTO accounts (user_id, platform, account_username, password)
+                VALUES (%s, %s, %s, %s)
+                RETURNING id
+            """, (user_id, platform, account_username, password))
+            conn.commit()
+            account_id = c.fetchone()[0]
+
+    # Drop a cached "doesn't exist" for this id
+    _ACCOUNT_CACHE.invalidate(account_id)
+    return account_id
 
 def delete_account(account_id):
     """Delete an account from the database"""
-    conn = connect()
-    c = conn.cursor()
-    c.execute("DELETE FROM accounts WHERE id = %s", (account_id,))
-    conn.commit()
-    conn.close()
+    with get_conn() as conn:
+        with conn.cursor() as c:
+            c.execute("DELETE FROM accounts WHERE id = %s", (account_id,))
+            conn.commit()
+
+    _ACCOUNT_CACHE.invalidate(account_id)
 
 def get_accounts(user_id):
-    conn = connect()
-    c = conn.cursor()
-    c.execute("""
-        SELECT
-            a.id,
-            a.platform,
-            a.account_username,
-            a.password
-        FROM accounts a
-        WHERE a.user_id = %s
-    """, (user_id,))
-    rows = c.fetchall()
-    conn.close()
+    with get_conn() as conn:
+        with conn.cursor() as c:
+            _execute_prepared(c, "p_accounts", (user_id,))
+            rows = c.fetchall()
     return rows
 
 def get_accounts_by_filters(
@@ -485,143 +692,113 @@ def get_accounts_by_filters(
     group_name=None,
     return_dict=False
 ):
-    conn = connect()
-    c = conn.cursor()
-
-    query = """
-        SELECT
-            a.id,
-            a.platform,
-            a.account_username,
-            a.password,
-            g.id AS group_id,
-            g.group_name
-        FROM accounts a
-        LEFT JOIN group_accounts ga ON ga.account_id = a.id
-        LEFT JOIN groups g ON g.id = ga.group_id
-        WHERE a.user_id = %s
-    """
-    params = [user_id]
+    with get_conn() as conn:
+        # Dict rows straight from psycopg2 when the caller wants them
+        with conn.cursor(cursor_factory=RealDictCursor if return_dict else None) as c:
 
-    if platform:
-        query += " AND a.platform = %s"
-        params.append(platform)
+            params = [user_id]
 
-    if group_id is not None:
-        query += " AND g.id = %s"
-        params.append(group_id)
-    elif group_name is not None:
-        query += " AND g.group_name = %s"
-        params.append(group_name)
+            if platform:
+                params.append(platform)
 
-    c.execute(query, tuple(params))
-    results = c.fetchall()
-    conn.close()
+            group_by = None
+            if group_id is not None:
+                group_by = "id"
+                params.append(group_id)
+            elif group_name is not None:
+                group_by = "name"
+                params.append(group_name)
 
-    if return_dict:
-        return [
-            {
-                "id": row[0],
-                "platform": row[1],
-                "account_username": row[2],
-                "password": row[3],
-                "group_id": row[4],
-                "group_name": row[5],
-            }
-            for row in results
-        ]
+            name = _ACCOUNT_FILTER_STATEMENTS[(bool(platform), group_by)]
+            _execute_prepared(c, name, tuple(params))
+            results = c.fetchall()
 
     return results
 
 def get_account_by_id(account_id, user_id):
-    conn = connect()
-    c = conn.cursor()
-    try:
-        c.execute("""
-            SELECT id, platform, account_username
-            FROM accounts
-            WHERE id = %s AND user_id = %s
-        """, (account_id, user_id))
-        return c.fetchone()
-    finally:
-        conn.close()
+    cached = _ACCOUNT_CACHE.get(account_id)
+
+    if cached is None:
+        with get_conn() as conn:
+            with conn.cursor() as c:
+                c.execute("""
+                    SELECT user_id, id, platform, account_username
+                    FROM accounts
+                    WHERE id = %s
+                """, (account_id,))
+                row = c.fetchone()
+
+        # Cached per account, so every user's probe for it shares one entry
+        cached = (row[0], tuple(row[1:])) if row else _NO_ACCOUNT
+        _ACCOUNT_CACHE.set(account_id, cached)
+
+    if cached is _NO_ACCOUNT or cached[0] != user_id:
+        return None
+    return cached[1]
 
 def add_account_to_group(group_id, account_id):
-    conn = connect()
-    c = conn.cursor()
-    try:
-        c.execute("""
-            INSERT INTO group_accounts (group_id, account_id)
-            VALUES (%s, %s)
-            ON CONFLICT (group_id, account_id) DO NOTHING
-        """, (group_id, account_id))
-        conn.commit()
-    finally:
-        conn.close()
+    with get_conn() as conn:
+        with conn.cursor() as c:
+            c.execute("""
+                INSERT INTO group_accounts (group_id, account_id)
+                VALUES (%s, %s)
+                ON CONFLICT (group_id, account_id) DO NOTHING
+            """, (group_id, account_id))
+            conn.commit()
 
 def remove_account_from_group(group_id, account_id):
-    conn = connect()
-    c = conn.cursor()
-    try:
-        c.execute("""
-            DELETE FROM group_accounts
-            WHERE group_id = %s AND account_id = %s
-        """, (group_id, account_id))
-        conn.commit()
-    finally:
-        conn.close()
+    with get_conn() as conn:
+        with conn.cursor() as c:
+            c.execute("""
+                DELETE FROM group_accounts
+                WHERE group_id = %s AND account_id = %s
+            """, (group_id, account_id))
+            conn.commit()
 
 def get_accounts_for_group(group_id, user_id):
-    conn = connect()
-    c = conn.cursor()
-    try:
-        c.execute("""
-            SELECT a.id, a.platform, a.account_username
-            FROM accounts a
-            JOIN group_accounts ga ON ga.account_id = a.id
-            WHERE ga.group_id = %s AND a.user_id = %s
-        """, (group_id, user_id))
-        return c.fetchall()
-    finally:
-        conn.close()
+    with get_conn() as conn:
+        with conn.cursor() as c:
+            c.execute("""
+                SELECT a.id, a.platform, a.account_username
+                FROM accounts a
+                JOIN group_accounts ga ON ga.account_id = a.id
+                WHERE ga.group_id = %s AND a.user_id = %s
+            """, (group_id, user_id))
+            return c.fetchall()
 
 def get_available_accounts_for_group(group_id, user_id):
-    conn = connect()
-    c = conn.cursor()
-    try:
-        c.execute("""
-            SELECT a.id, a.platform, a.account_username
-            FROM accounts a
-            WHERE a.user_id = %s
-            AND a.id NOT IN (
-                SELECT account_id
-                FROM group_accounts
-                WHERE group_id = %s
-            )
-        """, (user_id, group_id))
-        return c.fetchall()
-    finally:
-        conn.close()
+    with get_conn() as conn:
+        with conn.cursor() as c:
+            c.execute("""
+                SELECT a.id, a.platform, a.account_username
+                FROM accounts a
+                WHERE a.user_id = %s
+                AND NOT EXISTS (
+                    -- Anti-join on the (group_id, account_id) primary key
+                    SELECT 1
+                    FROM group_accounts ga
+                    WHERE ga.group_id = %s
+                      AND ga.account_id = a.id
+                )
+            """, (user_id, group_id))
+            return c.fetchall()
 
 def get_all_accounts_with_groups(user_id):
-    conn = connect()
-    c = conn.cursor()
-    try:
-        c.execute("""
-            SELECT
-                a.id,
-                a.platform,
-                a.account_username,
-                g.id AS group_id,
-                g.group_name
-            FROM accounts a
-            LEFT JOIN group_accounts ga ON ga.account_id = a.id
-            LEFT JOIN groups g ON g.id = ga.group_id
-            WHERE a.user_id = %s
-        """, (user_id,))
-        return c.fetchall()
-    finally:
-        conn.close()
+    with get_conn() as conn:
+        with conn.cursor() as c:
+            c.execute("""
+                SELECT
+                    a.id,
+                    a.platform,
+                    a.account_username,
+                    g.id AS group_id,
+                    g.group_name
+                FROM accounts a
+                LEFT JOIN group_accounts ga ON ga.account_id = a.id
+                LEFT JOIN groups g ON g.id = ga.group_id
+                WHERE a.user_id = %s
+            """, (user_id,))
+            return c.fetchall()
 
 # Post operations
 def add_post(
@@ -644,280 +821,216 @@ def add_post(
     if not isinstance(account_ids, list) or not account_ids:
         raise ValueError("account_ids must be a non-empty list")
 
-    conn = connect()
-    cur = conn.cursor()
+    with get_conn() as conn:
+        with conn.cursor() as cur:
 
-    try:
-        tags_str = ",".join(tags) if isinstance(tags, list) else (tags or "")
+            try:
+                tags_str = ",".join(tags) if isinstance(tags, list) else (tags or "")
         
-        # Handle scheduled_time for PostgreSQL
-        scheduled_iso = None
-        if scheduled_time:
-            if isinstance(scheduled_time, datetime):
-                scheduled_iso = scheduled_time.astimezone(timezone.utc)
-            else:
-                scheduled_iso = scheduled_time
-
-        cur.execute("""
-            INSERT INTO posts (
-                user_id,
-                account_id,
-                media_file,
-                title,
-                description,
-                hashtags,
-                tags,
-                privacy_status,
-                scheduled_time,
-                post_type,
-                cover_image,
-                audio_name,
-                location,
-                disable_comments,
-                share_to_feed,
-                status
-            )
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 'Pending')
-            RETURNING id
-        """, (
-            user_id,
-            account_ids[0],  # legacy compatibility only
-            filename,
-            title or "",
-            description or "",
-            hashtags or "",
-            tags_str,
-            privacy_status,
-            scheduled_iso,
-            post_type,
-            cover_image,
-            audio_name,
-            location,
-            disable_comments,
-            share_to_feed,
-        ))
-
-        post_id = cur.fetchone()[0]
-
-        for acc_id in account_ids:
-            cur.execute(
-                "INSERT INTO posts_accounts (post_id, account_id) VALUES (%s, %s)",
-                (post_id, acc_id)
-            )
-
-        conn.commit()
-        return post_id
-
-    except Exception:
-        conn.rollback()
-        raise
-    finally:
-        conn.close()
+                # Handle scheduled_time for PostgreSQL
+                scheduled_iso = None
+                if scheduled_time:
+                    if isinstance(scheduled_time, datetime):
+                        scheduled_iso = scheduled_time.astimezone(timezone.utc)
+                    else:
+                        scheduled_iso = scheduled_time
+
+                # Post row and its posts_accounts fan-out in one statement
+                cur.execute("""
+                    WITH new_post AS (
+                        INSERT INTO posts (
+                            user_id,
+                            account_id,
+                            media_file,
+                            title,
+                            description,
+                            hashtags,
+                            tags,
+                            privacy_status,
+                            scheduled_time,
+                            post_type,
+                            cover_image,
+                            audio_name,
+                            location,
+                            disable_comments,
+                            share_to_feed,
+                            status
+                        )
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 'Pending')
+                        RETURNING id
+                    )
+                    INSERT INTO posts_accounts (post_id, account_id)
+                    SELECT new_post.id, acc_id
+                    FROM new_post, UNNEST(%s::int[]) AS acc_id
+                    RETURNING post_id
+                """, (
+                    user_id,
+                    account_ids[0],  # legacy compatibility only
+                    filename,
+                    title or "",
+                    description or "",
+                    hashtags or "",
+                    tags_str,
+                    privacy_status,
+                    scheduled_iso,
+                    post_type,
+                    cover_image,
+                    audio_name,
+                    location,
+                    disable_comments,
+                    share_to_feed,
+                    account_ids,
+                ))
+
+                post_id = cur.fetchone()[0]
+
+                conn.commit()
+                return post_id
+
+            except Exception:
+                conn.rollback()
+                raise
 
 def get_post_details_by_post_id(post_id: int):
-    conn = connect()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        SELECT
-            p.id,
-            p.user_id,
-            p.media_file,
-            p.title,
-            p.description,
-            p.hashtags,
-            p.tags,
-            p.privacy_status,
-            p.post_type,
-            p.cover_image,
-            p.audio_name,
-            p.location,
-            p.disable_comments,
-            p.share_to_feed,
-            p.status,
-            p.created_at
-        FROM posts p
-        WHERE p.id = %s
-        """,
-        (post_id,),
-    )
+    with get_conn() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+
+            cursor.execute(
+                """
+                SELECT
+                    p.id,
+                    p.user_id,
+                    p.media_file,
+                    p.title,
+                    p.description,
+                    p.hashtags,
+                    p.tags,
+                    p.privacy_status,
+                    p.post_type,
+                    p.cover_image,
+                    p.audio_name,
+                    p.location,
+                    p.disable_comments,
+                    p.share_to_feed,
+                    p.status,
+                    p.created_at
+                FROM posts p
+                WHERE p.id = %s
+                """,
+                (post_id,),
+            )
 
-    post_row = cursor.fetchone()
-    if not post_row:
-        conn.close()
-        return None
+            post = cursor.fetchone()
+            if not post:
+                return None
+
+            # Fetch linked accounts
+            cursor.execute(
+                """
+                SELECT
+                    a.id,
+                    a.platform,
+                    a.account_username AS username
+                FROM posts_accounts pa
+                JOIN accounts a ON a.id = pa.account_id
+                WHERE pa.post_id = %s
+                """,
+                (post_id,),
+            )
 
-    (
-        post_id,
-        user_id,
-        media_file,
-        title,
-        description,
-        hashtags,
-        tags,
-        privacy_status,
-        post_type,
-        cover_image,
-        audio_name,
-        location,
-        disable_comments,
-        share_to_feed,
-        status,
-        created_at,
-    ) = post_row
-
-    # Fetch linked accounts
-    cursor.execute(
-        """
-        SELECT
-            a.id,
-            a.platform,
-            a.account_username
-        FROM posts_accounts pa
-        JOIN accounts a ON a.id = pa.account_id
-        WHERE pa.post_id = %s
-        """,
-        (post_id,),
-    )
+            post["accounts"] = cursor.fetchall()
 
-    accounts = [
-        {
-            "id": row[0],
-            "platform": row[1],
-            "username": row[2],
-        }
-        for row in cursor.fetchall()
-    ]
+    post["disable_comments"] = bool(post["disable_comments"])
+    post["share_to_feed"] = bool(post["share_to_feed"])
+    return post
 
-    conn.close()
+# Upper bound on rows returned by get_scheduled_posts
+SCHEDULED_POSTS_LIMIT = 1000
 
-    return {
-        "id": post_id,
-        "user_id": user_id,
-        "media_file": media_file,
-        "title": title,
-        "description": description,
-        "hashtags": hashtags,
-        "tags": tags,
-        "privacy_status": privacy_status,
-        "post_type": post_type,
-        "cover_image": cover_image,
-        "audio_name": audio_name,
-        "location": location,
-        "disable_comments": bool(disable_comments),
-        "share_to_feed": bool(share_to_feed),
-        "status": status,
-        "created_at": created_at,
-        "accounts": accounts,
-    }
 
-def get_scheduled_posts():
-    """Get posts that are scheduled and pending (including past due)"""
-    conn = connect()
-    c = conn.cursor()
-    c.execute("""
-        SELECT id, account_id, media_file, title, description, 
-               hashtags, scheduled_time, status
-        FROM posts
-        WHERE scheduled_time IS NOT NULL 
-        AND status = 'Pending'
-        ORDER BY scheduled_time DESC 
-    """)
-    posts = c.fetchall()
-    conn.close()
-    return posts
+def get_scheduled_posts(limit=SCHEDULED_POSTS_LIMIT):
+    """
+    Get posts that are scheduled and pending (including past due),
+    latest first, at most `limit` of them.
+
+    Returns a list, so the pooled connection is released before the
+    caller sees any rows.
+    """
+    with get_conn() as conn:
+        with conn.cursor() as c:
+            c.execute("""
+                SELECT id, account_id, media_file, title, description, 
+                       hashtags, scheduled_time, status
+                FROM posts
+                WHERE scheduled_time IS NOT NULL 
+                AND status = 'Pending'
+                ORDER BY scheduled_time DESC 
+                LIMIT %s
+            """, (limit,))
+            return c.fetchall()
 
 def get_accounts_by_post_id(post_id):
     """
     Returns list of account dictionaries with group info
     """
-    conn = connect()
-    c = conn.cursor()
-    c.execute("""
-        SELECT
-            a.id,
-            a.platform,
-            a.account_username,
-            a.password,
-            g.id AS group_id,
-            g.group_name
-        FROM accounts a
-        JOIN posts_accounts pa ON a.id = pa.account_id
-        LEFT JOIN group_accounts ga ON ga.account_id = a.id
-        LEFT JOIN groups g ON g.id = ga.group_id
-        WHERE pa.post_id = %s
-    """, (post_id,))
-
-    accounts = []
-    for row in c.fetchall():
-        accounts.append({
-            "id": row[0],
-            "platform": row[1],
-            "account_username": row[2],
-            "password": row[3],
-            "group_id": row[4],
-            "group_name": row[5],
-        })
-
-    conn.close()
+    with get_conn() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as c:
+            c.execute("""
+                SELECT
+                    a.id,
+                    a.platform,
+                    a.account_username,
+                    a.password,
+                    g.id AS group_id,
+                    g.group_name
+                FROM accounts a
+                JOIN posts_accounts pa ON a.id = pa.account_id
+                LEFT JOIN group_accounts ga ON ga.account_id = a.id
+                LEFT JOIN groups g ON g.id = ga.group_id
+                WHERE pa.post_id = %s
+            """, (post_id,))
+
+            accounts = c.fetchall()
     return accounts
 
 def update_post_status(post_id, status, error_message=None):
-    with _db_lock:
-        conn = connect()
-        c = conn.cursor()
-
-        c.execute("""
-            UPDATE posts
-            SET 
-                status = %s,
-                error_message = %s
-            WHERE id = %s
-        """, (status, error_message, post_id))
-
-        conn.commit()
-        conn.close()
+    with get_conn() as conn:
+        with conn.cursor() as c:
+            _execute_prepared(c, "p_update_post_status", (status, error_message, post_id))
 
     logger.info(f"Post {post_id} status → {status}")
 
 
 def update_post_schedule_time(post_id, scheduled_time):
-    conn = connect()
-    c = conn.cursor()
-    c.execute("UPDATE posts SET scheduled_time = %s WHERE id = %s", (scheduled_time, post_id))
-    conn.commit()
-    conn.close()
+    with get_conn() as conn:
+        with conn.cursor() as c:
+            c.execute("UPDATE posts SET scheduled_time = %s WHERE id = %s", (scheduled_time, post_id))
+            conn.commit()
 
 def get_groups(user_id: int):
-    conn = connect()
-    c = conn.cursor()
-    try:
-        c.execute(
-            """
-            SELECT id, group_name
-            FROM groups
-            WHERE user_id = %s
-            ORDER BY id DESC
-            """,
-            (user_id,),
-        )
-        return c.fetchall()
-    finally:
-        conn.close()
+    with get_conn() as conn:
+        with conn.cursor() as c:
+            c.execute(
+                """
+                SELECT id, group_name
+                FROM groups
+                WHERE user_id = %s
+                ORDER BY id DESC
+                """,
+                (user_id,),
+            )
+            return c.fetchall()
 
 
 def add_group(group_name):
-    conn = connect()
-    c = conn.cursor()
-    try:
-        c.execute("INSERT INTO groups (group_name) VALUES (%s)", (group_name,))
-        conn.commit()
-        return True
-    except psycopg2.IntegrityError:
-        return False
-    finally:
-        conn.close()
+    with get_conn() as conn:
+        with conn.cursor() as c:
+            try:
+                c.execute("INSERT INTO groups (group_name) VALUES (%s)", (group_name,))
+                conn.commit()
+                return True
+            except psycopg2.IntegrityError:
+                return False
 
 def parse_datetime(dt_str):
     """Safely parse datetime string with timezone handling"""
@@ -938,105 +1051,122 @@ def parse_datetime(dt_str):
 
 def get_post_status_by_id(post_id):
     """Get current status of a post"""
-    conn = connect()
-    c = conn.cursor()
-    c.execute("SELECT status FROM posts WHERE id = %s", (post_id,))
-    row = c.fetchone()
-    conn.close()
+    with get_conn() as conn:
+        with conn.cursor() as c:
+            _execute_prepared(c, "p_post_status", (post_id,))
+            row = c.fetchone()
     return row[0] if row else None
 
 def get_all_posts_for_user(user_id: int):
-    conn = connect()
-    cursor = conn.cursor()
-
-    cursor.execute(
-        """
-        SELECT DISTINCT
-            p.id,
-            p.title,
-            p.description,
-            p.status,
-            p.created_at,
-            p.scheduled_time
-        FROM posts p
-        WHERE p.user_id = %s
-        ORDER BY p.created_at DESC
-        """,
-        (user_id,),
-    )
+    with get_conn() as conn:
+        with conn.cursor(cursor_factory=RealDictCursor) as cursor:
+
+            # Posts and their accounts in one query (one row per post/account)
+            cursor.execute(
+                """
+                SELECT
+                    p.id,
+                    p.title,
+                    p.description,
+                    p.status,
+                    p.created_at,
+                    p.scheduled_time,
+                    a.id AS account_id,
+                    a.platform,
+                    a.account_username AS username
+                FROM posts p
+                LEFT JOIN posts_accounts pa ON pa.post_id = p.id
+                LEFT JOIN accounts a ON a.id = pa.account_id
+                WHERE p.user_id = %s
+                ORDER BY p.created_at DESC, p.id DESC
+                """,
+                (user_id,),
+            )
 
-    posts = cursor.fetchall()
-    results = []
-
-    for row in posts:
-        post_id = row[0]
-
-        cursor.execute(
-            """
-            SELECT
-                a.id,
-                a.platform,
-                a.account_username
-            FROM posts_accounts pa
-            JOIN accounts a ON a.id = pa.account_id
-            WHERE pa.post_id = %s
-            """,
-            (post_id,),
-        )
+            rows = cursor.fetchall()
 
-        accounts = [
-            {
-                "id": acc[0],
-                "platform": acc[1],
-                "username": acc[2],
-            }
-            for acc in cursor.fetchall()
-        ]
-
-        results.append(
-            {
-                "id": row[0],
-                "title": row[1],
-                "description": row[2],
-                "status": row[3],
-                "created_at": row[4],
-                "scheduled_time": row[5],
-                "accounts": accounts,
-            }
-        )
+    # dict keeps first-seen (i.e. query) order
+    posts = {}
+    for row in rows:
+        account_id = row.pop("account_id")
+        platform = row.pop("platform")
+        username = row.pop("username")
+
+        post = posts.get(row["id"])
+        if post is None:
+            post = posts[row["id"]] = row
+            post["accounts"] = []
+
+        if account_id is not None:
+            post["accounts"].append(
+                {"id": account_id, "platform": platform, "username": username}
+            )
 
-    conn.close()
-    return results
+    return list(posts.values())
 
-def get_due_posts():
-    """
-    Returns posts that should be executed now
+# Due posts claimed per scheduler round trip
+DUE_POSTS_BATCH = 100
+
+
+def claim_due_posts(limit=DUE_POSTS_BATCH):
     """
-    conn = connect()
-    c = conn.cursor()
+    Atomically claim up to `limit` posts that should be executed now.
 
-    c.execute("""
-        SELECT
-            p.id,
-            p.user_id,
-            p.account_id,
-            p.media_file,
-            p.title,
-            p.description,
-            p.hashtags,
-            p.scheduled_time,
-            p.status
-        FROM posts p
-        WHERE
-            p.status = 'Pending'
-            AND p.scheduled_time IS NOT NULL
-            AND p.scheduled_time <= NOW()
-        ORDER BY p.scheduled_time ASC
-    """)
+    Due Pending rows are flipped to 'queued' and returned in the same
+    statement. FOR UPDATE SKIP LOCKED lets several schedulers poll at
+    once without two of them claiming the same post.
 
-    posts = c.fetchall()
-    conn.close()
-    return posts
+    Returns (posts, next_due): next_due is the earliest scheduled_time
+    still in the future among Pending posts (None if there is none),
+    read in the same round trip so the scheduler knows how long to
+    sleep. Served by idx_posts_pending_due.
+    """
+    with get_conn() as conn:
+        with conn.cursor() as c:
+            c.execute("""
+                WITH claimed AS (
+                    UPDATE posts p
+                    SET status = 'queued'
+                    WHERE p.id IN (
+                        SELECT id
+                        FROM posts
+                        WHERE
+                            status = 'Pending'
+                            AND scheduled_time IS NOT NULL
+                            AND scheduled_time <= NOW()
+                        ORDER BY scheduled_time ASC
+                        LIMIT %s
+                        FOR UPDATE SKIP LOCKED
+                    )
+                    RETURNING
+                        p.id,
+                        p.user_id,
+                        p.account_id,
+                        p.media_file,
+                        p.title,
+                        p.description,
+                        p.hashtags,
+                        p.scheduled_time,
+                        p.status
+                ),
+                next_due AS (
+                    SELECT min(scheduled_time) AS next_due
+                    FROM posts
+                    WHERE status = 'Pending'
+                      AND scheduled_time > NOW()
+                )
+                -- Always one row at least, so next_due arrives even
+                -- when nothing was claimed
+                SELECT claimed.*, next_due.next_due
+                FROM next_due
+                LEFT JOIN claimed ON TRUE
+            """, (limit,))
+
+            rows = c.fetchall()
+
+    next_due = rows[0][-1]
+    posts = [row[:-1] for row in rows if row[0] is not None]
+    return posts, next_due
 
 def update_matching_posts_status(reference_post_id, status):
     """
@@ -1045,111 +1175,105 @@ def update_matching_posts_status(reference_post_id, status):
     - scheduled_time
     - created_at (within 1 minute window)
     """
-    conn = connect()
-    c = conn.cursor()
-    try:
-        # First get the reference post details
-        c.execute("""
-            SELECT media_file, scheduled_time, created_at 
-            FROM posts 
-            WHERE id = %s
-        """, (reference_post_id,))
-        ref_post = c.fetchone()
-        
-        if not ref_post:
-            logger.error(f"Reference post {reference_post_id} not found")
-            return False
-            
-        media_file, scheduled_time, created_at = ref_post
-        
-        # Update all matching posts
-        c.execute("""
-            UPDATE posts 
-            SET status = %s
-            WHERE media_file = %s
-            AND scheduled_time = %s
-            AND ABS(EXTRACT(EPOCH FROM created_at) - EXTRACT(EPOCH FROM %s)) <= 60
-            AND status != %s
-        """, (
-            status,
-            media_file,
-            scheduled_time,
-            created_at,
-            status
-        ))
+    with get_conn() as conn:
+        with conn.cursor() as c:
+            try:
+                # Reference lookup and update in one statement; no row back
+                # means the reference post doesn't exist
+                c.execute("""
+                    WITH ref AS (
+                        SELECT media_file, scheduled_time, created_at
+                        FROM posts
+                        WHERE id = %s
+                    ),
+                    updated AS (
+                        UPDATE posts p
+                        SET status = %s
+                        FROM ref
+                        WHERE p.media_file = ref.media_file
+                        AND p.scheduled_time = ref.scheduled_time
+                        AND p.created_at BETWEEN ref.created_at - INTERVAL '60 seconds'
+                                             AND ref.created_at + INTERVAL '60 seconds'
+                        AND p.status <> %s
+                        RETURNING p.id
+                    )
+                    SELECT ref.media_file, (SELECT COUNT(*) FROM updated)
+                    FROM ref
+                """, (reference_post_id, status, status))
+                row = c.fetchone()
+
+                if not row:
+                    logger.error(f"Reference post {reference_post_id} not found")
+                    return False
+
+                media_file, updated_count = row
+                conn.commit()
+                logger.info(f"Updated {updated_count} posts to status '{status}' for media {media_file}")
+                return True
         
-        updated_count = c.rowcount
-        conn.commit()
-        logger.info(f"Updated {updated_count} posts to status '{status}' for media {media_file}")
-        return True
-        
-    except Exception as e:
-        logger.error(f"Error updating matching posts: {e}")
-        return False
-    finally:
-        conn.close()
+            except Exception as e:
+                logger.error(f"Error updating matching posts: {e}")
+                return False
 
 def get_instagram_credentials(account_id: int):
     """
     Fetch Instagram credentials (username, password, session)
     for a given account ID.
     """
-    conn = connect()
-    c = conn.cursor()
-
-    try:
-        c.execute("""
-            SELECT
-                account_username,
-                password,
-                session_data
-            FROM accounts
-            WHERE id = %s
-              AND LOWER(platform) = 'instagram'
-        """, (account_id,))
-
-        row = c.fetchone()
-
-        if not row:
-            logger.error(f"[INSTAGRAM] No Instagram account found for account_id={account_id}")
-            return None
-
-        username, password, session_data = row
-
-        return {
-            "username": username,
-            "password": password,
-            "session": json.loads(session_data) if session_data else None,
-        }
-
-    except Exception as e:
-        logger.error(
-            f"[INSTAGRAM] Failed to fetch credentials for account_id={account_id}: {e}",
-            exc_info=True
-        )
-        return None
-
-    finally:
-        conn.close()
+    with get_conn() as conn:
+        with conn.cursor() as c:
+
+            try:
+                c.execute("""
+                    SELECT
+                        account_username,
+                        password,
+                        session_data
+                    FROM accounts
+                    WHERE id = %s
+                      AND LOWER(platform) = 'instagram'
+                """, (account_id,))
+
+                row = c.fetchone()
+
+                if not row:
+                    logger.error(f"[INSTAGRAM] No Instagram account found for account_id={account_id}")
+                    return None
+
+                # JSONB: session_data is already decoded
+                username, password, session_data = row
+
+                return {
+                    "username": username,
+                    "password": password,
+                    "session": session_data or None,
+                }
+
+            except Exception as e:
+                logger.error(
+                    f"[INSTAGRAM] Failed to fetch credentials for account_id={account_id}: {e}",
+                    exc_info=True
+                )
+                return None
 
 def update_instagram_session(account_id: int, session: dict):
     """
     Persist updated instagrapi session to DB.
     """
-    conn = connect()
-    c = conn.cursor()
+    with get_conn() as conn:
+        with conn.cursor() as c:
 
-    c.execute("""
-        UPDATE accounts
-        SET session_data = %s
-        WHERE id = %s
-          AND LOWER(platform) = 'instagram'
-    """, (json.dumps(session), account_id))
+            c.execute("""
+                UPDATE accounts
+                SET session_data = %s
+                WHERE id = %s
+                  AND LOWER(platform) = 'instagram'
+            """, (psycopg2.extras.Json(session), account_id))
 
-    conn.commit()
-    conn.close()
+            conn.commit()
 
 # Function to load the client secrets from the 'client_secret.json'
+@lru_cache(maxsize=1)
 def get_client_secret_data():
     BASE_DIR = Path(__file__).parent
     CLIENT_SECRET_PATH = BASE_DIR / "client_secret.json"
@@ -1165,64 +1289,68 @@ def get_client_secret_data():
 
 def get_posts(user_id):
     """Get all posts for a user, including scheduled and posted"""
-    conn = connect()
-    c = conn.cursor()
-    c.execute("""
-        SELECT p.id, p.account_id, p.media_file, p.title, p.description, 
-               p.hashtags, p.scheduled_time, p.status, a.platform
-        FROM posts p
-        JOIN accounts a ON p.account_id = a.id
-        WHERE a.user_id = %s
-        ORDER BY p.id DESC 
-    """, (user_id,))
-    rows = c.fetchall()
-    conn.close()
+    with get_conn() as conn:
+        with conn.cursor() as c:
+            c.execute("""
+                SELECT p.id, p.account_id, p.media_file, p.title, p.description, 
+                       p.hashtags, p.scheduled_time, p.status, a.platform
+                FROM posts p
+                JOIN accounts a ON p.account_id = a.id
+                WHERE a.user_id = %s
+                ORDER BY p.id DESC 
+            """, (user_id,))
+            rows = c.fetchall()
     return rows
 
 def get_random_proxy(user_id: int):
-    conn = connect()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT id, proxy_address, proxy_type
-        FROM proxies
-        WHERE is_active = TRUE
-          AND user_id = %s
-        ORDER BY RANDOM()
-        LIMIT 1
-        """,
-        (user_id,),
-    )
-    row = cur.fetchone()
-    cur.close()
-    conn.close()
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            _execute_prepared(cur, "p_random_proxy", (user_id, user_id))
+            row = cur.fetchone()
     return row  # (id, address, type) or None
 
 
 
 def post_with_random_proxy(user_id, account_id, media_path, caption, post_id):
-    proxy = get_random_proxy(user_id)
+    with get_conn() as conn:
+        with conn.cursor() as c:
+            # Pick the proxy and attach it in one statement, so it can't be
+            # deactivated in between (same random-offset pick as get_random_proxy)
+            c.execute(
+                """
+                WITH proxy AS (
+                    SELECT id, proxy_address, proxy_type
+                    FROM proxies
+                    WHERE is_active = TRUE
+                      AND user_id = %s
+                    OFFSET floor(random() * (
+                        SELECT count(*)
+                        FROM proxies
+                        WHERE is_active = TRUE
+                          AND user_id = %s
+                    ))
+                    LIMIT 1
+                ),
+                attached AS (
+                    UPDATE posts_accounts
+                    SET proxy_id = proxy.id
+                    FROM proxy
+                    WHERE account_id = %s
+                      AND post_id = %s
+                )
+                SELECT id, proxy_address, proxy_type
+                FROM proxy
+                """,
+                (user_id, user_id, account_id, post_id),
+            )
+            proxy = c.fetchone()
+            conn.commit()
+
     if not proxy:
         raise Exception("No active proxies available")
 
     proxy_id, proxy_address, proxy_type = proxy
 
-    conn = connect()
-    c = conn.cursor()
-    try:
-        c.execute(
-            """
-            UPDATE posts_accounts
-            SET proxy_id = %s
-            WHERE account_id = %s
-              AND post_id = %s
-            """,
-            (proxy_id, account_id, post_id),
-        )
-        conn.commit()
-    finally:
-        conn.close()
-
     return {
         "proxy_id": proxy_id,
         "proxy_address": proxy_address,
@@ -1232,169 +1360,161 @@ def post_with_random_proxy(user_id, account_id, media_path, caption, post_id):
 
 # Proxy operations
 def add_proxy(proxy_address: str, proxy_type: str, user_id: int):
-    conn = connect()
-    cur = conn.cursor()
-    try:
-        cur.execute(
-            """
-            INSERT INTO proxies (proxy_address, proxy_type, user_id)
-            VALUES (%s, %s, %s)
-            """,
-            (proxy_address, proxy_type, user_id),
-        )
-        conn.commit()
-        return True
-    except Exception:
-        conn.rollback()
-        return False
-    finally:
-        cur.close()
-        conn.close()
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            try:
+                cur.execute(
+                    """
+                    INSERT INTO proxies (proxy_address, proxy_type, user_id)
+                    VALUES (%s, %s, %s)
+                    """,
+                    (proxy_address, proxy_type, user_id),
+                )
+                conn.commit()
+                return True
+            except Exception:
+                conn.rollback()
+                return False
 
 
 def get_all_proxies(user_id: int):
-    conn = connect()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT id, proxy_address, proxy_type, is_active
-        FROM proxies
-        WHERE user_id = %s
-        ORDER BY id DESC
-        """,
-        (user_id,),
-    )
-    rows = cur.fetchall()
-    cur.close()
-    conn.close()
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT id, proxy_address, proxy_type, is_active
+                FROM proxies
+                WHERE user_id = %s
+                ORDER BY id DESC
+                """,
+                (user_id,),
+            )
+            rows = cur.fetchall()
     return rows
 
 
 def update_proxy_status(proxy_id: int, is_active: bool, user_id: int):
-    conn = connect()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        UPDATE proxies
-        SET is_active = %s
-        WHERE id = %s AND user_id = %s
-        """,
-        (is_active, proxy_id, user_id),
-    )
-    conn.commit()
-    cur.close()
-    conn.close()
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                UPDATE proxies
+                SET is_active = %s
+                WHERE id = %s AND user_id = %s
+                """,
+                (is_active, proxy_id, user_id),
+            )
+            conn.commit()
 
 
 def delete_proxy(proxy_id: int, user_id: int):
-    conn = connect()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        DELETE FROM proxies
-        WHERE id = %s AND user_id = %s
-        """,
-        (proxy_id, user_id),
-    )
-    conn.commit()
-    cur.close()
-    conn.close()
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                DELETE FROM proxies
+                WHERE id = %s AND user_id = %s
+                """,
+                (proxy_id, user_id),
+            )
+            conn.commit()
 
 def get_proxy_by_id(proxy_id: int, user_id: int):
-    conn = connect()
-    cur = conn.cursor()
-    cur.execute(
-        """
-        SELECT id, proxy_address, proxy_type, is_active
-        FROM proxies
-        WHERE id = %s AND user_id = %s
-        """,
-        (proxy_id, user_id),
-    )
-    row = cur.fetchone()
-    cur.close()
-    conn.close()
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+            cur.execute(
+                """
+                SELECT id, proxy_address, proxy_type, is_active
+                FROM proxies
+                WHERE id = %s AND user_id = %s
+                """,
+                (proxy_id, user_id),
+            )
+            row = cur.fetchone()
     return row
 
+# user_id -> timezone name; other processes see a change within the TTL
+_TIMEZONE_CACHE = TTLCache(ttl_seconds=300, max_entries=10_000)
+
+
 def set_user_timezone(user_id, timezone):
     """Set a user's preferred timezone"""
-    conn = connect()
-    c = conn.cursor()
-    try:
-        c.execute("""
-            INSERT INTO user_timezones (user_id, timezone)
-            VALUES (%s, %s)
-            ON CONFLICT (user_id) 
-            DO UPDATE SET timezone = EXCLUDED.timezone
-        """, (user_id, timezone))
-        conn.commit()
-        return True
-    except Exception as e:
-        logger.error(f"Error setting timezone: {e}")
-        return False
-    finally:
-        conn.close()
+    with get_conn() as conn:
+        with conn.cursor() as c:
+            try:
+                c.execute("""
+                    INSERT INTO user_timezones (user_id, timezone)
+                    VALUES (%s, %s)
+                    ON CONFLICT (user_id) 
+                    DO UPDATE SET timezone = EXCLUDED.timezone
+                """, (user_id, timezone))
+                conn.commit()
+                _TIMEZONE_CACHE.set(user_id, timezone)
+                return True
+            except Exception as e:
+                logger.error(f"Error setting timezone: {e}")
+                return False
 
 def get_user_timezone(user_id):
     """Get a user's preferred timezone"""
-    conn = connect()
-    c = conn.cursor()
-    try:
-        c.execute("SELECT timezone FROM user_timezones WHERE user_id = %s", (user_id,))
-        row = c.fetchone()
-        return row[0] if row else 'UTC'
-    except Exception as e:
-        logger.error(f"Error getting timezone: {e}")
-        return 'UTC'
-    finally:
-        conn.close()
+    cached = _TIMEZONE_CACHE.get(user_id)
+    if cached is not None:
+        return cached
+
+    with get_conn() as conn:
+        with conn.cursor() as c:
+            try:
+                _execute_prepared(c, "p_user_timezone", (user_id,))
+                row = c.fetchone()
+                timezone = row[0] if row else 'UTC'
+            except Exception as e:
+                logger.error(f"Error getting timezone: {e}")
+                return 'UTC'
+
+    _TIMEZONE_CACHE.set(user_id, timezone)
+    return timezone
 
 def reset_post_for_repost(post_id: int):
     """
     Reset a post so it can be re-executed safely.
     Keeps media_file and account mappings intact.
     """
-    conn = connect()
-    c = conn.cursor()
-    try:
-        c.execute(
-            """
-            UPDATE posts
-            SET status = 'Pending'
-            WHERE id = %s
-            """,
-            (post_id,),
-        )
-
-        if c.rowcount == 0:
-            raise ValueError("Post not found")
+    with get_conn() as conn:
+        with conn.cursor() as c:
+            c.execute(
+                """
+                UPDATE posts
+                SET status = 'Pending'
+                WHERE id = %s
+                """,
+                (post_id,),
+            )
 
-        conn.commit()
-        logger.info(f"[DB] Post {post_id} reset to Pending for repost")
+            if c.rowcount == 0:
+                raise ValueError("Post not found")
 
-    finally:
-        conn.close()
+            conn.commit()
+            logger.info(f"[DB] Post {post_id} reset to Pending for repost")
 
 def get_all_youtube_accounts_with_tokens():
     """
     Returns all YouTube accounts with their OAuth tokens.
     """
-    conn = connect()
-    cur = conn.cursor()
-
-    cur.execute("""
-        SELECT
-            a.id AS account_id,
-            t.access_token,
-            t.refresh_token,
-            t.expires_at
-        FROM accounts a
-        JOIN tokens t ON t.account_id = a.id
-        WHERE LOWER(a.platform) = 'youtube'
-    """)
-
-    rows = cur.fetchall()
-    conn.close()
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+
+            cur.execute("""
+                SELECT
+                    a.id AS account_id,
+                    t.access_token,
+                    t.refresh_token,
+                    t.expires_at
+                FROM accounts a
+                JOIN tokens t ON t.account_id = a.id
+                WHERE LOWER(a.platform) = 'youtube'
+            """)
+
+            rows = cur.fetchall()
 
     return [
         {
@@ -1412,19 +1532,18 @@ def update_youtube_tokens(account_id: int, access_token: str, expires_at: int):
     Update OAuth tokens for a YouTube account.
     expires_at is epoch seconds.
     """
-    conn = connect()
-    cur = conn.cursor()
+    with get_conn() as conn:
+        with conn.cursor() as cur:
 
-    cur.execute("""
-        UPDATE tokens
-        SET
-            access_token = %s,
-            expires_at = %s
-        WHERE account_id = %s
-    """, (access_token, expires_at, account_id))
+            cur.execute("""
+                UPDATE tokens
+                SET
+                    access_token = %s,
+                    expires_at = %s
+                WHERE account_id = %s
+            """, (access_token, expires_at, account_id))
 
-    conn.commit()
-    conn.close()
+            conn.commit()
 
 
 def create_clip_job(
@@ -1434,40 +1553,40 @@ def create_clip_job(
     clip_length: int,
     max_clips: int,
     style: str,
+    want_subtitles: bool = True,
 ) -> int:
-    conn = connect()
-    c = conn.cursor()
-    try:
-        c.execute(
-            """
-            INSERT INTO clip_jobs (
-                user_id,
-                source_url,
-                local_video_path,
-                clip_length,
-                max_clips,
-                style,
-                status,
-                progress
+    with get_conn() as conn:
+        with conn.cursor() as c:
+            c.execute(
+                """
+                INSERT INTO clip_jobs (
+                    user_id,
+                    source_url,
+                    local_video_path,
+                    clip_length,
+                    max_clips,
+                    style,
+                    want_subtitles,
+                    status,
+                    progress
+                )
+                VALUES (%s, %s, %s, %s, %s, %s, %s, 'pending', 0)
+                RETURNING id;
+                """,
+                (
+                    user_id,
+                    source_url,
+                    local_video_path,
+                    clip_length,
+                    max_clips,
+                    style,
+                    want_subtitles,
+                ),
             )
-            VALUES (%s, %s, %s, %s, %s, %s, 'pending', 0)
-            RETURNING id;
-            """,
-            (
-                user_id,
-                source_url,
-                local_video_path,
-                clip_length,
-                max_clips,
-                style,
-            ),
-        )
 
-        job_id = c.fetchone()[0]
-        conn.commit()
-        return job_id
-    finally:
-        conn.close()
+            job_id = c.fetchone()[0]
+            conn.commit()
+            return job_id
 
 
 
@@ -1477,21 +1596,18 @@ def update_clip_job_status(
     progress: int | None = None,
     error: str | None = None,
 ):
-    conn = connect()
-    c = conn.cursor()
-    try:
-        c.execute("""
-            UPDATE clip_jobs
-            SET
-                status = %s,
-                progress = COALESCE(%s, progress),
-                error = %s
-            WHERE id = %s;
-        """, (status, progress, error, job_id))
-
-        conn.commit()
-    finally:
-        conn.close()
+    with get_conn() as conn:
+        with conn.cursor() as c:
+            c.execute("""
+                UPDATE clip_jobs
+                SET
+                    status = %s,
+                    progress = COALESCE(%s, progress),
+                    error = %s
+                WHERE id = %s;
+            """, (status, progress, error, job_id))
+
+            conn.commit()
 
 def mark_clip_job_failed(job_id: int, error: str):
     update_clip_job_status(
@@ -1502,30 +1618,28 @@ def mark_clip_job_failed(job_id: int, error: str):
     )
 
 def get_clip_job(job_id: int):
-    conn = connect()
-    c = conn.cursor()
-
-    c.execute("""
-        SELECT
-            id,
-            user_id,
-            source_url,
-            local_video_path,
-            clip_length,
-            max_clips,
-            style,
-            status,
-            progress,
-            error,
-            created_at
-        FROM clip_jobs
-        WHERE id = %s;
-    """, (job_id,))
-
-    row = c.fetchone()
-
-    c.close()
-    conn.close()
+    with get_conn() as conn:
+        with conn.cursor() as c:
+
+            c.execute("""
+                SELECT
+                    id,
+                    user_id,
+                    source_url,
+                    local_video_path,
+                    clip_length,
+                    max_clips,
+                    style,
+                    status,
+                    progress,
+                    error,
+                    created_at,
+                    want_subtitles
+                FROM clip_jobs
+                WHERE id = %s;
+            """, (job_id,))
+
+            row = c.fetchone()
 
     if not row:
         return None
@@ -1542,6 +1656,7 @@ def get_clip_job(job_id: int):
         "progress": row[8],
         "error": row[9],
         "created_at": row[10],
+        "want_subtitles": row[11],
     }
 
 
@@ -1550,20 +1665,18 @@ def add_clip(clip_job_id: int, file_path: str, duration: int) -> int:
     Insert a generated clip into the database.
     """
 
-    conn = connect()
-    c = conn.cursor()
+    with get_conn() as conn:
+        with conn.cursor() as c:
 
-    c.execute("""
-        INSERT INTO clips (clip_job_id, file_path, duration)
-        VALUES (%s, %s, %s)
-        RETURNING id;
-    """, (clip_job_id, file_path, duration))
+            c.execute("""
+                INSERT INTO clips (clip_job_id, file_path, duration)
+                VALUES (%s, %s, %s)
+                RETURNING id;
+            """, (clip_job_id, file_path, duration))
 
-    clip_id = c.fetchone()[0]
+            clip_id = c.fetchone()[0]
 
-    conn.commit()
-    c.close()
-    conn.close()
+            conn.commit()
 
     return clip_id
 
@@ -1574,25 +1687,22 @@ def get_clips_for_job(job_id: int):
     Return all clips for a job.
     """
 
-    conn = connect()
-    c = conn.cursor()
+    with get_conn() as conn:
+        with conn.cursor() as c:
 
-    c.execute("""
-        SELECT
-            id,
-            clip_job_id,
-            file_path,
-            duration,
-            created_at
-        FROM clips
-        WHERE clip_job_id = %s
-        ORDER BY created_at ASC;
-    """, (job_id,))
-
-    rows = c.fetchall()
-
-    c.close()
-    conn.close()
+            c.execute("""
+                SELECT
+                    id,
+                    clip_job_id,
+                    file_path,
+                    duration,
+                    created_at
+                FROM clips
+                WHERE clip_job_id = %s
+                ORDER BY created_at ASC;
+            """, (job_id,))
+
+            rows = c.fetchall()
 
     clips = []
 
@@ -1614,17 +1724,15 @@ def delete_clips_for_job(job_id: int):
     Delete all clips belonging to a job.
     """
 
-    conn = connect()
-    c = conn.cursor()
+    with get_conn() as conn:
+        with conn.cursor() as c:
 
-    c.execute("""
-        DELETE FROM clips
-        WHERE clip_job_id = %s;
-    """, (job_id,))
+            c.execute("""
+                DELETE FROM clips
+                WHERE clip_job_id = %s;
+            """, (job_id,))
 
-    conn.commit()
-    c.close()
-    conn.close()
+            conn.commit()
 
 
 def get_clip_job_with_clips(job_id: int):
@@ -1639,29 +1747,28 @@ def get_clip_job_with_clips(job_id: int):
 from typing import List
 def get_all_clip_jobs_for_user(user_id: int) -> List[dict]:
     """Get all clip jobs for a user"""
-    conn = connect()
-    c = conn.cursor()
+    with get_conn() as conn:
+        with conn.cursor() as c:
     
-    c.execute("""
-        SELECT
-            id,
-            user_id,
-            source_url,
-            local_video_path,
-            clip_length,
-            max_clips,
-            style,
-            status,
-            progress,
-            error,
-            created_at
-        FROM clip_jobs
-        WHERE user_id = %s
-        ORDER BY created_at DESC
-    """, (user_id,))
+            c.execute("""
+                SELECT
+                    id,
+                    user_id,
+                    source_url,
+                    local_video_path,
+                    clip_length,
+                    max_clips,
+                    style,
+                    status,
+                    progress,
+                    error,
+                    created_at
+                FROM clip_jobs
+                WHERE user_id = %s
+                ORDER BY created_at DESC
+            """, (user_id,))
     
-    rows = c.fetchall()
-    conn.close()
+            rows = c.fetchall()
     
     jobs = []
     for row in rows:
@@ -1683,30 +1790,28 @@ def get_all_clip_jobs_for_user(user_id: int) -> List[dict]:
 
 def delete_clip_job_and_clips(job_id: int):
     """Delete a clip job and all its clips from database"""
-    conn = connect()
-    c = conn.cursor()
+    with get_conn() as conn:
+        with conn.cursor() as c:
     
-    # Clips will be deleted automatically due to CASCADE
-    c.execute("DELETE FROM clip_jobs WHERE id = %s", (job_id,))
+            # Clips will be deleted automatically due to CASCADE
+            c.execute("DELETE FROM clip_jobs WHERE id = %s", (job_id,))
     
-    conn.commit()
-    conn.close()
+            conn.commit()
 
 def get_post_overview(user_id: int):
-    conn = connect()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT 
-            COUNT(*) as total_posts,
-            COUNT(*) FILTER (WHERE status = 'Success') as successful_posts,
-            COUNT(*) FILTER (WHERE status = 'Failed') as failed_posts
-        FROM posts
-        WHERE user_id = %s
-    """, (user_id,))
-
-    row = cursor.fetchone()
-    conn.close()
+    with get_conn() as conn:
+        with conn.cursor() as cursor:
+
+            cursor.execute("""
+                SELECT 
+                    COUNT(*) as total_posts,
+                    COUNT(*) FILTER (WHERE status = 'Success') as successful_posts,
+                    COUNT(*) FILTER (WHERE status = 'Failed') as failed_posts
+                FROM posts
+                WHERE user_id = %s
+            """, (user_id,))
+
+            row = cursor.fetchone()
 
     total = row[0] or 0
     success = row[1] or 0
@@ -1723,23 +1828,22 @@ def get_post_overview(user_id: int):
 
 
 def get_platform_breakdown(user_id: int):
-    conn = connect()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT 
-            a.platform,
-            COUNT(*) FILTER (WHERE p.status = 'Success') as success_count,
-            COUNT(*) FILTER (WHERE p.status = 'Failed') as failed_count
-        FROM posts p
-        JOIN posts_accounts pa ON p.id = pa.post_id
-        JOIN accounts a ON pa.account_id = a.id
-        WHERE p.user_id = %s
-        GROUP BY a.platform
-    """, (user_id,))
-
-    rows = cursor.fetchall()
-    conn.close()
+    with get_conn() as conn:
+        with conn.cursor() as cursor:
+
+            cursor.execute("""
+                SELECT 
+                    a.platform,
+                    COUNT(*) FILTER (WHERE p.status = 'Success') as success_count,
+                    COUNT(*) FILTER (WHERE p.status = 'Failed') as failed_count
+                FROM posts p
+                JOIN posts_accounts pa ON p.id = pa.post_id
+                JOIN accounts a ON pa.account_id = a.id
+                WHERE p.user_id = %s
+                GROUP BY a.platform
+            """, (user_id,))
+
+            rows = cursor.fetchall()
 
     results = {}
     for platform, success, failed in rows:
@@ -1756,21 +1860,20 @@ def get_platform_breakdown(user_id: int):
 
 
 def get_daily_post_counts(user_id: int):
-    conn = connect()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT 
-            DATE(created_at) as post_date,
-            COUNT(*) as count
-        FROM posts
-        WHERE user_id = %s
-        GROUP BY post_date
-        ORDER BY post_date ASC
-    """, (user_id,))
-
-    rows = cursor.fetchall()
-    conn.close()
+    with get_conn() as conn:
+        with conn.cursor() as cursor:
+
+            cursor.execute("""
+                SELECT 
+                    DATE(created_at) as post_date,
+                    COUNT(*) as count
+                FROM posts
+                WHERE user_id = %s
+                GROUP BY post_date
+                ORDER BY post_date ASC
+            """, (user_id,))
+
+            rows = cursor.fetchall()
 
     return [
         {"date": str(row[0]), "count": row[1]}
@@ -1778,40 +1881,72 @@ def get_daily_post_counts(user_id: int):
     ]
 
 def update_post_engagement(post_id: int, likes: int = 0, comments: int = 0, views: int = 0, shares: int = 0):
-    conn = connect()
-    c = conn.cursor()
+    with get_conn() as conn:
+        with conn.cursor() as c:
 
-    c.execute("""
-        UPDATE posts
-        SET 
-            likes = %s,
-            comments = %s,
-            views = %s,
-            shares = %s
-        WHERE id = %s
-    """, (likes, comments, views, shares, post_id))
+            c.execute("""
+                UPDATE posts
+                SET 
+                    likes = %s,
+                    comments = %s,
+                    views = %s,
+                    shares = %s
+                WHERE id = %s
+            """, (likes, comments, views, shares, post_id))
 
-    conn.commit()
-    conn.close()
+            conn.commit()
+
+
+def bulk_update_post_engagement(rows):
+    """
+    Update engagement counters for many posts in one round-trip.
+
+    rows: iterable of (post_id, likes, comments, views)
+    """
+    rows = list(rows)
+    if not rows:
+        return
+
+    with get_conn() as conn:
+        with conn.cursor() as c:
+
+            try:
+                psycopg2.extras.execute_values(
+                    c,
+                    """
+                    UPDATE posts AS p
+                    SET
+                        likes = v.likes,
+                        comments = v.comments,
+                        views = v.views
+                    FROM (VALUES %s) AS v(id, likes, comments, views)
+                    WHERE p.id = v.id
+                    """,
+                    rows,
+                    template="(%s::int, %s::int, %s::int, %s::int)",
+                )
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
 
 
 def get_engagement_stats(user_id: int):
-    conn = connect()
-    cursor = conn.cursor()
-
-    cursor.execute("""
-        SELECT 
-            COALESCE(SUM(likes), 0),
-            COALESCE(SUM(comments), 0),
-            COALESCE(SUM(views), 0),
-            COALESCE(SUM(shares), 0)
-        FROM posts
-        WHERE user_id = %s
-        AND status = 'Success'
-    """, (user_id,))
-
-    row = cursor.fetchone()
-    conn.close()
+    with get_conn() as conn:
+        with conn.cursor() as cursor:
+
+            cursor.execute("""
+                SELECT 
+                    COALESCE(SUM(likes), 0),
+                    COALESCE(SUM(comments), 0),
+                    COALESCE(SUM(views), 0),
+                    COALESCE(SUM(shares), 0)
+                FROM posts
+                WHERE user_id = %s
+                AND status = 'Success'
+            """, (user_id,))
+
+            row = cursor.fetchone()
 
     total_likes, total_comments, total_views, total_shares = row
 
@@ -1870,17 +2005,16 @@ def calculate_account_health(user_id: int):
 
 
 def save_youtube_video_id(post_id: int, video_id: str):
-    conn = connect()
-    c = conn.cursor()
+    with get_conn() as conn:
+        with conn.cursor() as c:
 
-    c.execute("""
-        UPDATE posts
-        SET youtube_video_id = %s
-        WHERE id = %s
-    """, (video_id, post_id))
+            c.execute("""
+                UPDATE posts
+                SET youtube_video_id = %s
+                WHERE id = %s
+            """, (video_id, post_id))
 
-    conn.commit()
-    conn.close()
+            conn.commit()
 
 def get_youtube_posts_with_tokens():
     """
@@ -1888,29 +2022,28 @@ def get_youtube_posts_with_tokens():
     along with OAuth tokens for API calls.
     """
 
-    conn = connect()
-    cur = conn.cursor()
-
-    cur.execute("""
-        SELECT
-            p.id,
-            p.youtube_video_id,
-            t.access_token,
-            t.refresh_token,
-            t.expires_at
-        FROM posts p
-        JOIN posts_accounts pa ON p.id = pa.post_id
-        JOIN accounts a ON pa.account_id = a.id
-        JOIN tokens t ON t.account_id = a.id
-        WHERE LOWER(a.platform) = 'youtube'
-        AND p.youtube_video_id IS NOT NULL
-        AND p.status = 'posted'
-        AND p.created_at >= NOW() - INTERVAL '30 days'
-
-    """)
-
-    rows = cur.fetchall()
-    conn.close()
+    with get_conn() as conn:
+        with conn.cursor() as cur:
+
+            cur.execute("""
+                SELECT
+                    p.id,
+                    p.youtube_video_id,
+                    t.access_token,
+                    t.refresh_token,
+                    t.expires_at
+                FROM posts p
+                JOIN posts_accounts pa ON p.id = pa.post_id
+                JOIN accounts a ON pa.account_id = a.id
+                JOIN tokens t ON t.account_id = a.id
+                WHERE LOWER(a.platform) = 'youtube'
+                AND p.youtube_video_id IS NOT NULL
+                AND p.status = 'posted'
+                AND p.created_at >= NOW() - INTERVAL '30 days'
+
+            """)
+
+            rows = cur.fetchall()
 
     return [
         {
@@ -1,8 +1,13 @@
 import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
+from email.header import Header
+from email.utils import formatdate, make_msgid
 import os
+import quopri
 import logging
+import ssl
+import threading
+import time
+from typing import Iterable, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -13,21 +18,166 @@ SMTP_PASSWORD = os.getenv("SMTP_PASSWORD")
 SMTP_FROM = os.getenv("SMTP_FROM")
 FRONTEND_BASE_URL = os.getenv("FRONTEND_BASE_URL", "http://localhost:3000")
 
+# Built once: create_default_context() loads the system CA bundle, which
+# starttls() would otherwise redo on every connect
+_SSL_CTX = ssl.create_default_context()
+
 
 def is_smtp_configured() -> bool:
     """Check if SMTP is properly configured."""
     return all([SMTP_HOST, SMTP_USERNAME, SMTP_PASSWORD, SMTP_FROM])
 
 
-def send_password_reset_email(to_email: str, token: str) -> bool:
+# ---------------------------------------------------------
+# SMTP session reuse
+# ---------------------------------------------------------
+
+class SMTPMailer:
     """
-    Send password reset email.
-    Returns True if sent successfully, False otherwise.
+    Keeps one authenticated SMTP session open between sends.
+
+    STARTTLS + LOGIN cost more than sending a message, so the session is
+    reused until it has been idle for idle_timeout seconds (servers drop
+    idle clients anyway). A send that fails on a dropped session
+    reconnects and is retried once.
     """
-    if not is_smtp_configured():
-        logger.warning(f"SMTP not configured. Reset token for {to_email}: {token}")
-        return False
 
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        from_addr: str,
+        idle_timeout: float = 60.0,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.from_addr = from_addr
+        self.idle_timeout = idle_timeout
+        self.ssl_context = ssl_context or _SSL_CTX
+        self._server: Optional[smtplib.SMTP] = None
+        self._last_used = 0.0
+        self._lock = threading.Lock()
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(self.host, self.port, timeout=30)
+        try:
+            server.starttls(context=self.ssl_context)
+            server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        return server
+
+    def _drop(self) -> None:
+        if self._server is None:
+            return
+        try:
+            self._server.quit()
+        except (smtplib.SMTPException, OSError):
+            self._server.close()
+        self._server = None
+
+    def _session(self) -> smtplib.SMTP:
+        if self._server is not None and time.monotonic() - self._last_used > self.idle_timeout:
+            self._drop()
+        if self._server is None:
+            self._server = self._connect()
+        return self._server
+
+    def _send_one(self, to_email: str, raw: bytes) -> None:
+        try:
+            self._session().sendmail(self.from_addr, [to_email], raw)
+        except (smtplib.SMTPServerDisconnected, smtplib.SMTPException, OSError):
+            # Stale session: reconnect and retry once
+            self._drop()
+            self._session().sendmail(self.from_addr, [to_email], raw)
+        finally:
+            self._last_used = time.monotonic()
+
+    def send(self, to_email: str, raw: bytes) -> None:
+        """
+        Send one prebuilt message (see build_message) on the shared
+        session. Raises on failure.
+        """
+        with self._lock:
+            self._send_one(to_email, raw)
+
+    def send_many(self, messages: Iterable[Tuple[str, bytes]]) -> List[bool]:
+        """
+        Send (to_email, raw message) pairs back to back on one session.
+        Returns a per-message success flag; failures are logged.
+        """
+        results: List[bool] = []
+        with self._lock:
+            for to_email, raw in messages:
+                try:
+                    self._send_one(to_email, raw)
+                    results.append(True)
+                except Exception as e:
+                    logger.error(f"Failed to send email to {to_email}: {e}")
+                    results.append(False)
+        return results
+
+    def close(self) -> None:
+        with self._lock:
+            self._drop()
+
+
+mailer = SMTPMailer(SMTP_HOST, SMTP_PORT, SMTP_USERNAME, SMTP_PASSWORD, SMTP_FROM)
+
+
+# ---------------------------------------------------------
+# Password reset
+# ---------------------------------------------------------
+
+# Headers shared by every message, encoded once. Messages are built as
+# raw bytes for sendmail() rather than as an email.mime tree.
+_HEADER_PREFIX = (
+    f"From: {SMTP_FROM}\r\n"
+    "MIME-Version: 1.0\r\n"
+    "Content-Type: text/plain; charset=utf-8\r\n"
+    "Content-Transfer-Encoding: quoted-printable\r\n"
+).encode()
+
+
+# make_msgid() would otherwise look up the host's FQDN on every message
+_MSGID_DOMAIN = (SMTP_FROM or "").rpartition("@")[2] or "localhost"
+
+
+def _header_value(value: str) -> bytes:
+    if "\r" in value or "\n" in value:
+        raise ValueError("Header values must not contain line breaks")
+    try:
+        return value.encode("ascii")
+    except UnicodeEncodeError:
+        return Header(value, "utf-8").encode().encode("ascii")
+
+
+def build_message(to_email: str, subject: str, body: str) -> bytes:
+    """Plain-text message as raw bytes, ready for SMTPMailer.send."""
+    # smtplib leaves bytes messages untouched, and quopri ends lines in
+    # bare LF; SMTP requires CRLF throughout
+    body = body.replace("\r\n", "\n").replace("\r", "\n")
+    encoded = quopri.encodestring(body.encode("utf-8")).replace(b"\n", b"\r\n")
+
+    return b"".join((
+        _HEADER_PREFIX,
+        b"Date: ", formatdate(usegmt=True).encode("ascii"), b"\r\n",
+        b"Message-ID: ", make_msgid(domain=_MSGID_DOMAIN).encode("ascii"), b"\r\n",
+        b"To: ", _header_value(to_email), b"\r\n",
+        b"Subject: ", _header_value(subject), b"\r\n",
+        b"\r\n",
+        encoded,
+    ))
+
+
+def password_reset_content(token: str) -> Tuple[str, str]:
+    """Returns (subject, body) of the password reset email."""
     reset_link = f"{FRONTEND_BASE_URL}/reset-password?token={token}"
 
     subject = "Reset your password"
@@ -45,20 +195,43 @@ def send_password_reset_email(to_email: str, token: str) -> bool:
 
     — Your App Team
     """
+    return subject, body
 
-    msg = MIMEMultipart()
-    msg["From"] = SMTP_FROM
-    msg["To"] = to_email
-    msg["Subject"] = subject
 
-    msg.attach(MIMEText(body, "plain"))
+def _password_reset_message(to_email: str, token: str) -> bytes:
+    return build_message(to_email, *password_reset_content(token))
+
+
+def send_password_reset_email(to_email: str, token: str) -> bool:
+    """
+    Send password reset email.
+    Returns True if sent successfully, False otherwise.
+    """
+    if not is_smtp_configured():
+        logger.warning(f"SMTP not configured. Reset token for {to_email}: {token}")
+        return False
 
     try:
-        with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as server:
-            server.starttls()
-            server.login(SMTP_USERNAME, SMTP_PASSWORD)
-            server.send_message(msg)
+        mailer.send(to_email, _password_reset_message(to_email, token))
         return True
     except Exception as e:
         logger.error(f"Failed to send password reset email to {to_email}: {e}")
         return False
+
+
+def send_bulk(pairs: Iterable[Tuple[str, str]]) -> List[bool]:
+    """
+    Send password reset emails for (to_email, token) pairs over a single
+    SMTP session. Returns a success flag per pair, in order.
+    """
+    pairs = list(pairs)
+
+    if not is_smtp_configured():
+        for to_email, token in pairs:
+            logger.warning(f"SMTP not configured. Reset token for {to_email}: {token}")
+        return [False] * len(pairs)
+
+    return mailer.send_many(
+        (to_email, _password_reset_message(to_email, token))
+        for to_email, token in pairs
+    )
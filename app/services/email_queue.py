@@ -0,0 +1,70 @@
+"""
+Email Queue
+
+Responsibilities:
+- Enqueue outgoing emails on Celery so request handlers return
+  without waiting on STARTTLS/LOGIN/SMTP round trips
+- Deliver them on the worker through the shared SMTPMailer session,
+  which stays open across consecutive tasks
+"""
+
+import logging
+import smtplib
+
+from app.celery_app import celery_app
+from app.services.email import (
+    build_message,
+    is_smtp_configured,
+    mailer,
+    password_reset_content,
+)
+
+logger = logging.getLogger("email_queue")
+logger.setLevel(logging.INFO)
+
+
+# ============================
+# DELIVERY TASK
+# ============================
+
+@celery_app.task(
+    name="send_email_task",
+    bind=True,
+    max_retries=3,
+    default_retry_delay=60,
+)
+def send_email_task(self, to_email: str, subject: str, body: str):
+    if not is_smtp_configured():
+        logger.warning(f"[EMAIL] SMTP not configured, dropping email to {to_email}")
+        return
+
+    try:
+        mailer.send(to_email, build_message(to_email, subject, body))
+        logger.info(f"[EMAIL] Sent '{subject}' to {to_email}")
+
+    except (smtplib.SMTPException, OSError) as e:
+        logger.warning(f"[EMAIL] Send to {to_email} failed, retrying: {e}")
+        raise self.retry(exc=e)
+
+
+# ============================
+# ENQUEUE HELPERS
+# ============================
+
+def queue_password_reset_email(to_email: str, token: str) -> bool:
+    """
+    Queue the password reset email for delivery by a Celery worker.
+    Returns True if queued, False otherwise.
+    """
+    if not is_smtp_configured():
+        logger.warning(f"SMTP not configured. Reset token for {to_email}: {token}")
+        return False
+
+    subject, body = password_reset_content(token)
+
+    try:
+        send_email_task.delay(to_email, subject, body)
+        return True
+    except Exception as e:
+        logger.error(f"Failed to queue password reset email to {to_email}: {e}")
+        return False
@@ -5,18 +5,100 @@ from app.services.database import (
     update_instagram_session,
 )
 import os
+import threading
+import time
+from collections import OrderedDict
+
+
+IMAGE_EXTS = frozenset({".jpg", ".jpeg", ".png"})
+VIDEO_EXTS = frozenset({".mp4", ".mov"})
+
+
+def _media_ext(media_path: str) -> str:
+    return os.path.splitext(media_path)[1].lower()
+
+
+# -------------------------
+# Logged-in client cache
+# -------------------------
+
+# Logged-in clients are reused by later posts from the same account in
+# this process, skipping the login round trips. Concurrent use of one
+# account is already prevented by InstagramAccountLock.
+CLIENT_MAX_IDLE_SECONDS = 30 * 60
+CLIENT_CACHE_SIZE = 64
+
+_CLIENTS: "OrderedDict[int, tuple]" = OrderedDict()  # account_id -> (Client, last_used)
+_CLIENTS_LOCK = threading.Lock()
+
+
+def _cached_client(account_id: int):
+    with _CLIENTS_LOCK:
+        entry = _CLIENTS.get(account_id)
+        if entry is None:
+            return None
+
+        client, last_used = entry
+        if time.monotonic() - last_used > CLIENT_MAX_IDLE_SECONDS:
+            del _CLIENTS[account_id]
+            return None
+
+        _CLIENTS[account_id] = (client, time.monotonic())
+        _CLIENTS.move_to_end(account_id)
+        return client
+
+
+def _cache_client(account_id: int, client: Client) -> None:
+    with _CLIENTS_LOCK:
+        _CLIENTS[account_id] = (client, time.monotonic())
+        _CLIENTS.move_to_end(account_id)
+        while len(_CLIENTS) > CLIENT_CACHE_SIZE:
+            _CLIENTS.popitem(last=False)
+
+
+def _evict_client(account_id: int) -> None:
+    with _CLIENTS_LOCK:
+        _CLIENTS.pop(account_id, None)
+    _LAST_LOGIN_OK.pop(account_id, None)
+
+
+# A stored session that logged in or posted within this window is
+# trusted without the get_timeline_feed probe (e.g. after the client was
+# pushed out of the cache). A stale one still surfaces as LoginRequired.
+SESSION_TRUST_SECONDS = 20 * 60
+
+_LAST_LOGIN_OK: dict = {}  # account_id -> monotonic time of last success
+
+
+def _mark_login_ok(account_id: int) -> None:
+    _LAST_LOGIN_OK[account_id] = time.monotonic()
+
+
+def _recently_ok(account_id: int) -> bool:
+    last_ok = _LAST_LOGIN_OK.get(account_id)
+    return last_ok is not None and time.monotonic() - last_ok < SESSION_TRUST_SECONDS
 
 
 class InstagramService:
     def __init__(self, account_id: int):
         self.account_id = account_id
-        self.client = Client()
+        self.client = None  # set by login(), possibly from the cache
 
     # -------------------------
     # Authentication
     # -------------------------
 
     def login(self, force: bool = False):
+        if force:
+            _evict_client(self.account_id)
+        else:
+            cached = _cached_client(self.account_id)
+            if cached is not None:
+                # A stale session surfaces as LoginRequired in post_*,
+                # which retries with login(force=True)
+                self.client = cached
+                return
+
         creds = get_instagram_credentials(self.account_id)
         if not creds:
             raise ValueError("Instagram credentials not found")
@@ -27,11 +109,16 @@ class InstagramService:
 
         if session and not force:
             try:
+                self.client = Client()
                 self.client.set_settings(session)
-                self.client.login(username, password)
+                if not _recently_ok(self.account_id):
+                    # Cheap authenticated probe; login() only when it fails
+                    self.client.get_timeline_feed()
+                    _mark_login_ok(self.account_id)
+                _cache_client(self.account_id, self.client)
                 return
             except Exception:
-                pass  # fall through to full login
+                pass  # invalid session → fall through to full login
 
         # FULL LOGIN
         self.client = Client()
@@ -41,6 +128,8 @@ class InstagramService:
             self.account_id,
             self.client.get_settings()
         )
+        _mark_login_ok(self.account_id)
+        _cache_client(self.account_id, self.client)
 
     # -------------------------
     # Feed post
@@ -116,19 +205,22 @@ class InstagramService:
     # Story post (FIXED)
     # -------------------------
 
-    def post_story(self, media_path: str):
+    def post_story(self, media_path: str, ext: str = None):
         """
         Upload image or video as Instagram Story
+
+        ext: _media_ext(media_path), when the caller already has it
         """
         self.login()
 
-        ext = os.path.splitext(media_path.lower())[1]
+        if ext is None:
+            ext = _media_ext(media_path)
 
         try:
-            if ext in {".jpg", ".jpeg", ".png"}:
+            if ext in IMAGE_EXTS:
                 self.client.photo_upload_to_story(media_path)
 
-            elif ext in {".mp4", ".mov"}:
+            elif ext in VIDEO_EXTS:
                 self.client.video_upload_to_story(media_path)
 
             else:
@@ -138,10 +230,10 @@ class InstagramService:
             # SESSION EXPIRED → FORCE RELOGIN
             self.login(force=True)
 
-            if ext in {".jpg", ".jpeg", ".png"}:
+            if ext in IMAGE_EXTS:
                 self.client.photo_upload_to_story(media_path)
 
-            elif ext in {".mp4", ".mov"}:
+            elif ext in VIDEO_EXTS:
                 self.client.video_upload_to_story(media_path)
 
     # -------------------------
@@ -156,8 +248,8 @@ class InstagramService:
         share_to_feed: bool = True,
         **_,
     ):
-        ext = os.path.splitext(media_path.lower())[1]
-        is_video = ext in {".mp4", ".mov"}
+        ext = _media_ext(media_path)
+        is_video = ext in VIDEO_EXTS
 
         # SAFETY OVERRIDE
         if is_video and post_type == "feed":
@@ -170,7 +262,9 @@ class InstagramService:
             self.post_reel(media_path, caption, share_to_feed)
 
         elif post_type == "story":
-            self.post_story(media_path)
+            self.post_story(media_path, ext)
 
         else:
             raise ValueError(f"Unsupported post type: {post_type}")
+
+        _mark_login_ok(self.account_id)
@@ -6,9 +6,9 @@ Responsibilities:
 - Trim subtitles to a specific clip segment
 """
 
+from bisect import bisect_left, bisect_right
 from pathlib import Path
-from typing import List, Dict
-from datetime import timedelta
+from typing import List, Dict, Optional
 import uuid
 
 from app.config import settings
@@ -23,18 +23,46 @@ def _format_timestamp(seconds: float) -> str:
     Convert seconds to SRT timestamp format (HH:MM:SS,mmm)
     with floating-point safety.
     """
-    seconds = max(0.0, round(seconds, 3))
+    # Integer milliseconds: no float modulo, so 1.001 can't render as ,000
+    millis = max(0, int(round(seconds * 1000)))
 
-    millis = int((seconds % 1) * 1000)
-    total_seconds = int(seconds)
-
-    hours = total_seconds // 3600
-    minutes = (total_seconds % 3600) // 60
-    secs = total_seconds % 60
+    hours, millis = divmod(millis, 3_600_000)
+    minutes, millis = divmod(millis, 60_000)
+    secs, millis = divmod(millis, 1000)
 
     return f"{hours:02}:{minutes:02}:{secs:02},{millis:03}"
 
 
+# ---------------------------------------------------------
+# Transcript windowing
+# ---------------------------------------------------------
+
+def transcript_starts(transcript: List[Dict]) -> List[float]:
+    """
+    Start times of a (chronological) transcript. Compute once per job
+    and pass to generate_srt_for_segment for every clip.
+    """
+    return [float(t["start"]) for t in transcript]
+
+
+def _window(
+    transcript: List[Dict],
+    starts: List[float],
+    start: float,
+    end: float,
+) -> List[Dict]:
+    # Everything starting after the clip ends is out
+    hi = bisect_right(starts, end)
+
+    # Entries starting before the clip can still run into it; Whisper
+    # segments are sequential, so walk back only while they overlap
+    lo = bisect_left(starts, start, 0, hi)
+    while lo > 0 and float(transcript[lo - 1]["end"]) >= start:
+        lo -= 1
+
+    return transcript[lo:hi]
+
+
 # ---------------------------------------------------------
 # Public API
 # ---------------------------------------------------------
@@ -42,10 +70,14 @@ def _format_timestamp(seconds: float) -> str:
 def generate_srt_for_segment(
     transcript: List[Dict],
     segment: Dict,
+    starts: Optional[List[float]] = None,
 ) -> str:
     """
     Generates an SRT file for a specific clip segment.
 
+    starts: transcript_starts(transcript), precomputed by callers that
+    generate several clips from the same transcript.
+
     Returns:
         Path to SRT file (string)
     """
@@ -59,14 +91,16 @@ def generate_srt_for_segment(
 
     srt_path = subtitles_dir / f"{uuid.uuid4()}.srt"
 
-    index = 1
-    lines: List[str] = []
+    cues: List[str] = []
 
     # Readability constraints for Shorts/Reels
     MIN_SUB_DURATION = 0.4  # seconds
     MAX_LINE_LENGTH = 80
 
-    for t in transcript:
+    if starts is None:
+        starts = transcript_starts(transcript)
+
+    for t in _window(transcript, starts, start, end):
         t_start = float(t["start"])
         t_end = float(t["end"])
 
@@ -89,17 +123,15 @@ def generate_srt_for_segment(
         if len(text) > MAX_LINE_LENGTH:
             text = text[:MAX_LINE_LENGTH].rsplit(" ", 1)[0] + "…"
 
-        lines.append(str(index))
-        lines.append(
-            f"{_format_timestamp(sub_start)} --> {_format_timestamp(sub_end)}"
+        cues.append(
+            f"{len(cues) + 1}\n"
+            f"{_format_timestamp(sub_start)} --> {_format_timestamp(sub_end)}\n"
+            f"{text}\n"
         )
-        lines.append(text)
-        lines.append("")
-        index += 1
 
-    if not lines:
+    if not cues:
         raise RuntimeError("No subtitles generated for clip")
 
-    srt_path.write_text("\n".join(lines), encoding="utf-8")
+    srt_path.write_text("\n".join(cues), encoding="utf-8")
 
     return str(srt_path)
@@ -0,0 +1,100 @@
+"""
+Transcript Cache
+
+Responsibilities:
+- Fingerprint a video file cheaply (size + first/last MiB)
+- Persist Whisper transcripts (and source keyframe lists) on disk as
+  gzipped compact JSON keyed by that fingerprint
+- Let re-runs over the same source (new style, new clip length,
+  retries, re-uploads) skip transcription entirely
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.config import settings
+
+
+TRANSCRIPT_CACHE_DIR = Path(settings.MEDIA_ROOT) / "transcripts"
+
+# Bytes hashed from each end of the file
+FINGERPRINT_SAMPLE_SIZE = 1 << 20
+
+# Transcripts are repetitive text; level 6 is ~5x smaller than raw JSON
+GZIP_LEVEL = 6
+
+
+def video_fingerprint(video_path: str) -> str:
+    """
+    sha256 over the file size plus its first and last MiB.
+
+    Reading the whole file would cost as much I/O as the upload itself;
+    container headers and trailers (moov/index, duration) differ for
+    any two real videos, so sampling the ends is enough.
+    """
+    size = os.path.getsize(video_path)
+
+    h = hashlib.sha256()
+    h.update(str(size).encode("ascii"))
+
+    with open(video_path, "rb") as f:
+        h.update(f.read(FINGERPRINT_SAMPLE_SIZE))
+        if size > FINGERPRINT_SAMPLE_SIZE:
+            f.seek(max(FINGERPRINT_SAMPLE_SIZE, size - FINGERPRINT_SAMPLE_SIZE))
+            h.update(f.read(FINGERPRINT_SAMPLE_SIZE))
+
+    return h.hexdigest()
+
+
+def _cache_path(fingerprint: str, kind: str = "") -> Path:
+    suffix = f".{kind}" if kind else ""
+    return TRANSCRIPT_CACHE_DIR / f"{fingerprint}{suffix}.json.gz"
+
+
+def _load(cache_path: Path):
+    try:
+        with gzip.open(cache_path, "rb") as f:
+            return json.loads(f.read())
+    except (OSError, EOFError, ValueError):
+        # Missing, truncated or corrupt entries are treated as a miss
+        return None
+
+
+def _store(cache_path: Path, value) -> None:
+    """
+    Write via a temp file + rename so concurrent jobs never observe
+    a partially written cache entry.
+    """
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+    try:
+        payload = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        with os.fdopen(fd, "wb") as f:
+            f.write(gzip.compress(payload, compresslevel=GZIP_LEVEL))
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def get_cached_transcript(fingerprint: str) -> Optional[List[Dict]]:
+    return _load(_cache_path(fingerprint))
+
+
+def set_cached_transcript(fingerprint: str, segments: List[Dict]) -> None:
+    _store(_cache_path(fingerprint), segments)
+
+
+def get_cached_keyframes(fingerprint: str) -> Optional[List[float]]:
+    return _load(_cache_path(fingerprint, "keyframes"))
+
+
+def set_cached_keyframes(fingerprint: str, keyframes: List[float]) -> None:
+    _store(_cache_path(fingerprint, "keyframes"), keyframes)
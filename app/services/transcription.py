@@ -5,38 +5,79 @@ Responsibilities:
 - Transcribe video/audio files using the OpenAI Whisper API
 - Return timestamped segments usable for AI clipping
 - Gracefully handle videos with NO speech
+- Reuse cached transcripts (see transcript_cache), so retries and
+  re-runs over the same video skip Whisper entirely
+- Split long audio into fixed windows and transcribe them concurrently
 """
 
 import os
-from typing import List, Dict
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Tuple
 from openai import OpenAI
 from app.config import settings
+from app.services.transcript_cache import (
+    get_cached_transcript,
+    set_cached_transcript,
+    video_fingerprint,
+)
+from app.utils.process import run_with_stderr_tail
+
+
+_FFMPEG_BIN = shutil.which("ffmpeg") or "ffmpeg"
+
+# Audio window sent per Whisper request. 16 kHz mono PCM keeps a
+# window at ~5.8 MB, well under the API's 25 MB upload limit.
+CHUNK_SECONDS = 180
+
+# Minimum usable speech duration (seconds)
+MIN_SEGMENT_DURATION = 0.3
 
 
 # ---------------------------------------------------------
-# Public API
+# Audio chunking
 # ---------------------------------------------------------
 
-def transcribe_video(video_path: str) -> List[Dict]:
+def _split_audio(video_path: str, out_dir: str) -> List[str]:
     """
-    Transcribes a video file and returns timestamped segments.
+    Extract the audio track as CHUNK_SECONDS-long 16 kHz mono WAV files.
 
-    Returns:
-    [
-        {
-            "start": float,
-            "end": float,
-            "text": str
-        }
-    ]
+    Returns the chunk paths in playback order; empty when the
+    video has no audio stream.
     """
-
-    if not os.path.exists(video_path):
-        raise FileNotFoundError(f"Video not found: {video_path}")
-
-    client = OpenAI(api_key=settings.OPENAI_API_KEY)
-
-    with open(video_path, "rb") as audio_file:
+    pattern = os.path.join(out_dir, "chunk_%05d.wav")
+
+    returncode, stderr_tail = run_with_stderr_tail([
+        _FFMPEG_BIN, "-y", "-nostdin", "-hide_banner",
+        "-i", str(video_path),
+        "-map", "0:a:0?",
+        "-vn",
+        "-ac", "1",
+        "-ar", "16000",
+        "-f", "segment",
+        "-segment_time", str(CHUNK_SECONDS),
+        "-reset_timestamps", "1",
+        pattern,
+    ])
+
+    chunks = sorted(
+        os.path.join(out_dir, name)
+        for name in os.listdir(out_dir)
+        if name.startswith("chunk_") and name.endswith(".wav")
+    )
+
+    if returncode != 0:
+        # No audio track → nothing to transcribe
+        if "does not contain any stream" in stderr_tail:
+            return []
+        raise RuntimeError("FFmpeg audio extraction failed:\n" + stderr_tail)
+
+    return chunks
+
+
+def _transcribe_chunk(client: OpenAI, chunk_path: str) -> List:
+    with open(chunk_path, "rb") as audio_file:
         result = client.audio.transcriptions.create(
             model="whisper-1",
             file=audio_file,
@@ -44,16 +85,16 @@ def transcribe_video(video_path: str) -> List[Dict]:
             timestamp_granularities=["segment"],
         )
 
-    raw_segments = result.segments or []
+    return result.segments or []
 
-    segments: List[Dict] = []
 
-    # Minimum usable speech duration (seconds)
-    MIN_SEGMENT_DURATION = 0.3
+def _clean_segments(raw_segments: List, offset: float) -> List[Dict]:
+    segments: List[Dict] = []
 
     for seg in raw_segments:
-        start = float(seg.get("start", 0))
-        end = float(seg.get("end", 0))
+        # Whisper timestamps are relative to the chunk
+        start = float(seg.get("start", 0)) + offset
+        end = float(seg.get("end", 0)) + offset
         text = seg.get("text", "").strip()
 
         if not text:
@@ -73,7 +114,70 @@ def transcribe_video(video_path: str) -> List[Dict]:
             }
         )
 
-    if not segments:
-        return []
-
     return segments
+
+
+# ---------------------------------------------------------
+# Public API
+# ---------------------------------------------------------
+
+def iter_transcribe_video(video_path: str) -> Iterator[Tuple[int, int, List[Dict]]]:
+    """
+    Transcribe a video chunk by chunk.
+
+    Yields (chunks_done, chunks_total, segments) in playback order as
+    soon as each chunk and every chunk before it are transcribed, so
+    callers can report progress while the remaining chunks are still
+    in flight. A cache hit yields the whole transcript once.
+    """
+
+    if not os.path.exists(video_path):
+        raise FileNotFoundError(f"Video not found: {video_path}")
+
+    fingerprint = video_fingerprint(video_path)
+    cached = get_cached_transcript(fingerprint)
+    if cached is not None:
+        yield 1, 1, cached
+        return
+
+    client = OpenAI(api_key=settings.OPENAI_API_KEY)
+    transcript: List[Dict] = []
+
+    with tempfile.TemporaryDirectory(prefix="transcribe_") as work_dir:
+        chunks = _split_audio(video_path, work_dir)
+
+        if chunks:
+            max_workers = max(1, min(settings.TRANSCRIBE_WORKERS, len(chunks)))
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                # map() yields in submission order, i.e. playback order
+                results = pool.map(lambda path: _transcribe_chunk(client, path), chunks)
+
+                for chunk_index, raw_segments in enumerate(results):
+                    segments = _clean_segments(raw_segments, chunk_index * CHUNK_SECONDS)
+                    transcript.extend(segments)
+                    yield chunk_index + 1, len(chunks), segments
+
+    set_cached_transcript(fingerprint, transcript)
+
+    if not chunks:
+        yield 0, 0, []
+
+
+def transcribe_video(video_path: str) -> List[Dict]:
+    """
+    Transcribes a video file and returns timestamped segments.
+
+    Returns:
+    [
+        {
+            "start": float,
+            "end": float,
+            "text": str
+        }
+    ]
+    """
+    transcript: List[Dict] = []
+    for _, _, segments in iter_transcribe_video(video_path):
+        transcript.extend(segments)
+
+    return transcript
@@ -4,17 +4,69 @@ Video Processing Service (FFmpeg)
 Responsibilities:
 - Generate short video clips from long-form videos
 - Crop to vertical (9:16) format for Shorts/Reels
-- Optionally burn-in subtitles
+- Optionally burn-in subtitles (or mux them as a soft mov_text track)
 - Handle videos WITH or WITHOUT audio
 - Be Windows-safe for FFmpeg
+- Encode on the GPU (NVENC / VAAPI / VideoToolbox) when available,
+  falling back to libx264
+- Stream-copy H.264 sources when no re-encode is required
+- Cut several clips from one source in a single FFmpeg invocation
+- Decode overlapping / adjacent clips once and split them per output
 """
 
+import asyncio
+import logging
+import math
+import os
 from pathlib import Path
+import shutil
 import subprocess
 import uuid
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 from app.config import settings
+from app.utils.process import a_run_with_stderr_tail, run_with_stderr_tail
+
+logger = logging.getLogger("video_processing")
+logger.setLevel(logging.INFO)
+
+
+_FFMPEG_BIN = shutil.which("ffmpeg") or "ffmpeg"
+_FFPROBE_BIN = shutil.which("ffprobe") or "ffprobe"
+
+# Save clips in media_root/clips/ (not media_root/media/clips/)
+_OUTPUT_DIR = Path(settings.MEDIA_ROOT).resolve() / "clips"
+_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+
+CPU_ENCODER = "libx264"
+NVENC_ENCODER = "h264_nvenc"
+VAAPI_ENCODER = "h264_vaapi"
+VIDEOTOOLBOX_ENCODER = "h264_videotoolbox"
+
+# FFMPEG_HWACCEL value -> encoder; "auto" tries them in this order
+_HW_ENCODERS = {
+    "nvenc": NVENC_ENCODER,
+    "vaapi": VAAPI_ENCODER,
+    "videotoolbox": VIDEOTOOLBOX_ENCODER,
+}
+
+# Resolved lazily on first use: listed by `ffmpeg -encoders` and passing
+# a one-frame test encode (see _test_encode)
+_ENCODER: Optional[str] = None
+
+# (video_path, mtime) -> video codec name, filled by _probe_video_codec
+_CODEC_CACHE: Dict[Tuple[str, float], Optional[str]] = {}
+
+# (video_path, mtime) -> sorted keyframe times, filled by probe_keyframes
+_KEYFRAME_CACHE: Dict[Tuple[str, float], List[float]] = {}
+
+# (video_path, mtime) -> has an audio stream, filled by _probe_has_audio
+_AUDIO_CACHE: Dict[Tuple[str, float], bool] = {}
+
+# Clips closer than this (seconds) are cut from one shared decode
+SHARED_DECODE_MAX_GAP = 5.0
+# Upper bound on split branches per shared decode
+SHARED_DECODE_MAX_CLIPS = 16
 
 
 def _ffmpeg_safe_path(path: Path) -> str:
@@ -25,30 +77,398 @@ def _ffmpeg_safe_path(path: Path) -> str:
     return path.as_posix().replace(":", r"\:")
 
 
-def generate_clip(
-    video_path: str,
-    segment: Dict,
-    subtitles_path: Optional[str] = None,
-) -> Tuple[str, int]:
+# =========================================================
+# ENCODER SELECTION
+# =========================================================
 
-    video_path = Path(video_path).resolve()
-    if not video_path.exists():
-        raise FileNotFoundError(f"Video not found: {video_path}")
+def _detect_encoder() -> str:
+    mode = (settings.FFMPEG_HWACCEL or "auto").lower()
+    if mode == "none":
+        return CPU_ENCODER
+
+    try:
+        result = subprocess.run(
+            [_FFMPEG_BIN, "-hide_banner", "-encoders"],
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return CPU_ENCODER
+
+    available = result.stdout.decode(errors="ignore")
+
+    candidates = [_HW_ENCODERS[mode]] if mode in _HW_ENCODERS else list(_HW_ENCODERS.values())
+    for encoder in candidates:
+        if encoder not in available:
+            continue
+        # Builds ship the VAAPI encoder whether or not a render node exists
+        if encoder == VAAPI_ENCODER and not os.path.exists(settings.FFMPEG_VAAPI_DEVICE):
+            continue
+        if not _test_encode(encoder):
+            continue
+        return encoder
+
+    return CPU_ENCODER
+
+
+def _test_encode(encoder: str) -> bool:
+    """
+    Encode one synthetic frame with `encoder`.
+
+    Distro builds list NVENC (and friends) in `ffmpeg -encoders` with no
+    GPU or driver present; only an actual encode proves it works.
+    """
+    upload = ["-vf", "format=nv12,hwupload"] if encoder == VAAPI_ENCODER else []
+    try:
+        result = subprocess.run(
+            [
+                _FFMPEG_BIN, "-hide_banner", "-nostdin", "-v", "error",
+                *_global_args(encoder),
+                "-f", "lavfi", "-i", "color=c=black:s=256x256:d=1",
+                "-frames:v", "1",
+                *upload,
+                "-c:v", encoder,
+                "-f", "null", "-",
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=20,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return False
+
+    if result.returncode != 0:
+        logger.info(f"[FFMPEG] {encoder} is listed but failed a test encode; skipping")
+        return False
+    return True
+
+
+def _get_encoder() -> str:
+    global _ENCODER
+    if _ENCODER is None:
+        _ENCODER = _detect_encoder()
+        logger.info(
+            f"[FFMPEG] Using video encoder: {_ENCODER} "
+            f"(x264 preset={settings.FFMPEG_PRESET}, crf={settings.FFMPEG_CRF})"
+        )
+    return _ENCODER
+
+
+def _global_args(encoder: str) -> List[str]:
+    if encoder == VAAPI_ENCODER:
+        return ["-vaapi_device", settings.FFMPEG_VAAPI_DEVICE]
+    return []
+
+
+def _decode_args(encoder: str) -> List[str]:
+    if encoder == NVENC_ENCODER:
+        # Decode on the GPU; frames are downloaded automatically for the
+        # CPU crop/subtitles filters before being handed back to NVENC.
+        return ["-hwaccel", "cuda"]
+    return []
+
+
+def _encode_args(encoder: str) -> List[str]:
+    if encoder == NVENC_ENCODER:
+        return [
+            "-c:v", NVENC_ENCODER,
+            "-preset", "p4",
+            "-tune", "hq",
+            "-rc", "vbr",
+            "-cq", "23",
+            "-b:v", "0",
+            "-pix_fmt", "yuv420p",
+        ]
+    if encoder == VAAPI_ENCODER:
+        # Frames arrive as VAAPI surfaces (see _video_filter); no -pix_fmt
+        return [
+            "-c:v", VAAPI_ENCODER,
+            "-qp", "23",
+        ]
+    if encoder == VIDEOTOOLBOX_ENCODER:
+        # VideoToolbox has no CRF mode on every Mac; use a fixed bitrate
+        return [
+            "-c:v", VIDEOTOOLBOX_ENCODER,
+            "-b:v", "6M",
+            "-pix_fmt", "yuv420p",
+        ]
+    return [
+        "-c:v", CPU_ENCODER,
+        "-preset", settings.FFMPEG_PRESET,
+        "-crf", str(settings.FFMPEG_CRF),
+        "-pix_fmt", "yuv420p",
+    ]
+
+
+def ffmpeg_threads_per_invocation(pool_workers: int) -> Optional[int]:
+    """
+    Thread count for each of pool_workers concurrent ffmpeg processes.
+
+    Without a cap every process sizes itself to the whole machine and
+    N workers end up contending with N x cores threads. Returns None
+    (ffmpeg's own default) for a single worker.
+    """
+    if settings.CLIP_FFMPEG_THREADS > 0:
+        return settings.CLIP_FFMPEG_THREADS
+
+    if pool_workers <= 1:
+        return None
+
+    return max(1, (os.cpu_count() or pool_workers) // pool_workers)
+
+
+def _thread_args(ffmpeg_threads: Optional[int]) -> List[str]:
+    # 0 lets ffmpeg pick one thread per core
+    return ["-threads", str(ffmpeg_threads or 0)]
+
+
+def _input_args(
+    video_path: Path,
+    start: float,
+    duration: int,
+    encoder: str,
+    ffmpeg_threads: Optional[int] = None,
+) -> List[str]:
+    # -ss/-t before -i: seek on the input so only the clip range is decoded
+    return [
+        *_decode_args(encoder),
+        *_thread_args(ffmpeg_threads),
+        "-ss", str(start),
+        "-t", str(duration),
+        "-i", str(video_path),
+    ]
+
+
+def _encode_output_args(
+    input_index: int,
+    vf_arg: str,
+    output_path: Path,
+    encoder: str,
+    ffmpeg_threads: Optional[int] = None,
+    subtitle_index: Optional[int] = None,
+) -> List[str]:
+    return [
+        "-vf", vf_arg,
+        "-map", f"{input_index}:v:0",
+        "-map", f"{input_index}:a?",
+        *_encode_args(encoder),
+        *_thread_args(ffmpeg_threads),
+        "-c:a", "aac",
+        *_soft_subtitle_args(subtitle_index),
+        "-movflags", "+faststart",
+        str(output_path),
+    ]
+
+
+def _copy_output_args(
+    input_index: int,
+    output_path: Path,
+    subtitle_index: Optional[int] = None,
+) -> List[str]:
+    return [
+        "-map", f"{input_index}:v:0",
+        "-map", f"{input_index}:a?",
+        "-c", "copy",
+        *_soft_subtitle_args(subtitle_index),
+        "-avoid_negative_ts", "make_zero",
+        "-movflags", "+faststart",
+        str(output_path),
+    ]
+
+
+def _graph_output_args(
+    video_label: str,
+    audio_label: Optional[str],
+    output_path: Path,
+    encoder: str,
+    ffmpeg_threads: Optional[int] = None,
+) -> List[str]:
+    # Output fed by a -filter_complex branch instead of an input stream
+    audio_args = ["-map", audio_label, "-c:a", "aac"] if audio_label else []
+    return [
+        "-map", video_label,
+        *audio_args,
+        *_encode_args(encoder),
+        *_thread_args(ffmpeg_threads),
+        "-movflags", "+faststart",
+        str(output_path),
+    ]
+
+
+def _soft_subtitle_args(subtitle_index: Optional[int]) -> List[str]:
+    if subtitle_index is None:
+        return []
+    return ["-map", f"{subtitle_index}:s:0", "-c:s", "mov_text"]
+
+
+def _probe_video_codec(video_path: Path) -> Optional[str]:
+    key = (str(video_path), video_path.stat().st_mtime)
+    if key in _CODEC_CACHE:
+        return _CODEC_CACHE[key]
+
+    try:
+        result = subprocess.run(
+            [
+                _FFPROBE_BIN,
+                "-v", "error",
+                "-select_streams", "v:0",
+                "-show_entries", "stream=codec_name",
+                "-of", "default=noprint_wrappers=1:nokey=1",
+                str(video_path),
+            ],
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            timeout=30,
+        )
+        codec = result.stdout.decode(errors="ignore").strip() or None
+    except (OSError, subprocess.SubprocessError):
+        codec = None
+
+    _CODEC_CACHE[key] = codec
+    return codec
+
+
+def _probe_has_audio(video_path: Path) -> bool:
+    key = (str(video_path), video_path.stat().st_mtime)
+    if key in _AUDIO_CACHE:
+        return _AUDIO_CACHE[key]
+
+    try:
+        result = subprocess.run(
+            [
+                _FFPROBE_BIN,
+                "-v", "error",
+                "-select_streams", "a:0",
+                "-show_entries", "stream=index",
+                "-of", "default=noprint_wrappers=1:nokey=1",
+                str(video_path),
+            ],
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            timeout=30,
+        )
+        has_audio = bool(result.stdout.strip())
+    except (OSError, subprocess.SubprocessError):
+        has_audio = False
+
+    _AUDIO_CACHE[key] = has_audio
+    return has_audio
+
+
+def probe_keyframes(video_path: str) -> List[float]:
+    """
+    Sorted presentation times (seconds) of the video keyframes.
+
+    Reads packet headers only (no decoding); empty if ffprobe fails.
+    """
+    path = Path(video_path)
+    key = (str(path), path.stat().st_mtime)
+    if key in _KEYFRAME_CACHE:
+        return _KEYFRAME_CACHE[key]
+
+    try:
+        result = subprocess.run(
+            [
+                _FFPROBE_BIN,
+                "-v", "error",
+                "-select_streams", "v:0",
+                "-show_entries", "packet=pts_time,flags",
+                "-of", "csv=p=0",
+                str(path),
+            ],
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            timeout=120,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return []
+
+    keyframes = []
+    for line in result.stdout.decode(errors="ignore").splitlines():
+        pts_time, _, flags = line.partition(",")
+        if "K" not in flags:
+            continue
+        try:
+            keyframes.append(float(pts_time))
+        except ValueError:  # "N/A"
+            continue
+
+    keyframes.sort()
+    _KEYFRAME_CACHE[key] = keyframes
+    return keyframes
+
+
+def probe_duration(video_path: str) -> float:
+    """
+    Container duration in seconds (0.0 if ffprobe cannot tell).
+    """
+    try:
+        result = subprocess.run(
+            [
+                _FFPROBE_BIN,
+                "-v", "error",
+                "-show_entries", "format=duration",
+                "-of", "default=noprint_wrappers=1:nokey=1",
+                str(video_path),
+            ],
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            timeout=30,
+        )
+        return float(result.stdout.decode(errors="ignore").strip() or 0)
+    except (OSError, subprocess.SubprocessError, ValueError):
+        return 0.0
+
+
+def _can_stream_copy(video_path: Path, burn_subtitles: bool) -> bool:
+    """
+    Remux instead of re-encoding when nothing touches the picture.
 
+    Tradeoff: with -c copy the input seek lands on the keyframe at or
+    before `start`, so a clip can begin up to one GOP (typically 2s)
+    early and is never re-cropped to 9:16. That is why the crop setting
+    gates this, and not just the absence of burned-in subtitles.
+    """
+    if burn_subtitles or settings.CLIP_FORCE_RECROP:
+        return False
+    return _probe_video_codec(video_path) == "h264"
+
+
+def can_stream_copy(video_path: str, burn_subtitles: bool) -> bool:
+    """
+    Whether clips from this source will be remuxed rather than
+    re-encoded (see _can_stream_copy).
+    """
+    return _can_stream_copy(Path(video_path), burn_subtitles)
+
+
+def _run_ffmpeg(command: List[str]) -> None:
+    returncode, stderr_tail = run_with_stderr_tail(command)
+    if returncode != 0:
+        raise RuntimeError("FFmpeg failed:\n" + stderr_tail)
+
+
+# =========================================================
+# CLIP GENERATION
+# =========================================================
+
+def _clip_bounds(segment: Dict) -> Tuple[float, int]:
     start = max(0.0, float(segment["start"]))
     duration = int(segment["end"] - segment["start"])
 
     if duration <= 0:
         raise ValueError("Invalid clip duration")
 
-    # ---- Output paths ----
-    media_root = Path(settings.MEDIA_ROOT).resolve()
-    # Save clips in media_root/clips/ (not media_root/media/clips/)
-    output_dir = media_root / "clips"
-    output_dir.mkdir(parents=True, exist_ok=True)
+    return start, duration
 
-    output_path = output_dir / f"{uuid.uuid4()}.mp4"
 
+def _video_filter(subtitles_path: Optional[str], encoder: str = CPU_ENCODER) -> str:
     # ---- SAFE vertical crop (ESCAPED COMMAS) ----
     crop_filter = (
         "crop="
@@ -61,9 +481,9 @@ def generate_clip(
     filters = [crop_filter]
 
     if subtitles_path:
-        sub_path = Path(subtitles_path).resolve()
-        if not sub_path.exists():
-            raise FileNotFoundError(f"Subtitles file not found: {sub_path}")
+        if not os.path.isfile(subtitles_path):
+            raise FileNotFoundError(f"Subtitles file not found: {subtitles_path}")
+        sub_path = Path(subtitles_path).absolute()
 
         sub_path_safe = _ffmpeg_safe_path(sub_path)
 
@@ -79,40 +499,398 @@ def generate_clip(
             "Alignment=2'"
         )
 
-    vf_arg = ",".join(filters)
+    if encoder == VAAPI_ENCODER:
+        # Crop/subtitles run on the CPU; hand the result to the GPU encoder
+        filters.append("format=nv12,hwupload")
 
-    command = [
-        "ffmpeg",
-        "-y",
-        "-ss", str(start),
-        "-i", str(video_path),
-        "-t", str(duration),
-        "-vf", vf_arg,
-        "-map", "0:v:0",
-        "-map", "0:a?",
-        "-c:v", "libx264",
-        "-preset", "veryfast",
-        "-crf", "23",
-        "-pix_fmt", "yuv420p",
-        "-c:a", "aac",
-        "-movflags", "+faststart",
-        str(output_path),
+    return ",".join(filters)
+
+
+def _shared_decode_groups(
+    clips: List[Tuple[float, int, Optional[str], Path]],
+) -> List[List[int]]:
+    """
+    Group clip indices (sorted by start) whose ranges overlap or sit
+    within SHARED_DECODE_MAX_GAP of each other. Decoding the gaps is
+    cheaper than decoding the same frames once per clip.
+    """
+    groups: List[List[int]] = []
+    group_end = 0.0
+
+    for idx in sorted(range(len(clips)), key=lambda i: clips[i][0]):
+        start, duration = clips[idx][0], clips[idx][1]
+        if (
+            groups
+            and start - group_end <= SHARED_DECODE_MAX_GAP
+            and len(groups[-1]) < SHARED_DECODE_MAX_CLIPS
+        ):
+            groups[-1].append(idx)
+            group_end = max(group_end, start + duration)
+        else:
+            groups.append([idx])
+            group_end = start + duration
+
+    return groups
+
+
+def _shared_decode_graph(
+    input_index: int,
+    group: List[Tuple[float, int, Optional[str], Path]],
+    group_start: float,
+    has_audio: bool,
+    encoder: str,
+) -> Tuple[str, List[Tuple[str, Optional[str]]]]:
+    """
+    filter_complex that splits one decoded input into a trimmed,
+    cropped (and optionally subtitled) branch per clip.
+
+    Returns (graph, [(video_label, audio_label), ...]) in group order.
+    """
+    n = len(group)
+    v_split = "".join(f"[s{input_index}v{k}]" for k in range(n))
+    chains = [f"[{input_index}:v:0]split={n}{v_split}"]
+    if has_audio:
+        a_split = "".join(f"[s{input_index}a{k}]" for k in range(n))
+        chains.append(f"[{input_index}:a:0]asplit={n}{a_split}")
+
+    labels = []
+    for k, (start, duration, burn_path, _) in enumerate(group):
+        trim = f"start={start - group_start:.3f}:duration={duration}"
+        video_label = f"[o{input_index}v{k}]"
+        chains.append(
+            f"[s{input_index}v{k}]trim={trim},setpts=PTS-STARTPTS,"
+            f"{_video_filter(burn_path, encoder)}{video_label}"
+        )
+
+        audio_label = None
+        if has_audio:
+            audio_label = f"[o{input_index}a{k}]"
+            chains.append(
+                f"[s{input_index}a{k}]atrim={trim},asetpts=PTS-STARTPTS{audio_label}"
+            )
+
+        labels.append((video_label, audio_label))
+
+    return ";".join(chains), labels
+
+
+def _build_batch_command(
+    video_path: Path,
+    clips: List[Tuple[float, int, Optional[str], Path]],
+    encoder: str,
+    ffmpeg_threads: Optional[int] = None,
+    burn_in: bool = True,
+) -> List[str]:
+    """
+    One ffmpeg process for the whole batch, one output per clip.
+    clips: (start, duration, subtitles_path, output_path)
+
+    Each clip normally gets its own input seeked to its start: a single
+    input with output-side -ss/-to would decode everything from 0 up to
+    the last clip's end, while an input-side seek only decodes the clip.
+
+    Re-encoded clips that overlap or nearly touch share one seeked
+    input instead, split into per-clip branches with filter_complex, so
+    their common frames are decoded once.
+
+    Soft subtitles (burn_in=False) are added as an extra SRT input
+    right after the clip's video input.
+    """
+    # -nostdin: never wait on (or eat) the parent's stdin; the banner is
+    # noise in the stderr tail kept for error reports
+    command = [_FFMPEG_BIN, "-y", "-nostdin", "-hide_banner", *_global_args(encoder)]
+    graph_outputs = []
+    outputs = []
+    next_input = 0
+
+    shareable = []
+    for clip_index, (start, duration, subtitles_path, output_path) in enumerate(clips):
+        burn_path = subtitles_path if burn_in else None
+        copy = _can_stream_copy(video_path, bool(burn_path))
+        soft_subs = bool(subtitles_path) and not burn_in
+        if not copy and not soft_subs:
+            shareable.append(clip_index)
+
+    shared = [
+        [shareable[i] for i in group]
+        for group in _shared_decode_groups([clips[i] for i in shareable])
+        if len(group) > 1
     ]
+    shared_indices = {idx for group in shared for idx in group}
+
+    if shared:
+        has_audio = _probe_has_audio(video_path)
+
+    for group in shared:
+        members = [
+            (
+                clips[idx][0],
+                clips[idx][1],
+                clips[idx][2] if burn_in else None,
+                clips[idx][3],
+            )
+            for idx in group
+        ]
+        group_start = min(m[0] for m in members)
+        group_end = max(m[0] + m[1] for m in members)
+
+        command += _input_args(
+            video_path,
+            group_start,
+            math.ceil(group_end - group_start),
+            encoder,
+            ffmpeg_threads,
+        )
+        graph, labels = _shared_decode_graph(
+            next_input, members, group_start, has_audio, encoder
+        )
+        command += ["-filter_complex", graph]
+        next_input += 1
+
+        for (video_label, audio_label), member in zip(labels, members):
+            graph_outputs.append((video_label, audio_label, member[3]))
+
+    for clip_index, (start, duration, subtitles_path, output_path) in enumerate(clips):
+        if clip_index in shared_indices:
+            continue
+
+        burn_path = subtitles_path if burn_in else None
+        copy = _can_stream_copy(video_path, bool(burn_path))
+
+        command += _input_args(
+            video_path,
+            start,
+            duration,
+            CPU_ENCODER if copy else encoder,
+            ffmpeg_threads,
+        )
+        video_index = next_input
+        next_input += 1
+
+        subtitle_index = None
+        if subtitles_path and not burn_in:
+            if not os.path.isfile(subtitles_path):
+                raise FileNotFoundError(f"Subtitles file not found: {subtitles_path}")
+            command += ["-i", str(subtitles_path)]
+            subtitle_index = next_input
+            next_input += 1
+
+        outputs.append((video_index, subtitle_index, copy, burn_path, output_path))
+
+    for video_label, audio_label, output_path in graph_outputs:
+        command += _graph_output_args(
+            video_label, audio_label, output_path, encoder, ffmpeg_threads
+        )
+
+    for video_index, subtitle_index, copy, burn_path, output_path in outputs:
+        if copy:
+            command += _copy_output_args(video_index, output_path, subtitle_index)
+        else:
+            command += _encode_output_args(
+                video_index,
+                _video_filter(burn_path, encoder),
+                output_path,
+                encoder,
+                ffmpeg_threads,
+                subtitle_index,
+            )
+
+    return command
+
+
+def _prepare_batch(
+    video_path: str,
+    segments: List[Dict],
+    subtitles_paths: Optional[List[Optional[str]]],
+) -> Tuple[Path, List[Tuple[float, int, Optional[str], Path]]]:
+    if not os.path.isfile(video_path):
+        raise FileNotFoundError(f"Video not found: {video_path}")
+
+    if subtitles_paths is None:
+        subtitles_paths = [None] * len(segments)
+
+    if len(subtitles_paths) != len(segments):
+        raise ValueError("subtitles_paths must match segments")
+
+    clips = []
+    for segment, subtitles_path in zip(segments, subtitles_paths):
+        start, duration = _clip_bounds(segment)
+        output_path = _OUTPUT_DIR / f"{uuid.uuid4()}.mp4"
+        clips.append((start, duration, subtitles_path, output_path))
+
+    return Path(video_path), clips
+
+
+def _batch_results(
+    clips: List[Tuple[float, int, Optional[str], Path]],
+) -> List[Tuple[str, int]]:
+    results = []
+    for _, duration, _, output_path in clips:
+        if not os.path.isfile(output_path):
+            raise RuntimeError("FFmpeg did not produce output file")
+        results.append((str(output_path), duration))
+    return results
+
+
+# Lower-case stderr fragments that mean the GPU encoder/decoder itself
+# failed (missing device, driver or session), as opposed to bad input,
+# a full disk or a broken filter graph
+_HW_FAILURE_MARKERS = (
+    "nvenc",
+    "cuda",
+    "vaapi",
+    "libva",
+    "videotoolbox",
+    "hwaccel",
+    "hwupload",
+    "device creation failed",
+)
+
+
+def _is_hw_failure(error: RuntimeError, encoder: str) -> bool:
+    if encoder == CPU_ENCODER:
+        return False
+    message = str(error).lower()
+    return any(marker in message for marker in _HW_FAILURE_MARKERS)
+
+
+def _fall_back_to_cpu() -> None:
+    global _ENCODER
+    # The build advertises a GPU encoder but no usable device is present (or the
+    # driver is too old). Stick to the CPU encoder for this process.
+    logger.warning("[FFMPEG] GPU encode failed, falling back to libx264")
+    _ENCODER = CPU_ENCODER
+
+
+def generate_clips_batch(
+    video_path: str,
+    segments: List[Dict],
+    subtitles_paths: Optional[List[Optional[str]]] = None,
+    ffmpeg_threads: Optional[int] = None,
+    burn_in: Optional[bool] = None,
+) -> List[Tuple[str, int]]:
+    """
+    Cut several clips from the same source in a single ffmpeg run,
+    paying process start-up, probing and encoder init only once.
+
+    burn_in defaults to settings.CLIP_BURN_IN_SUBTITLES.
+
+    Returns [(clip_path, duration), ...] in segment order.
+    """
+    if burn_in is None:
+        burn_in = settings.CLIP_BURN_IN_SUBTITLES
+
+    video_path, clips = _prepare_batch(video_path, segments, subtitles_paths)
+    encoder = _get_encoder()
 
     try:
-        subprocess.run(
-            command,
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
+        _run_ffmpeg(
+            _build_batch_command(
+                video_path, clips, encoder, ffmpeg_threads, burn_in
+            )
+        )
+    except RuntimeError as e:
+        # Anything else would fail the same way on libx264
+        if not _is_hw_failure(e, encoder):
+            raise
+        _fall_back_to_cpu()
+        _run_ffmpeg(
+            _build_batch_command(
+                video_path, clips, CPU_ENCODER, ffmpeg_threads, burn_in
+            )
+        )
+
+    return _batch_results(clips)
+
+
+def generate_clip(
+    video_path: str,
+    segment: Dict,
+    subtitles_path: Optional[str] = None,
+    ffmpeg_threads: Optional[int] = None,
+    burn_in: Optional[bool] = None,
+) -> Tuple[str, int]:
+    """
+    ffmpeg_threads caps the encoder's thread count; set it when several
+    clips are encoded in parallel so they don't oversubscribe the CPU.
+
+    burn_in=False muxes the subtitles as a mov_text track instead of
+    rasterising them into the video.
+    """
+    return generate_clips_batch(
+        video_path,
+        [segment],
+        [subtitles_path],
+        ffmpeg_threads=ffmpeg_threads,
+        burn_in=burn_in,
+    )[0]
+
+
+
+# =========================================================
+# ASYNC VARIANTS (for callers running on an event loop)
+# =========================================================
+
+async def _a_run_ffmpeg(command: List[str]) -> None:
+    returncode, stderr_tail = await a_run_with_stderr_tail(command)
+    if returncode != 0:
+        raise RuntimeError("FFmpeg failed:\n" + stderr_tail)
+
+
+async def a_generate_clips_batch(
+    video_path: str,
+    segments: List[Dict],
+    subtitles_paths: Optional[List[Optional[str]]] = None,
+    ffmpeg_threads: Optional[int] = None,
+    burn_in: Optional[bool] = None,
+) -> List[Tuple[str, int]]:
+    """
+    Same as generate_clips_batch, but awaits ffmpeg instead of
+    blocking the calling thread.
+
+    Encoder detection and the ffprobe calls behind _build_batch_command
+    are blocking subprocesses, so they run in a worker thread.
+    """
+    if burn_in is None:
+        burn_in = settings.CLIP_BURN_IN_SUBTITLES
+
+    video_path, clips = _prepare_batch(video_path, segments, subtitles_paths)
+    encoder = await asyncio.to_thread(_get_encoder)
+
+    try:
+        await _a_run_ffmpeg(
+            await asyncio.to_thread(
+                _build_batch_command,
+                video_path, clips, encoder, ffmpeg_threads, burn_in,
+            )
         )
-    except subprocess.CalledProcessError as e:
-        raise RuntimeError(
-            "FFmpeg failed:\n"
-            + e.stderr.decode(errors="ignore")
+    except RuntimeError as e:
+        # Anything else would fail the same way on libx264
+        if not _is_hw_failure(e, encoder):
+            raise
+        _fall_back_to_cpu()
+        await _a_run_ffmpeg(
+            await asyncio.to_thread(
+                _build_batch_command,
+                video_path, clips, CPU_ENCODER, ffmpeg_threads, burn_in,
+            )
         )
 
-    if not output_path.exists():
-        raise RuntimeError("FFmpeg did not produce output file")
+    return _batch_results(clips)
+
 
-    return str(output_path), duration
\ No newline at end of file
+async def a_generate_clip(
+    video_path: str,
+    segment: Dict,
+    subtitles_path: Optional[str] = None,
+    ffmpeg_threads: Optional[int] = None,
+    burn_in: Optional[bool] = None,
+) -> Tuple[str, int]:
+    results = await a_generate_clips_batch(
+        video_path,
+        [segment],
+        [subtitles_path],
+        ffmpeg_threads=ffmpeg_threads,
+        burn_in=burn_in,
+    )
+    return results[0]
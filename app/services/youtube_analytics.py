@@ -1,11 +1,13 @@
-from googleapiclient.discovery import build
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
+from collections import defaultdict
+from itertools import islice
 import time
 
+from app.services.youtube_service import get_youtube_client
 from app.services.database import (
     get_youtube_posts_with_tokens,
-    update_post_engagement,
+    bulk_update_post_engagement,
     update_youtube_tokens,
 )
 
@@ -30,39 +32,71 @@ def refresh_token_if_needed(account):
     return creds
 
 
+# YouTube Data API accepts up to 50 IDs per videos.list call
+VIDEOS_LIST_BATCH_SIZE = 50
+
+
+def _chunked(items, size):
+    it = iter(items)
+    while True:
+        chunk = list(islice(it, size))
+        if not chunk:
+            return
+        yield chunk
+
+
 def fetch_and_update_youtube_stats():
     posts = get_youtube_posts_with_tokens()
 
+    # Group posts by OAuth token so each account gets one client and
+    # its videos are fetched 50 at a time instead of one call per post.
+    posts_by_token = defaultdict(list)
     for post in posts:
+        posts_by_token[(post["access_token"], post["refresh_token"])].append(post)
+
+    for (access_token, refresh_token), token_posts in posts_by_token.items():
         try:
             creds = Credentials(
-                token=post["access_token"],
-                refresh_token=post["refresh_token"],
+                token=access_token,
+                refresh_token=refresh_token,
                 token_uri="https://oauth2.googleapis.com/token",
             )
 
-            youtube = build("youtube", "v3", credentials=creds)
+            youtube = get_youtube_client(creds)
+        except Exception as e:
+            print(f"Failed to build YouTube client for {len(token_posts)} posts: {e}")
+            continue
 
-            response = youtube.videos().list(
-                part="statistics",
-                id=post["video_id"]
-            ).execute()
+        video_ids = list(dict.fromkeys(post["video_id"] for post in token_posts))
+        stats_by_video = {}
 
-            if not response["items"]:
+        for chunk in _chunked(video_ids, VIDEOS_LIST_BATCH_SIZE):
+            try:
+                response = youtube.videos().list(
+                    part="statistics",
+                    id=",".join(chunk),
+                ).execute()
+            except Exception as e:
+                print(f"Failed to fetch stats for videos {chunk}: {e}")
                 continue
 
-            stats = response["items"][0]["statistics"]
+            for item in response.get("items", []):
+                stats_by_video[item["id"]] = item["statistics"]
 
-            likes = int(stats.get("likeCount", 0))
-            comments = int(stats.get("commentCount", 0))
-            views = int(stats.get("viewCount", 0))
+        rows = []
+        for post in token_posts:
+            stats = stats_by_video.get(post["video_id"])
+            if not stats:
+                continue
 
-            update_post_engagement(
-                post_id=post["post_id"],
-                likes=likes,
-                comments=comments,
-                views=views,
-            )
+            rows.append((
+                post["post_id"],
+                int(stats.get("likeCount", 0)),
+                int(stats.get("commentCount", 0)),
+                int(stats.get("viewCount", 0)),
+            ))
 
+        try:
+            bulk_update_post_engagement(rows)
         except Exception as e:
-            print(f"Failed to update stats for post {post['post_id']}: {e}")
+            print(f"Failed to update stats for {len(rows)} posts: {e}")
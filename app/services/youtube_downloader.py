@@ -5,24 +5,125 @@ Responsibilities:
 - Accept either a local file path OR a YouTube URL
 - Download YouTube videos using yt-dlp
 - Return a local file path usable by FFmpeg / Whisper
+- Reuse previous downloads of the same video (LRU-evicted disk cache)
 
 """
 
+import asyncio
+import hashlib
+import logging
 import os
 import re
-import subprocess
-import uuid
+import shutil
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
 
 from app.config import settings
+from app.utils.process import a_run_with_stderr_tail, run_with_stderr_tail
 
 
+logger = logging.getLogger("youtube_downloader")
+logger.setLevel(logging.INFO)
+
+
+_YTDLP_BIN = shutil.which("yt-dlp") or "yt-dlp"
+
+VIDEO_CACHE_DIR = Path(settings.MEDIA_ROOT) / "videos"
+
+# One machine-readable line per yt-dlp progress update (with --newline)
+_PROGRESS_TEMPLATE = (
+    "download:[progress] %(progress.downloaded_bytes)s "
+    "%(progress.total_bytes)s %(progress.total_bytes_estimate)s"
+)
+
 YOUTUBE_REGEX = re.compile(
-    r"(https?://)?(www\.)?(youtube\.com|youtu\.be)/"
+    r"(https?://)?(www\.)?(youtube\.com|youtu\.be)/",
+    re.ASCII,
 )
 
+# Anything YOUTUBE_REGEX can match starts with one of these
+_YOUTUBE_PREFIXES = ("http://", "https://", "www.", "youtube.com/", "youtu.be/")
+
 
 def is_youtube_url(value: str) -> bool:
-    return bool(YOUTUBE_REGEX.match(value))
+    # Cheap prefix check first so local paths never hit the regex
+    return value.startswith(_YOUTUBE_PREFIXES) and YOUTUBE_REGEX.match(value) is not None
+
+
+# Video ids are 11 chars of the URL-safe base64 alphabet; anything else
+# is rejected so a crafted URL can never become a path component.
+_VIDEO_ID_REGEX = re.compile(r"[A-Za-z0-9_-]{11}", re.ASCII)
+
+
+def extract_youtube_video_id(url: str) -> Optional[str]:
+    """
+    Video id from any of the URL shapes of one video (youtu.be, shorts,
+    embed, watch with extra query params, ...), or None.
+    """
+    if "://" not in url:
+        url = "https://" + url
+
+    parsed = urlparse(url)
+    host = parsed.netloc.lower()
+    path_parts = [p for p in parsed.path.split("/") if p]
+
+    video_id = None
+    if host.endswith("youtu.be") and path_parts:
+        video_id = path_parts[0]
+    elif parsed.path == "/watch":
+        video_id = (parse_qs(parsed.query).get("v") or [None])[0]
+    elif len(path_parts) >= 2 and path_parts[0] in ("shorts", "embed", "live", "v"):
+        video_id = path_parts[1]
+
+    if not video_id or not _VIDEO_ID_REGEX.fullmatch(video_id):
+        return None
+
+    return video_id
+
+
+def _cache_path_for(url: str) -> Path:
+    # The content behind a video id never changes, so the id itself is
+    # the cache key; unrecognised URL shapes fall back to a URL hash.
+    cache_key = extract_youtube_video_id(url) or hashlib.sha1(
+        url.strip().encode("utf-8")
+    ).hexdigest()
+    return VIDEO_CACHE_DIR / f"{cache_key}.mp4"
+
+
+def evict_video_cache(keep: Optional[Path] = None) -> None:
+    """
+    Drop least recently used downloads until the cache fits
+    within VIDEO_CACHE_MAX_GB. `keep` is never evicted.
+    """
+    if not VIDEO_CACHE_DIR.is_dir():
+        return
+
+    max_bytes = int(settings.VIDEO_CACHE_MAX_GB * (1 << 30))
+
+    entries = []
+    total = 0
+    for entry in os.scandir(VIDEO_CACHE_DIR):
+        if not entry.is_file() or not entry.name.endswith(".mp4"):
+            continue
+        stat = entry.stat()
+        total += stat.st_size
+        entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    if total <= max_bytes:
+        return
+
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        if keep is not None and path == str(keep):
+            continue
+        try:
+            os.remove(path)
+            total -= size
+            logger.info(f"[VIDEO CACHE] Evicted {path}")
+        except OSError:
+            pass
 
 
 def download_youtube_video(source: str) -> str:
@@ -32,42 +133,114 @@ def download_youtube_video(source: str) -> str:
     - YouTube URL → download and return local path
     """
 
+    output_path, command = _plan_download(source)
+    if command is None:
+        return output_path
+
+    returncode, stderr_tail = run_with_stderr_tail(command)
+    return _finish_download(output_path, returncode, stderr_tail)
+
+
+async def a_download_youtube_video(
+    source: str,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> str:
+    """
+    Same as download_youtube_video, but awaits yt-dlp instead of
+    blocking the calling thread.
+
+    progress_callback(bytes_done, bytes_total) is called from the event
+    loop as yt-dlp reports progress; it is never called for local files
+    or cache hits.
+    """
+    output_path, command = _plan_download(source)
+    if command is None:
+        return output_path
+
+    on_stdout_line = None
+    if progress_callback is not None:
+        command = command[:-1] + [
+            "--newline",
+            "--progress-template", _PROGRESS_TEMPLATE,
+            command[-1],
+        ]
+
+        def _report_progress(line: bytes) -> None:
+            progress = _parse_progress_line(line)
+            if progress is not None:
+                progress_callback(*progress)
+
+        on_stdout_line = _report_progress
+
+    returncode, stderr_tail = await a_run_with_stderr_tail(
+        command, on_stdout_line=on_stdout_line
+    )
+    # Cache eviction walks the cache directory; keep it off the loop
+    return await asyncio.to_thread(_finish_download, output_path, returncode, stderr_tail)
+
+
+def _parse_progress_line(line: bytes) -> Optional[Tuple[int, int]]:
+    """
+    (bytes_done, bytes_total) from a line printed with _PROGRESS_TEMPLATE.
+    total falls back to yt-dlp's estimate; None for anything else.
+    """
+    parts = line.decode(errors="ignore").split()
+    if len(parts) != 4 or parts[0] != "[progress]":
+        return None
+
+    def _to_int(value: str) -> Optional[int]:
+        try:
+            return int(float(value))
+        except ValueError:  # "NA"
+            return None
+
+    done = _to_int(parts[1])
+    total = _to_int(parts[2]) or _to_int(parts[3])
+    if done is None or not total:
+        return None
+
+    return done, total
+
+
+def _plan_download(source: str) -> Tuple[str, Optional[List[str]]]:
+    """
+    Returns (path, None) when no download is needed, otherwise
+    (target path, yt-dlp command).
+    """
+
     # Local upload → skip download
     if os.path.exists(source):
-        return source
+        return source, None
 
     # Must be YouTube
     if not is_youtube_url(source):
         raise ValueError("Invalid video source: not a file or YouTube URL")
 
-    output_dir = settings.MEDIA_ROOT + "/videos"
-    os.makedirs(output_dir, exist_ok=True)
+    VIDEO_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    output_path = str(_cache_path_for(source))
 
-    output_path = os.path.join(
-        output_dir,
-        f"{uuid.uuid4()}.mp4"
-    )
+    # Cache hit: bump mtime so LRU eviction sees it as recently used
+    if os.path.exists(output_path) and os.path.getsize(output_path) > 0:
+        os.utime(output_path)
+        return output_path, None
 
     command = [
-        "yt-dlp",
+        _YTDLP_BIN,
         "-f", "mp4",
         "-o", output_path,
         source,
     ]
 
-    try:
-        subprocess.run(
-            command,
-            check=True,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
-    except subprocess.CalledProcessError as e:
-        raise RuntimeError(
-            f"YouTube download failed: {e.stderr.decode()}"
-        )
+    return output_path, command
+
+
+def _finish_download(output_path: str, returncode: int, stderr_tail: str) -> str:
+    if returncode != 0:
+        raise RuntimeError(f"YouTube download failed: {stderr_tail}")
 
     if not os.path.exists(output_path):
         raise RuntimeError("YouTube download did not produce a file")
 
+    evict_video_cache(keep=Path(output_path))
+
     return output_path
@@ -9,9 +9,15 @@ LOGIC:
 """
 
 import logging
+import random
+import threading
+import time
+from collections import OrderedDict
 from typing import Union
 
-from googleapiclient.discovery import build
+from googleapiclient.discovery import build, build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaFileUpload
 from google.oauth2.credentials import Credentials
 
@@ -19,6 +25,71 @@ logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
 
+# Resumable upload tuning
+UPLOAD_CHUNK_SIZE = 256 * 1024 * 1024
+UPLOAD_MAX_RETRIES = 5
+RETRIABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+# =========================================================
+# CLIENT CACHE
+# =========================================================
+
+# build() parses the discovery document and generates resource classes on
+# every call; keep recently built clients keyed by the token they carry.
+# Each client wraps an httplib2.Http, which is not thread-safe, so the
+# cache is per thread (FastAPI threadpool, Celery threads).
+_CLIENT_CACHE_SIZE = 32  # per thread
+_local = threading.local()
+
+
+def _thread_client_cache() -> "OrderedDict[tuple, object]":
+    cache = getattr(_local, "clients", None)
+    if cache is None:
+        cache = _local.clients = OrderedDict()
+    return cache
+
+
+# The discovery document ships with google-api-python-client; read it once
+# per process instead of letting every build() load (or fetch) it again.
+_DISCOVERY_DOC = get_static_doc("youtube", "v3")
+
+
+def _build_client(credentials: Credentials):
+    if _DISCOVERY_DOC:
+        return build_from_document(_DISCOVERY_DOC, credentials=credentials)
+
+    return build(
+        "youtube",
+        "v3",
+        credentials=credentials,
+        cache_discovery=False,
+        static_discovery=True,
+    )
+
+
+def get_youtube_client(credentials: Credentials):
+    """
+    Return a YouTube Data API client for these credentials,
+    reusing one this thread built earlier when the token is unchanged.
+    """
+    key = (credentials.client_id, credentials.token)
+    cache = _thread_client_cache()
+
+    client = cache.get(key)
+    if client is not None:
+        cache.move_to_end(key)
+        return client
+
+    client = _build_client(credentials)
+
+    cache[key] = client
+    while len(cache) > _CLIENT_CACHE_SIZE:
+        cache.popitem(last=False)
+
+    return client
+
+
 class YouTubeService:
     def __init__(self, credentials: Union[Credentials, dict]):
         """
@@ -52,12 +123,7 @@ class YouTubeService:
                 "YouTubeService credentials must be a Credentials object or dict"
             )
 
-        self.youtube = build(
-            "youtube",
-            "v3",
-            credentials=self.credentials,
-            cache_discovery=False,
-        )
+        self.youtube = get_youtube_client(self.credentials)
 
     def upload_video(
         self,
@@ -89,12 +155,13 @@ class YouTubeService:
             },
             media_body=MediaFileUpload(
                 video_file,
-                chunksize=-1,
+                chunksize=UPLOAD_CHUNK_SIZE,
                 resumable=True,
+                mimetype="video/mp4",
             ),
         )
 
-        response = request.execute()
+        response = self._execute_resumable(request)
         video_id = response.get("id")
 
         if not video_id:
@@ -107,3 +174,32 @@ class YouTubeService:
             "raw_response": response,
         }
 
+
+    def _execute_resumable(self, request):
+        """
+        Drive a resumable upload chunk by chunk. Transient errors
+        (429/5xx) retry only the current chunk, with exponential backoff.
+        """
+        response = None
+        retries = 0
+
+        while response is None:
+            try:
+                status, response = request.next_chunk()
+                retries = 0
+                if status:
+                    logger.info(f"YouTube upload progress: {int(status.progress() * 100)}%")
+            except HttpError as e:
+                if e.resp.status not in RETRIABLE_STATUS_CODES:
+                    raise
+                retries += 1
+                if retries > UPLOAD_MAX_RETRIES:
+                    raise
+                delay = (2 ** retries) + random.random()
+                logger.warning(
+                    f"YouTube upload chunk failed ({e.resp.status}), "
+                    f"retrying in {delay:.1f}s ({retries}/{UPLOAD_MAX_RETRIES})"
+                )
+                time.sleep(delay)
+
+        return response
@@ -1,6 +1,8 @@
 import os
 import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, timezone
+from typing import Optional, Tuple
 
 from google.oauth2.credentials import Credentials
 from google.auth.transport.requests import Request
@@ -19,6 +21,44 @@ YOUTUBE_CLIENT_SECRET = os.getenv("YOUTUBE_CLIENT_SECRET")
 TOKEN_URI = "https://oauth2.googleapis.com/token"
 
 
+MAX_REFRESH_WORKERS = 32
+
+
+def _refresh_one(account) -> Tuple[int, Optional[Credentials], Optional[Exception]]:
+    """
+    Refresh a single account's credentials.
+
+    Returns (account_id, creds, error). creds is None when no refresh
+    was needed or possible.
+    """
+    account_id = account["account_id"]
+
+    try:
+        creds = Credentials(
+            token=account["access_token"],
+            refresh_token=account["refresh_token"],
+            token_uri=TOKEN_URI,
+            client_id=YOUTUBE_CLIENT_ID,
+            client_secret=YOUTUBE_CLIENT_SECRET,
+        )
+
+        # Skip if token is still valid
+        if creds.expiry and creds.expiry.replace(tzinfo=timezone.utc) > datetime.now(timezone.utc):
+            return account_id, None, None
+
+        if not creds.refresh_token:
+            logger.warning(
+                f"[YT TOKEN] Account {account_id} has no refresh token – skipping"
+            )
+            return account_id, None, None
+
+        creds.refresh(Request())
+        return account_id, creds, None
+
+    except Exception as e:
+        return account_id, None, e
+
+
 def refresh_all_youtube_tokens():
     """
     Refresh OAuth tokens for all connected YouTube accounts.
@@ -35,41 +75,35 @@ def refresh_all_youtube_tokens():
         logger.info("[YT TOKEN] No YouTube accounts found")
         return
 
-    for account in accounts:
-        account_id = account["account_id"]
+    max_workers = min(MAX_REFRESH_WORKERS, len(accounts))
 
-        try:
-            creds = Credentials(
-                token=account["access_token"],
-                refresh_token=account["refresh_token"],
-                token_uri=TOKEN_URI,
-                client_id=YOUTUBE_CLIENT_ID,
-                client_secret=YOUTUBE_CLIENT_SECRET,
-            )
+    # Refreshes are independent HTTPS round-trips to Google; run them
+    # concurrently and keep the DB writes on this thread.
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(_refresh_one, account) for account in accounts]
 
-            # Skip if token is still valid
-            if creds.expiry and creds.expiry.replace(tzinfo=timezone.utc) > datetime.now(timezone.utc):
-                continue
+        for future in as_completed(futures):
+            account_id, creds, error = future.result()
 
-            if not creds.refresh_token:
-                logger.warning(
-                    f"[YT TOKEN] Account {account_id} has no refresh token – skipping"
+            if error is not None:
+                # Raised on a pool thread; pass it along to keep the traceback
+                logger.error(
+                    f"[YT TOKEN] Failed to refresh tokens for account {account_id}: {error}",
+                    exc_info=error,
                 )
                 continue
 
-            creds.refresh(Request())
-
-            expires_at = int(creds.expiry.timestamp())
-
-            update_youtube_tokens(
-                account_id=account_id,
-                access_token=creds.token,
-                expires_at=expires_at,
-            )
-
-            logger.info(f"[YT TOKEN] Refreshed tokens for account {account_id}")
+            if creds is None:
+                continue
 
-        except Exception as e:
-            logger.exception(
-                f"[YT TOKEN] Failed to refresh tokens for account {account_id}: {e}"
-            )
+            try:
+                update_youtube_tokens(
+                    account_id=account_id,
+                    access_token=creds.token,
+                    expires_at=int(creds.expiry.timestamp()),
+                )
+                logger.info(f"[YT TOKEN] Refreshed tokens for account {account_id}")
+            except Exception as e:
+                logger.exception(
+                    f"[YT TOKEN] Failed to store tokens for account {account_id}: {e}"
+                )
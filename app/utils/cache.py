@@ -0,0 +1,60 @@
+"""
+In-process TTL cache.
+
+Used for:
+- Read-mostly database rows (subscription plans, admin flags)
+- Anything where a few seconds/minutes of staleness is acceptable
+  and the source of truth is a round-trip away
+"""
+
+import threading
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Thread-safe dict whose entries expire ttl_seconds after being set.
+
+    Invalidation is per process: other workers keep their copy until it
+    expires, so pick the TTL as the maximum tolerable staleness.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            if len(self._entries) >= self.max_entries and key not in self._entries:
+                self._purge_expired()
+                if len(self._entries) >= self.max_entries:
+                    # Still full: drop the oldest insertion
+                    self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def _purge_expired(self) -> None:
+        now = time.monotonic()
+        for key in [k for k, (_, expires_at) in self._entries.items() if expires_at <= now]:
+            del self._entries[key]
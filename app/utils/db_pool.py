@@ -0,0 +1,63 @@
+"""
+psycopg2 connection pooling helpers.
+
+Used for:
+- Sharing a bounded set of Postgres connections between threads
+- Keeping connections open between checkouts without opening them
+  all up front
+- Running hot queries as per-connection PREPAREd statements
+"""
+
+import psycopg2.extensions
+from psycopg2 import pool
+
+
+class RetainingConnectionPool(pool.ThreadedConnectionPool):
+    """
+    ThreadedConnectionPool that keeps every returned connection.
+
+    psycopg2 closes a connection handed back while more than `minconn`
+    are idle, so a pool with a small minconn reconnects on most
+    checkouts. This pool opens connections on demand (only `minconn`
+    at start) but retains up to `maxconn` of them.
+    """
+
+    def _putconn(self, conn, key=None, close=False):
+        # Called with the pool lock held (ThreadedConnectionPool.putconn)
+        minconn, self.minconn = self.minconn, self.maxconn
+        try:
+            super()._putconn(conn, key, close)
+        finally:
+            self.minconn = minconn
+
+
+class PreparingConnection(psycopg2.extensions.connection):
+    """Pooled connection that remembers which statements it has PREPAREd."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+
+
+def execute_prepared(cur, statements: dict, name: str, params: tuple) -> None:
+    """
+    Run statements[name] = (arg_types, query) as a prepared statement.
+
+    The query uses %s placeholders, one per entry in arg_types. It is
+    PREPAREd the first time a connection runs it and EXECUTEd from then
+    on, skipping parse and plan. Connections that aren't
+    PreparingConnection (e.g. init scripts) run the query plainly.
+    """
+    arg_types, query = statements[name]
+    prepared = getattr(cur.connection, "prepared", None)
+
+    if prepared is None:
+        cur.execute(query, params)
+        return
+
+    if name not in prepared:
+        placeholders = tuple(f"${i}" for i in range(1, len(arg_types) + 1))
+        cur.execute(f"PREPARE {name} ({', '.join(arg_types)}) AS {query % placeholders}")
+        prepared.add(name)
+
+    cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
@@ -2,13 +2,99 @@ import os
 import time
 import redis
 import logging
+import threading
 import uuid
+from functools import lru_cache
+
+from celery.signals import worker_process_init
 
 logger = logging.getLogger(__name__)
 
 # Use REDIS_URL from environment (db 0 for managed Redis compatibility)
 _redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-redis_client = redis.from_url(_redis_url, decode_responses=True)
+
+# Longest a waiter blocks between retries when no release is published
+EXPIRY_RECHECK_SECONDS = 5
+
+# Compare-and-delete in one round trip: never deletes a lock that has
+# since expired and been taken by another worker. Wakes waiters on success.
+_RELEASE_LUA = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    redis.call('del', KEYS[1])
+    redis.call('publish', ARGV[2], '1')
+    return 1
+end
+return 0
+"""
+
+
+# --------------------------------------------------
+# PER-PROCESS CLIENT
+# --------------------------------------------------
+# Nothing connects at import time: a pre-forking Celery parent would
+# otherwise hand its sockets to every child. Each process builds its own
+# pool on first use, keyed by PID.
+
+@lru_cache(maxsize=None)
+def _pool_for_pid(pid: int) -> redis.BlockingConnectionPool:
+    # Bounded pool shared by every thread in the process: callers wait for
+    # a free connection instead of opening new ones during lock bursts. A
+    # waiter in acquire() holds one connection for its pub/sub subscription.
+    return redis.BlockingConnectionPool.from_url(
+        _redis_url,
+        max_connections=int(os.getenv("LOCK_REDIS_POOL_SIZE", "16")),
+        timeout=10,
+        socket_keepalive=True,
+        socket_timeout=2,
+        health_check_interval=30,
+        decode_responses=True,
+    )
+
+
+@lru_cache(maxsize=None)
+def _client_for_pid(pid: int) -> redis.Redis:
+    return redis.Redis(connection_pool=_pool_for_pid(pid))
+
+
+@lru_cache(maxsize=None)
+def _release_script_for_pid(pid: int):
+    return _client_for_pid(pid).register_script(_RELEASE_LUA)
+
+
+def _client() -> redis.Redis:
+    return _client_for_pid(os.getpid())
+
+
+def get_redis_client() -> redis.Redis:
+    """Redis client for the current process (connects on first use)."""
+    return _client()
+
+
+@worker_process_init.connect
+def _reset_redis_clients(**kwargs):
+    # Drop anything inherited from the parent; the child's first call
+    # builds a fresh pool. The parent's sockets are left untouched.
+    _release_script_for_pid.cache_clear()
+    _client_for_pid.cache_clear()
+    _pool_for_pid.cache_clear()
+
+
+# Locks held by the current thread: key -> [lock_value, depth]. A nested
+# acquire of a lock this thread already holds is answered locally, and
+# only the outermost release goes to Redis.
+_local = threading.local()
+
+
+def _owned() -> dict:
+    owned = getattr(_local, "owned", None)
+    if owned is None:
+        owned = _local.owned = {}
+    return owned
+
+
+def _pool_exhausted(exc: redis.RedisError) -> bool:
+    # BlockingConnectionPool's timeout, as opposed to a real connection failure
+    return isinstance(exc, redis.ConnectionError) and "No connection available" in str(exc)
 
 
 class InstagramAccountLock:
@@ -22,39 +108,88 @@ class InstagramAccountLock:
         self.key = f"instagram:lock:{account_id}"
         self.ttl_seconds = ttl_seconds
         self.lock_value = str(uuid.uuid4())
+        self.release_channel = f"{self.key}:released"
+
+    def _try_set(self) -> bool:
+        acquired = bool(
+            _client().set(
+                self.key,
+                self.lock_value,
+                nx=True,
+                ex=self.ttl_seconds,
+            )
+        )
+        if acquired:
+            _owned()[self.key] = [self.lock_value, 1]
+        return acquired
 
     def acquire(self, wait_seconds: int = 30) -> bool:
         """
         Try to acquire the lock, waiting up to wait_seconds.
+
+        Instead of polling, waits on the lock's "released" channel and
+        retries as soon as the holder publishes a release.
         """
-        start = time.time()
-
-        while time.time() - start < wait_seconds:
-            try:
-                acquired = redis_client.set(
-                    self.key,
-                    self.lock_value,
-                    nx=True,
-                    ex=self.ttl_seconds,
+        held = _owned().get(self.key)
+        if held is not None:
+            # Re-entry on this thread: share the outer holder's value
+            held[1] += 1
+            self.lock_value = held[0]
+            return True
+
+        deadline = time.monotonic() + wait_seconds
+        pubsub = None
+
+        try:
+            if self._try_set():
+                logger.info(
+                    "Instagram lock acquired for account %s", self.account_id
                 )
+                return True
 
-                if acquired:
+            pubsub = _client().pubsub(ignore_subscribe_messages=True)
+            pubsub.subscribe(self.release_channel)
+
+            while True:
+                # Retry after subscribing too, so a release that happened
+                # in between isn't missed
+                if self._try_set():
                     logger.info(
-                        f"Instagram lock acquired for account {self.account_id}"
+                        "Instagram lock acquired for account %s", self.account_id
                     )
                     return True
 
-            except redis.RedisError as exc:
-                logger.error(
-                    f"Redis error while acquiring Instagram lock: {exc}"
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+
+                # Expiry (a crashed holder) publishes nothing; cap the wait
+                pubsub.get_message(timeout=min(remaining, EXPIRY_RECHECK_SECONDS))
+
+        except redis.RedisError as exc:
+            if _pool_exhausted(exc):
+                # Redis is fine, just busy with other waiters: this is
+                # contention, exactly when the lock matters. Don't fail open.
+                logger.warning(
+                    "Lock pool exhausted while waiting for account %s", self.account_id
                 )
-                # Fail open to avoid total posting blockage
-                return True
+                return False
+
+            logger.error(
+                "Redis error while acquiring Instagram lock: %s", exc
+            )
+            # Fail open to avoid total posting blockage
+            return True
 
-            time.sleep(1)
+        finally:
+            if pubsub is not None:
+                try:
+                    pubsub.close()
+                except redis.RedisError:
+                    pass
 
         logger.warning(
-            f"Failed to acquire Instagram lock for account {self.account_id}"
+            "Failed to acquire Instagram lock for account %s", self.account_id
         )
         return False
 
@@ -62,20 +197,33 @@ class InstagramAccountLock:
         """
         Release the lock safely (only if owned by this worker).
         """
+        owned = _owned()
+        held = owned.get(self.key)
+        if held is None:
+            # Never set by this thread (e.g. acquire() failed open)
+            return
+
+        held[1] -= 1
+        if held[1] > 0:
+            return
+        del owned[self.key]
+
         try:
-            current_value = redis_client.get(self.key)
+            released = _release_script_for_pid(os.getpid())(
+                keys=[self.key],
+                args=[self.lock_value, self.release_channel],
+            )
 
-            if current_value == self.lock_value:
-                redis_client.delete(self.key)
+            if released:
                 logger.info(
-                    f"Instagram lock released for account {self.account_id}"
+                    "Instagram lock released for account %s", self.account_id
                 )
             else:
                 logger.warning(
-                    f"Lock ownership mismatch for account {self.account_id}, not releasing"
+                    "Lock ownership mismatch for account %s, not releasing", self.account_id
                 )
 
         except redis.RedisError as exc:
             logger.error(
-                f"Redis error while releasing Instagram lock: {exc}"
+                "Redis error while releasing Instagram lock: %s", exc
             )
@@ -9,30 +9,48 @@ Used by:
 Import this module once at startup to configure logging globally.
 """
 
+import atexit
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
 
+DEFAULT_FORMAT = "[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s"
 
-def setup_logging(level: int = logging.INFO):
+_listener: Optional[QueueListener] = None
+
+
+def setup_logging(level: int = logging.INFO, fmt: str = DEFAULT_FORMAT):
     """
     Configure root logger.
 
     Call this early (FastAPI startup, worker startup).
-    """
 
-    formatter = logging.Formatter(
-        "[%(asctime)s] [%(levelname)s] [%(name)s] %(message)s"
-    )
-
-    handler = logging.StreamHandler(sys.stdout)
-    handler.setFormatter(formatter)
+    Log calls only enqueue the record; a background listener thread
+    formats it and writes to stdout, so threads logging at the same
+    time don't serialize on the stream handler's lock and write().
+    """
+    global _listener
 
     root_logger = logging.getLogger()
     root_logger.setLevel(level)
 
     # Prevent duplicate handlers
-    if not root_logger.handlers:
-        root_logger.addHandler(handler)
+    if root_logger.handlers:
+        return
+
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter(fmt))
+
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(QueueHandler(log_queue))
+
+    _listener = QueueListener(log_queue, handler, respect_handler_level=True)
+    _listener.start()
+
+    # Flush what's still queued on interpreter exit
+    atexit.register(_listener.stop)
 
 
 def get_logger(name: str) -> logging.Logger:
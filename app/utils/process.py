@@ -0,0 +1,109 @@
+"""
+Subprocess helpers for long-running CLI tools (ffmpeg, yt-dlp).
+
+Used for:
+- Running a command without buffering its whole stderr in memory
+- Keeping only the last lines of stderr for error reporting
+- Awaiting commands from asyncio code without blocking the loop
+"""
+
+import asyncio
+import subprocess
+import threading
+from collections import deque
+from typing import Callable, List, Optional, Tuple
+
+
+STDERR_TAIL_LINES = 200
+PIPE_BUFSIZE = 1 << 20
+
+
+def run_with_stderr_tail(
+    command: List[str],
+    tail_lines: int = STDERR_TAIL_LINES,
+) -> Tuple[int, str]:
+    """
+    Run a command to completion, discarding stdout.
+
+    stderr is drained continuously by a reader thread (so the child never
+    blocks on a full pipe) into a bounded ring buffer.
+
+    Returns (returncode, last `tail_lines` lines of stderr).
+    """
+
+    tail: deque = deque(maxlen=tail_lines)
+
+    process = subprocess.Popen(
+        command,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        bufsize=PIPE_BUFSIZE,
+    )
+
+    def _drain():
+        for line in process.stderr:
+            tail.append(line)
+
+    reader = threading.Thread(target=_drain, daemon=True)
+    reader.start()
+
+    returncode = process.wait()
+    reader.join()
+    process.stderr.close()
+
+    return returncode, b"".join(tail).decode(errors="ignore")
+
+
+async def a_run_with_stderr_tail(
+    command: List[str],
+    tail_lines: int = STDERR_TAIL_LINES,
+    on_stdout_line: Optional[Callable[[bytes], None]] = None,
+) -> Tuple[int, str]:
+    """
+    asyncio counterpart of run_with_stderr_tail.
+
+    When on_stdout_line is given, stdout is read line by line and each
+    line is handed to it (e.g. to parse progress output); otherwise
+    stdout is discarded. The child is killed if the caller is cancelled.
+    """
+
+    tail: deque = deque(maxlen=tail_lines)
+
+    process = await asyncio.create_subprocess_exec(
+        *command,
+        stdout=asyncio.subprocess.PIPE if on_stdout_line else asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+        limit=PIPE_BUFSIZE,
+    )
+
+    async def _drain_stderr():
+        while True:
+            line = await process.stderr.readline()
+            if not line:
+                break
+            tail.append(line)
+
+    async def _drain_stdout():
+        while True:
+            line = await process.stdout.readline()
+            if not line:
+                break
+            on_stdout_line(line)
+
+    try:
+        if on_stdout_line:
+            await asyncio.gather(_drain_stderr(), _drain_stdout())
+        else:
+            await _drain_stderr()
+
+        returncode = await process.wait()
+    finally:
+        # Cancelled or failed mid-run: don't leave the child running
+        if process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError:
+                pass
+            await process.wait()
+
+    return returncode, b"".join(tail).decode(errors="ignore")
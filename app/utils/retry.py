@@ -6,6 +6,7 @@ Used for:
 - Simple fault tolerance where Celery is not involved
 """
 
+import random
 import time
 from typing import Callable, Type, Tuple
 
@@ -14,10 +15,19 @@ def retry(
     func: Callable,
     retries: int = 3,
     delay: float = 1.0,
+    max_delay: float = 30.0,
+    backoff: float = 2.0,
+    jitter: bool = True,
     exceptions: Tuple[Type[Exception], ...] = (Exception,),
+    dont_retry: Tuple[Type[Exception], ...] = (),
 ):
     """
-    Retry a function call.
+    Retry a function call with exponential backoff.
+
+    The wait after attempt n is delay * backoff**(n-1), plus up to the
+    same again as random jitter (so callers failing together don't retry
+    together), capped at max_delay. Exceptions matching dont_retry are
+    raised immediately even if they also match exceptions.
 
     Example:
         result = retry(lambda: risky_call(), retries=5, delay=2)
@@ -29,8 +39,13 @@ def retry(
         try:
             return func()
         except exceptions as exc:
+            if dont_retry and isinstance(exc, dont_retry):
+                raise
             last_exception = exc
             if attempt < retries:
-                time.sleep(delay)
+                wait = delay * backoff ** (attempt - 1)
+                if jitter:
+                    wait += random.uniform(0, wait)
+                time.sleep(min(max_delay, wait))
 
     raise last_exception
@@ -0,0 +1,77 @@
+"""
+Scheduler wake-up signal (Redis list).
+
+Used for:
+- Waking the scheduler as soon as a post is created or rescheduled,
+  instead of waiting for its next timed poll
+- Letting the scheduler sleep until the next due post otherwise
+"""
+
+import logging
+import os
+from typing import Optional
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+WAKEUP_KEY = "scheduler:wakeup"
+
+# Longest single BLPOP; longer waits are cut to this (callers loop anyway).
+# Above the scheduler's max_wait so its idle sleep isn't shortened.
+MAX_BLOCK_SECONDS = 600
+
+_redis_url = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Used from request handlers: a stalled Redis must not hang the request
+_notify_client = redis.from_url(
+    _redis_url,
+    socket_connect_timeout=2,
+    socket_timeout=2,
+    decode_responses=True,
+)
+
+# Scheduler only. Its socket timeout must outlast the longest BLPOP,
+# which the lock client's 2s timeout would cut off
+_wait_client = redis.from_url(
+    _redis_url,
+    socket_connect_timeout=5,
+    socket_timeout=MAX_BLOCK_SECONDS + 30,
+    decode_responses=True,
+)
+
+
+def notify_scheduler() -> None:
+    """
+    Wake the scheduler. Best effort: if Redis is down the scheduler
+    still picks the change up on its fallback poll.
+    """
+    try:
+        pipe = _notify_client.pipeline(transaction=False)
+        pipe.lpush(WAKEUP_KEY, "1")
+        # Any number of pending wake-ups collapse into one
+        pipe.ltrim(WAKEUP_KEY, 0, 0)
+        pipe.execute()
+    except redis.RedisError as exc:
+        logger.warning("Could not notify scheduler: %s", exc)
+
+
+def wait_for_wakeup(timeout: float) -> Optional[bool]:
+    """
+    Block up to `timeout` seconds (at most MAX_BLOCK_SECONDS) for a
+    notify_scheduler() call.
+
+    Returns True when woken, False on timeout, None when Redis failed
+    (the caller should then sleep on its own).
+    """
+    try:
+        # BLPOP takes whole seconds; 0 would mean "forever"
+        woken = _wait_client.blpop(
+            [WAKEUP_KEY],
+            timeout=min(MAX_BLOCK_SECONDS, max(1, int(timeout))),
+        )
+    except redis.RedisError as exc:
+        logger.warning("Scheduler wake-up wait failed: %s", exc)
+        return None
+
+    return woken is not None
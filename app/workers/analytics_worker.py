@@ -6,8 +6,8 @@ LOGIC:
 - Updates likes, views, comments
 """
 
-import time
 import logging
+import threading
 
 from app.services.youtube_analytics import fetch_and_update_youtube_stats
 
@@ -19,9 +19,11 @@ class AnalyticsWorker:
     def __init__(self, interval_seconds: int = 600):
         self.interval = interval_seconds
         self.running = False
+        self._stop_event = threading.Event()
 
     def start(self):
         self.running = True
+        self._stop_event.clear()
         logger.info("[ANALYTICS] Worker started")
 
         while self.running:
@@ -33,8 +35,11 @@ class AnalyticsWorker:
             except Exception as e:
                 logger.exception(f"[ANALYTICS] Error refreshing stats: {e}")
 
-            time.sleep(self.interval)
+            # Returns early as soon as stop() is called
+            if self._stop_event.wait(timeout=self.interval):
+                break
 
     def stop(self):
         self.running = False
+        self._stop_event.set()
         logger.info("[ANALYTICS] Worker stopped")
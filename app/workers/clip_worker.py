@@ -6,16 +6,37 @@ Responsibilities:
 - Support both API-triggered and DB-backed jobs
 """
 
-import traceback
+import asyncio
+import logging
+import threading
+import time
 import uuid
 import os
-from typing import Optional, List, Dict
+import weakref
+from bisect import bisect_right
+from typing import Callable, Optional, List, Dict, Tuple
 
-from app.services.youtube_downloader import download_youtube_video
-from app.services.transcription import transcribe_video
-from app.services.clip_ai import select_segments
-from app.services.video_processing import generate_clip
-from app.services.subtitles import generate_srt_for_segment
+from app.config import settings
+
+from app.services.youtube_downloader import (
+    a_download_youtube_video,
+    download_youtube_video,
+)
+from app.services.transcription import iter_transcribe_video
+from app.services.clip_ai import select_segments, fallback_segments
+from app.services.video_processing import (
+    a_generate_clips_batch,
+    can_stream_copy,
+    ffmpeg_threads_per_invocation,
+    probe_duration,
+    probe_keyframes,
+)
+from app.services.transcript_cache import (
+    get_cached_keyframes,
+    set_cached_keyframes,
+    video_fingerprint,
+)
+from app.services.subtitles import generate_srt_for_segment, transcript_starts
 
 from app.services.database import (
     get_clip_job,
@@ -24,10 +45,16 @@ from app.services.database import (
     mark_clip_job_failed,
 )
 
+logger = logging.getLogger("clip_job")
+logger.setLevel(settings.LOG_LEVEL)
+
 # These are now soft limits - actual clip length comes from user
 MIN_CLIP_DURATION = 15  # Reduced to allow shorter clips if user wants
 MAX_CLIP_DURATION = 120  # Increased to allow longer clips if user wants
 
+# Max distance (seconds) a clip start is moved back to reach a keyframe
+KEYFRAME_SNAP_TOLERANCE = 1.0
+
 
 # =========================================================
 # SEGMENT NORMALIZATION
@@ -37,8 +64,16 @@ def normalize_segments(
     segments: List[Dict],
     max_clips: int,
     target_duration: int,  # Add target duration from user
+    keyframes: Optional[List[float]] = None,
 ) -> List[Dict]:
-
+    """
+    keyframes (sorted, seconds): when given, a start within
+    KEYFRAME_SNAP_TOLERANCE after a keyframe is moved back onto it, so
+    stream-copied clips begin exactly where the cut was planned.
+    """
+
+    # Only the first max_clips segments are ever considered, so this stays
+    # a plain loop; the list is far too short for vectorising to pay off.
     normalized: List[Dict] = []
     
     # Allow some flexibility (±5 seconds) around user's requested duration
@@ -49,6 +84,11 @@ def normalize_segments(
         start = float(seg["start"])
         end = float(seg["end"])
         reason = seg.get("reason", "")
+
+        if keyframes:
+            kf_index = bisect_right(keyframes, start) - 1
+            if kf_index >= 0 and start - keyframes[kf_index] <= KEYFRAME_SNAP_TOLERANCE:
+                start = keyframes[kf_index]
         
         current_duration = end - start
 
@@ -60,13 +100,10 @@ def normalize_segments(
             # Trim to maximum allowed
             end = start + max_allowed
 
-        # Final validation
+        # Final validation (MIN_CLIP_DURATION > 0 also rules out end <= start)
         final_duration = end - start
         if final_duration < MIN_CLIP_DURATION or final_duration > MAX_CLIP_DURATION:
             continue
-            
-        if end <= start:
-            continue
 
         normalized.append({
             "start": start,
@@ -95,145 +132,371 @@ def resolve_video_source(
     raise ValueError("No valid video source provided")
 
 
+async def a_resolve_video_source(
+    source_url: Optional[str],
+    local_video_path: Optional[str],
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+) -> str:
+    if local_video_path and os.path.exists(local_video_path):
+        return local_video_path
+
+    if source_url:
+        return await a_download_youtube_video(source_url, progress_callback)
+
+    raise ValueError("No valid video source provided")
+
+
+# =========================================================
+# PROGRESS REPORTING
+# =========================================================
+
+class ProgressReporter:
+    """
+    Coalesces "processing" progress writes for one clip job.
+
+    set() ignores values that don't move progress forward, and only
+    reaches the database once progress moved by min_step or
+    min_interval_s has passed since the last write; flush() always
+    writes. Safe to call from worker threads.
+    """
+
+    def __init__(self, job_id: int, min_interval_s: float = 1.0, min_step: int = 5):
+        self.job_id = job_id
+        self.min_interval_s = min_interval_s
+        self.min_step = min_step
+
+        self._lock = threading.Lock()
+        self._latest: Optional[int] = None
+        self._flushed: Optional[int] = None
+        self._last_flush = 0.0
+
+    def set(self, progress: int) -> None:
+        with self._lock:
+            # Progress only moves forward; late or racing updates are dropped
+            if self._latest is not None and progress <= self._latest:
+                return
+            self._latest = progress
+
+            due = (
+                self._flushed is None
+                or progress - self._flushed >= self.min_step
+                or time.monotonic() - self._last_flush >= self.min_interval_s
+            )
+            if due:
+                self._write()
+
+    def flush(self, progress: Optional[int] = None) -> None:
+        with self._lock:
+            if progress is not None:
+                self._latest = progress
+            if self._latest is not None and self._latest != self._flushed:
+                self._write()
+
+    def _write(self) -> None:
+        # Called with self._lock held so writes land in order
+        update_clip_job_status(self.job_id, "processing", progress=self._latest)
+        self._flushed = self._latest
+        self._last_flush = time.monotonic()
+        logger.debug("[Job %d] Progress updated to %d%%", self.job_id, self._latest)
+
+
+# =========================================================
+# CLIP PRODUCTION
+# =========================================================
+
+def _generate_srts(
+    job_id: int,
+    transcript: List[Dict],
+    starts: List[float],
+    segments: List[Dict],
+    indices: List[int],
+) -> List[Optional[str]]:
+    srt_paths: List[Optional[str]] = []
+    for idx in indices:
+        srt_path = None
+        if transcript:
+            try:
+                srt_path = generate_srt_for_segment(transcript, segments[idx], starts)
+                logger.debug("[Job %d] Subtitles generated: %s", job_id, srt_path)
+            except RuntimeError as e:
+                logger.warning("[Job %d] Could not generate subtitles: %s", job_id, e)
+        srt_paths.append(srt_path)
+    return srt_paths
+
+
+async def _produce_clips(
+    job_id: int,
+    video_path: str,
+    transcript: List[Dict],
+    starts: List[float],
+    segments: List[Dict],
+    indices: List[int],
+    ffmpeg_threads: Optional[int],
+) -> List[Tuple[int, str, int]]:
+    """
+    Subtitles + encode for one batch of segments.
+
+    Returns [(segment_index, clip_path, duration), ...].
+    """
+    srt_paths = await asyncio.to_thread(
+        _generate_srts, job_id, transcript, starts, segments, indices
+    )
+
+    results = await a_generate_clips_batch(
+        video_path=video_path,
+        segments=[segments[idx] for idx in indices],
+        subtitles_paths=srt_paths,
+        ffmpeg_threads=ffmpeg_threads,
+    )
+
+    return [
+        (idx, clip_path, duration)
+        for idx, (clip_path, duration) in zip(indices, results)
+    ]
+
+
+def _source_keyframes(video_path: str) -> List[float]:
+    # Probed once per source file, then served from the transcript cache
+    fingerprint = video_fingerprint(video_path)
+    keyframes = get_cached_keyframes(fingerprint)
+    if keyframes is None:
+        keyframes = probe_keyframes(video_path)
+        if keyframes:
+            set_cached_keyframes(fingerprint, keyframes)
+    return keyframes
+
+
+def _transcribe(job_id: int, video_path: str, progress: ProgressReporter) -> List[Dict]:
+    transcript: List[Dict] = []
+    for done, total, chunk_segments in iter_transcribe_video(video_path):
+        transcript.extend(chunk_segments)
+        if total:
+            progress.set(25 + int(done / total * 20))
+    return transcript
+
+
 # =========================================================
 # BACKGROUND JOB WORKER
 # =========================================================
 
+# One semaphore per event loop: asyncio primitives can't be shared
+# between the API loop and loops created by run_clip_job().
+_job_slots: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+
+
+def _job_slot() -> asyncio.Semaphore:
+    loop = asyncio.get_running_loop()
+    slot = _job_slots.get(loop)
+    if slot is None:
+        slot = asyncio.Semaphore(settings.CLIP_MAX_CONCURRENT_JOBS)
+        _job_slots[loop] = slot
+    return slot
+
+
 def run_clip_job(job_id: int):
+    """
+    Blocking entry point for callers without an event loop.
+    """
+    asyncio.run(a_run_clip_job(job_id))
+
+
+async def a_run_clip_job(job_id: int):
+    """
+    Runs on the caller's event loop. ffmpeg and yt-dlp are awaited as
+    subprocesses, everything else that blocks (DB, Whisper, the AI
+    provider) goes through asyncio.to_thread, so a job holds no thread
+    while it waits. At most CLIP_MAX_CONCURRENT_JOBS run at once.
+    """
+
+    async with _job_slot():
+        await _run_clip_job(job_id)
+
+
+async def _run_clip_job(job_id: int):
+
+    progress = ProgressReporter(job_id)
 
     try:
-        job = get_clip_job(job_id)
+        job = await asyncio.to_thread(get_clip_job, job_id)
         if not job:
             raise RuntimeError(f"Clip job {job_id} not found")
 
         # ----------------------------------
         # Stage 1: Initial Setup
         # ----------------------------------
-        print(f"[Job {job_id}] Starting clip generation")
-        update_clip_job_status(job_id, "processing", progress=5)
-        print(f"[Job {job_id}] Progress updated to 5%")
-
-        video_path = resolve_video_source(
+        logger.info("[Job %d] Starting clip generation", job_id)
+        await asyncio.to_thread(progress.flush, 5)
+
+        # Download progress fills the 5-15% band; local files and
+        # cached downloads jump straight to 15%.
+        download_writes = set()
+        last_download_progress = 5
+
+        def on_download_progress(done: int, total: int) -> None:
+            nonlocal last_download_progress
+            pct = 5 + int(min(done, total) / total * 10)
+            if pct == last_download_progress:
+                return
+            last_download_progress = pct
+            task = asyncio.ensure_future(asyncio.to_thread(progress.set, pct))
+            download_writes.add(task)
+            task.add_done_callback(download_writes.discard)
+
+        video_path = await a_resolve_video_source(
             job.get("source_url"),
             job.get("local_video_path"),
+            on_download_progress,
         )
-        print(f"[Job {job_id}] Video source resolved: {video_path}")
+        await asyncio.gather(*download_writes)
+        logger.info("[Job %d] Video source resolved: %s", job_id, video_path)
 
-        update_clip_job_status(job_id, "processing", progress=15)
-        print(f"[Job {job_id}] Progress updated to 15%")
+        await asyncio.to_thread(progress.flush, 15)
+
+        want_subtitles = job.get("want_subtitles", True)
 
         # ----------------------------------
         # Stage 2: Transcription (heavy)
         # ----------------------------------
-        update_clip_job_status(job_id, "processing", progress=25)
-        print(f"[Job {job_id}] Starting transcription")
+        await asyncio.to_thread(progress.flush, 25)
 
-        transcript = transcribe_video(video_path)
-        print(f"[Job {job_id}] Transcription complete: {len(transcript)} segments")
+        transcript: List[Dict] = []
+        if want_subtitles:
+            logger.info("[Job %d] Starting transcription", job_id)
+            transcript = await asyncio.to_thread(_transcribe, job_id, video_path, progress)
+            logger.info("[Job %d] Transcription complete: %d segments", job_id, len(transcript))
+        else:
+            logger.info("[Job %d] Subtitles not requested, skipping transcription", job_id)
 
-        update_clip_job_status(job_id, "processing", progress=45)
-        print(f"[Job {job_id}] Progress updated to 45%")
+        await asyncio.to_thread(progress.flush, 45)
 
         # ----------------------------------
         # Stage 3: AI Segment Selection
         # ----------------------------------
-        print(f"[Job {job_id}] Selecting segments with AI (style: {job['style']}, target length: {job['clip_length']}s)")
-        
-        raw_segments = select_segments(
-            transcript=transcript,
-            max_clips=job["max_clips"],
-            clip_length=job["clip_length"],  # Pass user's requested length to AI
-            style=job["style"],
-        )
+        if want_subtitles:
+            logger.info("[Job %d] Selecting segments with AI (style: %s, target length: %ss)", job_id, job['style'], job['clip_length'])
+
+            raw_segments = await asyncio.to_thread(
+                select_segments,
+                transcript=transcript,
+                max_clips=job["max_clips"],
+                clip_length=job["clip_length"],  # Pass user's requested length to AI
+                style=job["style"],
+            )
+        else:
+            # No transcript to reason about: space clips evenly over the video
+            video_duration = await asyncio.to_thread(probe_duration, video_path)
+            logger.info("[Job %d] Selecting evenly spaced segments over %.2fs", job_id, video_duration)
+
+            raw_segments = fallback_segments(
+                [{"start": 0.0, "end": video_duration}] if video_duration > 0 else [],
+                job["max_clips"],
+                job["clip_length"],
+            )
 
         if not raw_segments:
             raise RuntimeError("AI did not return any usable segments")
         
-        print(f"[Job {job_id}] AI returned {len(raw_segments)} raw segments")
+        logger.info("[Job %d] AI returned %d raw segments", job_id, len(raw_segments))
+
+        # Keyframes only matter when clips will be stream-copied
+        keyframes = None
+        burn_in = want_subtitles and settings.CLIP_BURN_IN_SUBTITLES
+        if await asyncio.to_thread(can_stream_copy, video_path, burn_in):
+            keyframes = await asyncio.to_thread(_source_keyframes, video_path)
+            logger.info("[Job %d] Snapping cuts to %d keyframes", job_id, len(keyframes))
 
         # Normalize segments with user's target duration
         segments = normalize_segments(
             raw_segments,
             max_clips=job["max_clips"],
             target_duration=job["clip_length"],  # Pass user's requested length
+            keyframes=keyframes,
         )
 
         if not segments:
             raise RuntimeError("No valid segments after normalization")
         
-        print(f"[Job {job_id}] Normalized to {len(segments)} segments")
+        logger.info("[Job %d] Normalized to %d segments", job_id, len(segments))
 
-        update_clip_job_status(job_id, "processing", progress=60)
-        print(f"[Job {job_id}] Progress updated to 60%")
+        await asyncio.to_thread(progress.flush, 60)
 
         # ----------------------------------
-        # Stage 4: Clip Generation Loop
+        # Stage 4: Clip Generation (parallel)
         # ----------------------------------
         total_segments = len(segments)
-        print(f"[Job {job_id}] Generating {total_segments} clips")
-
-        for idx, segment in enumerate(segments):
-            clip_number = idx + 1
-            print(f"[Job {job_id}] Generating clip {clip_number}/{total_segments} ({segment['start']:.2f}s - {segment['end']:.2f}s)")
-
-            base_progress = 60
-            progress_span = 35  # from 60 to 95
-
-            # Update before starting each clip
-            incremental_progress = base_progress + int(
-                (idx / total_segments) * progress_span
-            )
-            update_clip_job_status(
-                job_id,
-                "processing",
-                progress=incremental_progress,
-            )
-            print(f"[Job {job_id}] Progress updated to {incremental_progress}%")
-
-            srt_path = None
-            if transcript:
-                try:
-                    srt_path = generate_srt_for_segment(transcript, segment)
-                    print(f"[Job {job_id}] Subtitles generated: {srt_path}")
-                except RuntimeError as e:
-                    print(f"[Job {job_id}] Warning: Could not generate subtitles: {e}")
-                    pass
-
-            clip_path, duration = generate_clip(
-                video_path=video_path,
-                segment=segment,
-                subtitles_path=srt_path,
-            )
-            
-            print(f"[Job {job_id}] Clip {clip_number} generated: {clip_path} (duration: {duration}s)")
-
-            add_clip(
+        logger.info("[Job %d] Generating %d clips", job_id, total_segments)
+
+        base_progress = 60
+        progress_span = 35  # from 60 to 95
+
+        # Each task runs one ffmpeg that cuts a contiguous batch of
+        # segments, so process start-up and encoder init are paid per batch.
+        max_workers = max(1, min(settings.CLIP_CONCURRENCY, total_segments))
+        ffmpeg_threads = ffmpeg_threads_per_invocation(max_workers)
+        batch_size = -(-total_segments // max_workers)
+        batches = [
+            list(range(i, min(i + batch_size, total_segments)))
+            for i in range(0, total_segments, batch_size)
+        ]
+        results: Dict[int, tuple] = {}
+
+        # Sorted start times for bisecting each clip's subtitle window
+        starts = transcript_starts(transcript)
+
+        tasks = []
+        for batch in batches:
+            for idx in batch:
+                segment = segments[idx]
+                logger.debug("[Job %d] Generating clip %d/%d (%.2fs - %.2fs)", job_id, idx + 1, total_segments, segment['start'], segment['end'])
+            tasks.append(asyncio.create_task(
+                _produce_clips(
+                    job_id,
+                    video_path,
+                    transcript,
+                    starts,
+                    segments,
+                    batch,
+                    ffmpeg_threads,
+                )
+            ))
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                for idx, clip_path, duration in await next_done:
+                    results[idx] = (clip_path, duration)
+                    logger.debug("[Job %d] Clip %d generated: %s (duration: %ss)", job_id, idx + 1, clip_path, duration)
+
+                incremental_progress = base_progress + int(
+                    (len(results) / total_segments) * progress_span
+                )
+                await asyncio.to_thread(progress.set, incremental_progress)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
+        await asyncio.to_thread(progress.flush)
+
+        # Persist in segment order regardless of completion order
+        for idx in range(total_segments):
+            clip_path, duration = results[idx]
+            await asyncio.to_thread(
+                add_clip,
                 clip_job_id=job_id,
                 file_path=clip_path,
                 duration=duration,
             )
-            print(f"[Job {job_id}] Clip {clip_number} saved to database")
-
-            # Update after clip is generated
-            incremental_progress = base_progress + int(
-                ((idx + 1) / total_segments) * progress_span
-            )
-            update_clip_job_status(
-                job_id,
-                "processing",
-                progress=incremental_progress,
-            )
-            print(f"[Job {job_id}] Progress updated to {incremental_progress}%")
+            logger.debug("[Job %d] Clip %d saved to database", job_id, idx + 1)
 
         # ----------------------------------
         # Final Completion
         # ----------------------------------
-        print(f"[Job {job_id}] All clips generated successfully")
-        update_clip_job_status(job_id, "completed", progress=100)
-        print(f"[Job {job_id}] Job marked as completed")
+        logger.info("[Job %d] All clips generated successfully", job_id)
+        await asyncio.to_thread(update_clip_job_status, job_id, "completed", progress=100)
+        logger.info("[Job %d] Job marked as completed", job_id)
 
     except Exception as e:
-        print(f"[Job {job_id}] ERROR: {str(e)}")
-        traceback.print_exc()
-        mark_clip_job_failed(job_id, str(e))
-        print(f"[Job {job_id}] Job marked as failed")
\ No newline at end of file
+        logger.exception("[Job %d] ERROR: %s", job_id, e)
+        await asyncio.to_thread(mark_clip_job_failed, job_id, str(e))
+        logger.info("[Job %d] Job marked as failed", job_id)
@@ -97,14 +97,14 @@ def execute_post(post: dict):
 
         for platform, platform_accounts in accounts_by_platform.items():
             # 🔒 ENFORCE LIMIT ONCE PER PLATFORM
-            auth_conn = get_auth_conn()
             try:
-                check_and_consume_limit(
-                    auth_conn,
-                    user_id=user_id,
-                    platform=platform,
-                    action="post",
-                )
+                with get_auth_conn() as auth_conn:
+                    check_and_consume_limit(
+                        auth_conn,
+                        user_id=user_id,
+                        platform=platform,
+                        action="post",
+                    )
             except PermissionError as e:
                 logger.error(
                     f"[EXECUTOR][POST {post_id}][{platform}] BLOCKED by subscription: {e}"
@@ -1,11 +1,16 @@
 import random
 import logging
-from datetime import datetime, timezone, timedelta
+import uuid
+
+from celery.signals import worker_ready
 
 from app.celery_app import celery_app
+from app.utils.instagram_lock import get_redis_client
 from app.workers.post_executor import execute_post
 from app.services.database import get_post_details_by_post_id
 from app.services.youtube_token_service import refresh_all_youtube_tokens
+from app.services.youtube_downloader import evict_video_cache
+from app.services.auth_database import delete_stale_password_reset_tokens
 
 
 # ============================
@@ -78,41 +83,100 @@ def execute_scheduled_post(self, post_id: int):
 # YOUTUBE TOKEN REFRESH TASK
 # ============================
 
-_next_refresh_at = None
+# Holds the token of the one live self-rescheduling refresh chain. Each
+# run re-claims it before refreshing and before queueing the next run; a
+# run whose token no longer matches belongs to an orphaned chain and
+# stops. The key expires shortly after the queued run is due, so the
+# next seed (worker start or the hourly beat task) can start a new chain
+# if the old one broke.
+_TOKEN_REFRESH_CHAIN_KEY = "yt_token_refresh:chain"
+_TOKEN_REFRESH_KEY_GRACE_SECONDS = 10 * 60
+# Covers the refresh itself, between the start-of-run claim and rescheduling
+_TOKEN_REFRESH_RUN_SECONDS = 60 * 60
+
+# Claim or extend the chain key for ARGV[1]: succeeds when the key is
+# ours or free (expired while this chain's run was still queued)
+_CLAIM_CHAIN_LUA = """
+local current = redis.call('get', KEYS[1])
+if current == false or current == ARGV[1] then
+    redis.call('set', KEYS[1], ARGV[1], 'EX', ARGV[2])
+    return 1
+end
+return 0
+"""
+
+
+def _claim_token_refresh_chain(chain_token: str, ttl_seconds: int) -> bool:
+    client = get_redis_client()
+    return bool(client.eval(_CLAIM_CHAIN_LUA, 1, _TOKEN_REFRESH_CHAIN_KEY, chain_token, ttl_seconds))
+
+
+def _token_refresh_ttl(delay_minutes: int) -> int:
+    return delay_minutes * 60 + _TOKEN_REFRESH_KEY_GRACE_SECONDS
+
+
+def _seed_token_refresh() -> None:
+    """
+    Start a refresh chain unless one is already live (started by
+    another worker, a previous run, or an earlier seed).
+    """
+    delay_minutes = random.randint(20, 40)
+    chain_token = uuid.uuid4().hex
+
+    claimed = get_redis_client().set(
+        _TOKEN_REFRESH_CHAIN_KEY,
+        chain_token,
+        nx=True,
+        ex=_token_refresh_ttl(delay_minutes),
+    )
+    if not claimed:
+        logger.info("[YT TOKEN] Refresh already scheduled – not seeding")
+        return
+
+    # If this fails the key simply expires and the next seed retries
+    refresh_youtube_tokens_task.apply_async((chain_token,), countdown=delay_minutes * 60)
+    logger.info(f"[YT TOKEN] Initial refresh scheduled in {delay_minutes} minutes")
+
+
+@worker_ready.connect
+def seed_token_refresh(**kwargs):
+    """
+    Queue the first refresh when a worker starts.
+    """
+    try:
+        _seed_token_refresh()
+    except Exception as e:
+        logger.exception(f"[YT TOKEN] Could not seed token refresh: {e}")
+
+
+@celery_app.task(name="seed_token_refresh_task")
+def seed_token_refresh_task():
+    """
+    Hourly safety net (beat): re-seeds the refresh chain if it broke
+    (lost message, broker error while rescheduling). A no-op while
+    the chain is alive.
+    """
+    _seed_token_refresh()
 
 
 @celery_app.task(bind=True, name="refresh_youtube_tokens_task")
-def refresh_youtube_tokens_task(self):
+def refresh_youtube_tokens_task(self, chain_token: str = None):
     """
-    Refresh YouTube tokens at randomized intervals (20–40 minutes).
+    Refresh YouTube tokens, then re-queue itself 20–40 minutes out.
+
+    Runs from an orphaned chain (its token replaced by a newer seed)
+    exit without refreshing or rescheduling.
 
     FULLY LOGGED:
-    - Initial scheduling
-    - Skips
     - Refresh execution
     - Failures
+    - Next scheduling
     """
 
-    global _next_refresh_at
-    now = datetime.now(timezone.utc)
-
     task_id = self.request.id
-    logger.info(f"[YT TOKEN][TASK {task_id}] Token refresh task tick")
-
-    # Initialize on first run
-    if _next_refresh_at is None:
-        delay_minutes = random.randint(20, 40)
-        _next_refresh_at = now + timedelta(minutes=delay_minutes)
-        logger.info(
-            f"[YT TOKEN][TASK {task_id}] Initial refresh scheduled in {delay_minutes} minutes"
-        )
-        return
 
-    # Not time yet
-    if now < _next_refresh_at:
-        logger.debug(
-            f"[YT TOKEN][TASK {task_id}] Not time yet – next refresh at {_next_refresh_at}"
-        )
+    if not chain_token or not _claim_token_refresh_chain(chain_token, _TOKEN_REFRESH_RUN_SECONDS):
+        logger.info(f"[YT TOKEN][TASK {task_id}] Orphaned refresh chain – stopping")
         return
 
     try:
@@ -127,7 +191,49 @@ def refresh_youtube_tokens_task(self):
 
     finally:
         delay_minutes = random.randint(20, 40)
-        _next_refresh_at = now + timedelta(minutes=delay_minutes)
-        logger.info(
-            f"[YT TOKEN][TASK {task_id}] Next refresh scheduled in {delay_minutes} minutes"
-        )
\ No newline at end of file
+        # Re-check ownership: a new chain may have been seeded meanwhile
+        if _claim_token_refresh_chain(chain_token, _token_refresh_ttl(delay_minutes)):
+            try:
+                refresh_youtube_tokens_task.apply_async((chain_token,), countdown=delay_minutes * 60)
+            except Exception as e:
+                # The chain key expires on its own; the hourly seed restarts it
+                logger.exception(
+                    f"[YT TOKEN][TASK {task_id}] Could not schedule next refresh: {e}"
+                )
+            else:
+                logger.info(
+                    f"[YT TOKEN][TASK {task_id}] Next refresh scheduled in {delay_minutes} minutes"
+                )
+        else:
+            logger.info(f"[YT TOKEN][TASK {task_id}] Refresh chain replaced – not rescheduling")
+
+
+# ============================
+# VIDEO CACHE EVICTION TASK
+# ============================
+
+@celery_app.task(name="evict_video_cache_task")
+def evict_video_cache_task():
+    """
+    Trim the downloaded-video cache back under VIDEO_CACHE_MAX_GB.
+
+    Downloads already evict after themselves; this catches growth
+    from manual copies or a lowered limit.
+    """
+    logger.info("[VIDEO CACHE] Nightly eviction started")
+    evict_video_cache()
+    logger.info("[VIDEO CACHE] Nightly eviction finished")
+
+
+# ============================
+# PASSWORD RESET TOKEN CLEANUP
+# ============================
+
+@celery_app.task(name="cleanup_password_reset_tokens_task")
+def cleanup_password_reset_tokens_task():
+    """
+    Delete used and long-expired password reset tokens so the table
+    (and its indexes) only hold live tokens.
+    """
+    deleted = delete_stale_password_reset_tokens()
+    logger.info(f"[RESET TOKENS] Deleted {deleted} stale token(s)")
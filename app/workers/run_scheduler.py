@@ -4,10 +4,11 @@ import time
 
 from app.workers.scheduler import SchedulerWorker
 from app.workers.analytics_worker import AnalyticsWorker
+from app.utils.logging import setup_logging
 
-logging.basicConfig(
+setup_logging(
     level=logging.INFO,
-    format="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+    fmt="%(asctime)s | %(levelname)s | %(name)s | %(message)s",
 )
 
 if __name__ == "__main__":
@@ -2,19 +2,24 @@
 Scheduler worker.
 
 LOGIC:
-- Periodically checks for due posts
-- Marks them as queued
+- Claims due posts (marks them queued in the same statement)
+- Sleeps until the next post is due or a post change wakes it up
 - Dispatches them via Celery
-- Ensures posts are not executed twice
+- Ensures posts are not executed twice, even with several schedulers
 """
 
 import time
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 
 from app.services.database import (
-    get_due_posts,
+    DUE_POSTS_BATCH,
+    claim_due_posts,
     update_post_status,
 )
+from app.utils.scheduler_wakeup import wait_for_wakeup
+from app.celery_app import celery_app
 from app.workers.post_tasks import execute_scheduled_post
 
 logger = logging.getLogger("scheduler")
@@ -22,9 +27,31 @@ logger.setLevel(logging.INFO)
 
 
 class SchedulerWorker:
-    def __init__(self, interval_seconds: int = 30):
+    def __init__(
+        self,
+        interval_seconds: int = 30,
+        max_wait_seconds: int = 300,
+        dispatch_workers: int = 8,
+        min_interval_seconds: int = 2,
+    ):
+        # interval: starting retry/poll pace after errors / without Redis;
+        # adapts between min_interval and max_wait (_adapt_interval)
+        # max_wait: longest idle sleep; new and rescheduled posts wake
+        # the scheduler early (notify_scheduler)
         self.interval = interval_seconds
+        self.base_interval = interval_seconds
+        self.min_interval = min_interval_seconds
+        self.max_wait = max_wait_seconds
         self.running = False
+        self._last_count = 0
+        self._next_due = None  # from the last claim_due_posts call
+
+        # Publishes a claimed batch over several broker connections at once
+        self.dispatch_workers = dispatch_workers
+        self._dispatch_pool = ThreadPoolExecutor(
+            max_workers=dispatch_workers,
+            thread_name_prefix="scheduler-dispatch",
+        )
 
     def start(self):
         """
@@ -35,46 +62,132 @@ class SchedulerWorker:
 
         while self.running:
             try:
-                self._check_and_dispatch()
+                failed = self._check_and_dispatch()
             except Exception as e:
-                logger.exception(f"[SCHEDULER] Fatal loop error: {e}")
+                logger.exception("[SCHEDULER] Fatal loop error: %s", e)
+                failed = True
+
+            self._adapt_interval(failed)
+            self._wait(self.interval if failed else self._until_next_due())
+
+    def _adapt_interval(self, failed: bool):
+        """
+        Back off while idle or failing, tighten up while posts flow.
+        """
+        if failed or self._last_count == 0:
+            self.interval = min(self.max_wait, self.interval * 2)
+        else:
+            self.interval = max(self.min_interval, self.interval // 2)
 
-            time.sleep(self.interval)
+    def _until_next_due(self) -> float:
+        """
+        Seconds until the earliest Pending post is due, capped at max_wait.
+        """
+        if self._next_due is None:
+            return self.max_wait
+
+        remaining = (self._next_due - datetime.now(timezone.utc)).total_seconds()
+        return min(self.max_wait, max(remaining, 1))
+
+    def _wait(self, timeout: float):
+        """
+        Sleep up to timeout seconds, returning early on a wake-up signal.
+        """
+        woken = wait_for_wakeup(timeout)
+
+        if woken is None:
+            # Redis unavailable: fall back to plain polling. Nothing can
+            # wake this sleep, so never poll slower than the base interval
+            time.sleep(min(timeout, self.interval, self.base_interval))
+        elif woken:
+            logger.debug("[SCHEDULER] Woken up by a post change")
 
     def stop(self):
         """
         Stop the scheduler loop.
         """
         self.running = False
+        self._dispatch_pool.shutdown(wait=False)
         logger.info("[SCHEDULER] Worker stopped")
 
-    def _check_and_dispatch(self):
+    def _check_and_dispatch(self) -> bool:
         """
-        Fetch due posts and dispatch them for execution.
+        Claim due posts and dispatch them for execution.
+        Returns True if any dispatch failed.
         """
         logger.debug("[SCHEDULER] Checking for due posts")
 
-        due_posts = get_due_posts()
+        dispatched = 0
+        failed = False
+        self._last_count = 0
 
-        if not due_posts:
-            logger.debug("[SCHEDULER] No due posts found")
-            return
+        # Claim in batches until the due backlog is drained
+        while True:
+            due_posts, self._next_due = claim_due_posts(DUE_POSTS_BATCH)
 
-        logger.info(f"[SCHEDULER] Found {len(due_posts)} due post(s)")
+            if not due_posts:
+                break
 
-        for post in due_posts:
-            post_id = post[0]
+            # Split the batch into one slice per dispatch thread
+            slices = min(self.dispatch_workers, len(due_posts))
+            results = self._dispatch_pool.map(
+                self._dispatch_slice,
+                [due_posts[i::slices] for i in range(slices)],
+            )
+            failed = any(list(results)) or failed
+            dispatched += len(due_posts)
+            self._last_count = dispatched
 
-            try:
-                logger.info(f"[SCHEDULER][POST {post_id}] Marking as queued")
-                update_post_status(post_id, "queued")
+            # A failed dispatch would be claimed again at once; wait a tick
+            if failed or len(due_posts) < DUE_POSTS_BATCH:
+                break
 
-                logger.info(
-                    f"[SCHEDULER][POST {post_id}] Dispatching to Celery"
-                )
-                execute_scheduled_post.delay(post_id)
+        if not dispatched:
+            logger.debug("[SCHEDULER] No due posts found")
+            return failed
 
-            except Exception as e:
-                logger.exception(
-                    f"[SCHEDULER][POST {post_id}] Failed to dispatch: {e}"
-                )
+        logger.info("[SCHEDULER] Processed %s due post(s)", dispatched)
+        return failed
+
+    def _dispatch_slice(self, posts) -> bool:
+        """
+        Publish execute_scheduled_post for each claimed post.
+        Returns True if any dispatch failed.
+        """
+        failed = False
+        handled = set()  # dispatched, or already handed back
+
+        try:
+            # Producers aren't thread-safe: one per slice, reused for the slice
+            with celery_app.producer_or_acquire() as producer:
+                for post in posts:
+                    post_id = post[0]
+
+                    try:
+                        logger.info(
+                            "[SCHEDULER][POST %s] Claimed, dispatching to Celery", post_id
+                        )
+                        execute_scheduled_post.apply_async(
+                            (post_id,), producer=producer
+                        )
+
+                    except Exception as e:
+                        logger.exception(
+                            "[SCHEDULER][POST %s] Failed to dispatch: %s", post_id, e
+                        )
+                        # Hand it back so the next poll retries it
+                        update_post_status(post_id, "Pending", str(e))
+                        failed = True
+
+                    handled.add(post_id)
+
+        except Exception as e:
+            # Acquiring or releasing the producer failed. The rows are
+            # already committed as 'queued', so hand back the rest.
+            logger.exception("[SCHEDULER] Dispatch slice failed: %s", e)
+            for post in posts:
+                if post[0] not in handled:
+                    update_post_status(post[0], "Pending", str(e))
+            return True
+
+        return failed
@@ -4,7 +4,6 @@ Run from the Backend directory with: python create_user.py
 """
 
 from app.services.auth_database import add_user, get_user_by_email, set_user_admin_status
-from app.utils.security import hash_password
 
 def create_test_user(email: str, password: str, make_admin: bool = False):
     """Create a test user in the database."""
@@ -18,7 +17,9 @@ def create_test_user(email: str, password: str, make_admin: bool = False):
             print(f"Ensured admin privileges for user ID: {existing['id']}")
         return existing['id']
 
-    # Hash the password and create user
+    # Hash the password and create user (passlib is only imported when needed)
+    from app.utils.security import hash_password
+
     password_hash = hash_password(password)
     user_id = add_user(email, password_hash)
 